@@ -0,0 +1,144 @@
+import io
+import os
+import queue
+import threading
+from collections import deque
+import pygame
+from config import Config
+from recursos import Recursos
+
+# ==============================================================================
+# CLASE 16: Gestor de Audio (Audio)
+# Responsabilidad: Reproducir efectos y música sin frenar el bucle principal.
+# Los efectos se decodifican una vez (caché de Recursos) y suenan siempre por
+# el mismo canal reservado. Un hilo propio lee del disco los archivos de música;
+# el mezclador (SDL_mixer no admite uso concurrente) solo se toca en el hilo
+# principal, que aplica las órdenes en el orden en que llegan con 'atender'
+# una vez por fotograma.
+# ==============================================================================
+class Audio:
+    CANAL_SFX = 0
+
+    def __init__(self, ruta_base_sonidos=None):
+        self.ruta_base_sonidos = ruta_base_sonidos or os.path.join(os.path.dirname(os.path.abspath(__file__)), "Sonido")
+        pygame.mixer.init()
+        # El canal de efectos queda reservado: pygame no lo usará para otros sonidos
+        pygame.mixer.set_reserved(Audio.CANAL_SFX + 1)
+        self.canal_sfx = pygame.mixer.Channel(Audio.CANAL_SFX)
+        self.musica_actual = None
+        self.archivo_musica = None
+        # Órdenes de música en el orden recibido: [acción, archivo, bytes leídos, lista para aplicarse]
+        self.pendientes = deque()
+        # Hacia el hilo: cambios de música cuyo archivo hay que leer; desde el hilo: los ya leídos
+        self.lecturas = queue.Queue()
+        self.leidas = queue.Queue()
+        self.hilo_musica = threading.Thread(target=self._leer_archivos, name="musica", daemon=True)
+        self.hilo_musica.start()
+
+    def rutas_sfx(self):
+        """Efectos de sonido de todos los temas (para precargarlos)."""
+        nombres = [Config.SONIDO_VICTORIA] + [tema["sonido_gameover"] for tema in Config.TEMAS.values() if tema.get("sonido_gameover")]
+        return [os.path.join(self.ruta_base_sonidos, nombre) for nombre in nombres]
+
+    # --- Efectos ---
+
+    def reproducir_sfx(self, nombre_archivo, loop=0):
+        """Reproduce un efecto de sonido (decodificado una sola vez) sin detener la música."""
+        try:
+            sfx = Recursos.sonido(os.path.join(self.ruta_base_sonidos, nombre_archivo))
+            self.canal_sfx.play(sfx, loop)
+            return True
+        except Exception as e:
+            print(f"Advertencia: No se pudo cargar el SFX '{nombre_archivo}': {e}")
+            return False
+
+    def detener_sfx(self):
+        self.canal_sfx.stop()
+
+    # --- Música (el hilo solo lee archivos; el mezclador se usa en el hilo principal) ---
+
+    def cambiar_musica(self, nombre_archivo):
+        """Detiene los efectos y pone 'nombre_archivo' en bucle; None solo detiene la música."""
+        self.canal_sfx.stop()
+        orden = ["CAMBIAR", nombre_archivo, None, not nombre_archivo]
+        self.pendientes.append(orden)
+        if nombre_archivo:
+            self.lecturas.put(orden)
+        self.atender()
+
+    def detener_musica(self):
+        self.pendientes.append(["DETENER", None, None, True])
+        self.atender()
+
+    def pausar_musica(self):
+        self.pendientes.append(["PAUSAR", None, None, True])
+        self.atender()
+
+    def reanudar_musica(self):
+        self.pendientes.append(["REANUDAR", None, None, True])
+        self.atender()
+
+    def atender(self):
+        """
+        Aplica, en el hilo principal y en el orden en que se dieron, las órdenes
+        de música cuyo archivo ya está leído. Se llama una vez por fotograma: un
+        cambio de música que aún se está leyendo detiene la cola hasta el
+        siguiente, así que una pausa posterior nunca se adelanta a él.
+        """
+        while True:
+            try:
+                self.leidas.get_nowait()[3] = True
+            except queue.Empty:
+                break
+        while self.pendientes and self.pendientes[0][3]:
+            accion, nombre_archivo, datos, _ = self.pendientes.popleft()
+            if accion == "CAMBIAR":
+                self._poner_musica(nombre_archivo, datos)
+            elif accion == "DETENER":
+                pygame.mixer.music.stop()
+                self.musica_actual = None
+            elif accion == "PAUSAR":
+                pygame.mixer.music.pause()
+            elif accion == "REANUDAR":
+                pygame.mixer.music.unpause()
+
+    def esperar(self):
+        """Bloquea hasta que se hayan leído los archivos pendientes y aplica todas las órdenes."""
+        self.lecturas.join()
+        self.atender()
+
+    def cerrar(self):
+        self.lecturas.put(None)
+        self.hilo_musica.join()
+
+    def _leer_archivos(self):
+        """Hilo de música: lee del disco el archivo de cada cambio de música, nada más."""
+        while True:
+            orden = self.lecturas.get()
+            try:
+                if orden is None:
+                    return
+                try:
+                    with open(os.path.join(self.ruta_base_sonidos, orden[1]), "rb") as archivo:
+                        orden[2] = archivo.read()
+                except OSError as e:
+                    orden[2] = e
+                self.leidas.put(orden)
+            finally:
+                self.lecturas.task_done()
+
+    def _poner_musica(self, nombre_archivo, datos):
+        pygame.mixer.music.stop()
+        self.musica_actual = None
+        if not nombre_archivo:
+            return
+        try:
+            if isinstance(datos, Exception):
+                raise datos
+            # SDL lee la música poco a poco mientras suena: el archivo en memoria tiene que seguir vivo
+            self.archivo_musica = io.BytesIO(datos)
+            pygame.mixer.music.load(self.archivo_musica, os.path.splitext(nombre_archivo)[1].lstrip("."))
+            pygame.mixer.music.play(-1)
+            self.musica_actual = nombre_archivo
+        except Exception as e:
+            print(f"Advertencia: No se pudo cargar la música '{nombre_archivo}': {e}")
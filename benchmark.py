@@ -0,0 +1,214 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from config import Config
+from estadisticas_busqueda import EstadisticasBusqueda
+from ocupacion import Ocupacion
+from pathfinder import Pathfinder
+from world import World
+
+# ==============================================================================
+# CLASE 13: Banco de Pruebas de Rendimiento (Benchmark)
+# Responsabilidad: Medir la búsqueda de caminos, la generación del mundo y el
+# dibujado de fotogramas en varios tamaños de cuadrícula y densidades. Guarda
+# los resultados en JSON para compararlos con una línea base y detectar
+# regresiones entre versiones.
+# ==============================================================================
+RESOLUCIONES = [(1280, 720), (1920, 1080), (3840, 2160)]
+DENSIDADES = [0.0, 0.1, 0.25]
+# Métricas donde un valor mayor es peor; en el resto (nodos/s) mayor es mejor
+METRICAS_TIEMPO = ("ms_por_busqueda", "ms_por_mundo", "ms_por_fotograma")
+
+
+class Benchmark:
+    def __init__(self, rapido=False, semilla=0):
+        self.rapido = rapido
+        self.semilla = semilla
+        self.resultados = []
+        self._pantalla_original = (Config.SCREEN_ANCHO, Config.SCREEN_ALTO)
+
+    def _registrar(self, nombre, **metricas):
+        entrada = {"nombre": nombre, **metricas}
+        self.resultados.append(entrada)
+        texto = " | ".join(f"{clave}: {valor:.3f}" if isinstance(valor, float) else f"{clave}: {valor}"
+                           for clave, valor in metricas.items())
+        print(f"{nombre:<45} {texto}")
+
+    @staticmethod
+    def _rejilla_aleatoria(densidad, aleatorio):
+        ocupacion = Ocupacion()
+        for x in range(ocupacion.columnas):
+            for y in range(ocupacion.fila_minima, ocupacion.filas):
+                if aleatorio.random() < densidad:
+                    ocupacion.rejilla[x, y] = Ocupacion.OBSTACULO
+        ocupacion.version += 1
+        return ocupacion
+
+    @staticmethod
+    def _celda_libre(ocupacion, aleatorio):
+        while True:
+            celda = (aleatorio.randrange(ocupacion.columnas), aleatorio.randrange(ocupacion.fila_minima, ocupacion.filas))
+            if not ocupacion.celda_bloqueada(celda):
+                return (celda[0] * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2,
+                        celda[1] * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2)
+
+    def medir_busquedas(self):
+        consultas = 10 if self.rapido else 40
+        for ancho, alto in RESOLUCIONES:
+            Config.establecer_pantalla(ancho, alto)
+            for densidad in DENSIDADES:
+                aleatorio = random.Random(self.semilla)
+                ocupacion = self._rejilla_aleatoria(densidad, aleatorio)
+                pares = [(self._celda_libre(ocupacion, aleatorio), self._celda_libre(ocupacion, aleatorio))
+                         for _ in range(consultas)]
+                etiqueta = f"{ancho}x{alto} densidad {densidad:.2f}"
+
+                estadisticas = EstadisticasBusqueda()
+                expandidos = 0
+                inicio = time.perf_counter()
+                for origen, destino in pares:
+                    Pathfinder.a_estrella(origen, destino, ocupacion, estadisticas)
+                    expandidos += estadisticas.expandidos
+                duracion = time.perf_counter() - inicio
+                self._registrar(f"a_estrella {etiqueta}", ms_por_busqueda=duracion / consultas * 1000,
+                                nodos_por_segundo=expandidos / duracion)
+
+                # Búsqueda paso a paso (modo desarrollador): las entradas obsoletas del montón
+                # también cuestan un paso(), así que los nodos salen de las estadísticas
+                pathfinder = Pathfinder()
+                expandidos = 0
+                inicio = time.perf_counter()
+                for origen, destino in pares:
+                    pathfinder.iniciar_busqueda(origen, destino, ocupacion)
+                    while pathfinder.paso() == "SEARCHING":
+                        pass
+                    expandidos += pathfinder.ultima_busqueda.expandidos
+                duracion = time.perf_counter() - inicio
+                self._registrar(f"paso {etiqueta}", ms_por_busqueda=duracion / consultas * 1000,
+                                nodos_por_segundo=expandidos / duracion)
+
+                for motor in ("PLANO", "JPS"):
+                    pathfinder = Pathfinder(motor, tamano_cache=0)
+                    pathfinder.buscar(pares[0][0], pares[0][1], ocupacion)  # Prepara tablas fuera de la medida
+                    expandidos = 0
+                    inicio = time.perf_counter()
+                    for origen, destino in pares:
+                        pathfinder.buscar(origen, destino, ocupacion)
+                        expandidos += pathfinder.motor_rejilla.expandidos
+                    duracion = time.perf_counter() - inicio
+                    self._registrar(f"{motor.lower()} {etiqueta}", ms_por_busqueda=duracion / consultas * 1000,
+                                    nodos_por_segundo=expandidos / duracion)
+        Config.establecer_pantalla(*self._pantalla_original)
+
+    def medir_generacion(self):
+        repeticiones = 3 if self.rapido else 10
+        for ancho, alto in RESOLUCIONES:
+            Config.establecer_pantalla(ancho, alto)
+            for num_obstaculos in (30, 200, 1000):
+                inicio = time.perf_counter()
+                for i in range(repeticiones):
+                    mundo = World(self.semilla + i, num_obstaculos)
+                duracion = time.perf_counter() - inicio
+                self._registrar(f"generar_disposicion {ancho}x{alto} {num_obstaculos} obstáculos",
+                                ms_por_mundo=duracion / repeticiones * 1000, colocados=len(mundo.obstaculos))
+        Config.establecer_pantalla(*self._pantalla_original)
+
+    def medir_render(self):
+        import pygame
+        from render import Render
+        from robot import Robot
+
+        fotogramas = 20 if self.rapido else 120
+        pygame.init()
+        for ancho, alto in RESOLUCIONES:
+            Config.establecer_pantalla(ancho, alto)
+            pantalla = pygame.display.set_mode((Config.ANCHO, Config.ALTO))
+            tema = list(Config.TEMAS.keys())[0]
+            render = Render(pantalla, tema)
+            mundo = World(self.semilla)
+            robot = Robot(mundo.pos_inicio_robot[0], mundo.pos_inicio_robot[1], mundo)
+            pathfinder = Pathfinder()
+            opciones = list(Config.TEMAS.keys())
+
+            for modo_desarrollador in (False, True):
+                if modo_desarrollador:
+                    # De esquina a esquina: un frente de búsqueda grande para el dibujado de puntajes
+                    pathfinder.iniciar_busqueda(mundo.rect_estacion.center, mundo.rect_canasta.center, mundo.ocupacion)
+                    for _ in range(3000):
+                        if pathfinder.paso() != "SEARCHING":
+                            break
+                inicio = time.perf_counter()
+                for _ in range(fotogramas):
+                    if modo_desarrollador:
+                        pathfinder.paso()  # Como al mantener pulsada la tecla A
+                    render.dibujar('RUNNING', mundo, robot, modo_desarrollador, pathfinder, opciones, 0)
+                duracion = time.perf_counter() - inicio
+                modo = "desarrollador" if modo_desarrollador else "normal"
+                self._registrar(f"dibujar {ancho}x{alto} {modo}", ms_por_fotograma=duracion / fotogramas * 1000)
+        pygame.quit()
+        Config.establecer_pantalla(*self._pantalla_original)
+
+    def ejecutar(self, secciones=("busquedas", "generacion", "render")):
+        if "busquedas" in secciones:
+            self.medir_busquedas()
+        if "generacion" in secciones:
+            self.medir_generacion()
+        if "render" in secciones:
+            self.medir_render()
+        return self.resultados
+
+    def guardar(self, ruta):
+        with open(ruta, "w") as archivo:
+            json.dump({"fecha": time.strftime("%Y-%m-%d %H:%M:%S"), "resultados": self.resultados}, archivo, indent=2)
+
+    @staticmethod
+    def comparar(resultados, ruta_base, tolerancia):
+        """Devuelve la lista de regresiones respecto a la línea base guardada en 'ruta_base'."""
+        with open(ruta_base) as archivo:
+            base = {entrada["nombre"]: entrada for entrada in json.load(archivo)["resultados"]}
+        regresiones = []
+        for entrada in resultados:
+            anterior = base.get(entrada["nombre"])
+            if not anterior:
+                continue
+            for metrica, valor in entrada.items():
+                valor_base = anterior.get(metrica)
+                if metrica == "nombre" or not isinstance(valor, float) or not valor_base:
+                    continue
+                if metrica in METRICAS_TIEMPO:
+                    cambio = valor / valor_base - 1
+                else:
+                    cambio = valor_base / valor - 1 if valor else float('inf')
+                if cambio > tolerancia:
+                    regresiones.append((entrada["nombre"], metrica, valor_base, valor, cambio))
+        return regresiones
+
+
+if __name__ == '__main__':
+    # El renderizado se mide sin ventana real (solo al ejecutar el banco, no al importarlo)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    parser = argparse.ArgumentParser(description="Mide el rendimiento de búsqueda, generación y dibujado.")
+    parser.add_argument("--rapido", action="store_true", help="Menos repeticiones (para CI)")
+    parser.add_argument("--solo", nargs="+", choices=["busquedas", "generacion", "render"],
+                        default=["busquedas", "generacion", "render"])
+    parser.add_argument("--guardar", default=None, help="Guarda los resultados como línea base JSON")
+    parser.add_argument("--comparar", default=None, help="Línea base JSON con la que comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Empeoramiento permitido (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    banco = Benchmark(args.rapido)
+    resultados = banco.ejecutar(args.solo)
+    if args.guardar:
+        banco.guardar(args.guardar)
+    if args.comparar:
+        regresiones = Benchmark.comparar(resultados, args.comparar, args.tolerancia)
+        for nombre, metrica, antes, despues, cambio in regresiones:
+            print(f"REGRESIÓN {nombre} [{metrica}]: {antes:.3f} -> {despues:.3f} ({cambio:+.0%})")
+        if regresiones:
+            sys.exit(1)
+        print("Sin regresiones respecto a la línea base.")
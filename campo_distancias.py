@@ -0,0 +1,147 @@
+import heapq
+from collections import deque
+from config import Config
+from motor_astar import MotorRejilla
+
+# ==============================================================================
+# CLASE 10: Campo de Distancias (CampoDistancias)
+# Responsabilidad: Guardar la distancia en pasos desde cada celda hasta un
+# destino fijo (la estación o las celdas de entrega de la canasta). Se calcula
+# una vez con BFS y se repara localmente cuando la rejilla de ocupación avisa
+# de que una celda cambió. Las rutas salen bajando por el gradiente.
+# ==============================================================================
+class CampoDistancias:
+    INFINITO = float('inf')
+
+    def __init__(self, ocupacion, semillas, semillas_bloqueadas=False):
+        """
+        'semillas' son celdas (x, y) con distancia 0. Si 'semillas_bloqueadas' es
+        True siguen siendo destino aunque estén ocupadas (la estación, por ejemplo);
+        si no, una semilla ocupada deja de contar hasta que se libere.
+        """
+        self.ocupacion = ocupacion
+        self.filas = ocupacion.filas
+        self.vecinos = MotorRejilla.tabla_vecinos(ocupacion.columnas, ocupacion.filas, ocupacion.fila_minima)
+        self.semillas = {ocupacion.indice(c) for c in semillas
+                         if 0 <= c[0] < ocupacion.columnas and ocupacion.fila_minima <= c[1] < ocupacion.filas}
+        self.semillas_bloqueadas = semillas_bloqueadas
+        self.distancia = []
+        self.recalcular()
+        ocupacion.suscribir(self.celda_cambiada)
+
+    def liberar(self):
+        """Deja de seguir los cambios de la rejilla (para campos temporales)."""
+        self.ocupacion.desuscribir(self.celda_cambiada)
+
+    def _transitable(self, indice):
+        return not self.ocupacion.celdas[indice]
+
+    def _semilla_activa(self, indice):
+        return indice in self.semillas and (self.semillas_bloqueadas or self._transitable(indice))
+
+    def recalcular(self):
+        """BFS completo desde todas las semillas activas."""
+        distancia = self.distancia = [CampoDistancias.INFINITO] * (self.ocupacion.columnas * self.filas)
+        cola = deque()
+        for semilla in self.semillas:
+            if self._semilla_activa(semilla):
+                distancia[semilla] = 0
+                cola.append(semilla)
+        self._propagar(cola)
+
+    def _propagar(self, cola):
+        # Reducciones en orden BFS: cada celda de la cola ya tiene su distancia final
+        distancia, vecinos, celdas = self.distancia, self.vecinos, self.ocupacion.celdas
+        while cola:
+            actual = cola.popleft()
+            siguiente = distancia[actual] + 1
+            for vecino in vecinos[actual]:
+                if siguiente < distancia[vecino] and not celdas[vecino]:
+                    distancia[vecino] = siguiente
+                    cola.append(vecino)
+
+    def _mejor_vecino(self, indice):
+        return min((self.distancia[v] for v in self.vecinos[indice]), default=CampoDistancias.INFINITO)
+
+    def celda_cambiada(self, indice, bloqueada):
+        if bloqueada:
+            self._celda_bloqueada(indice)
+        else:
+            self._celda_liberada(indice)
+
+    def _celda_liberada(self, indice):
+        if self._semilla_activa(indice):
+            nueva = 0
+        else:
+            nueva = self._mejor_vecino(indice) + 1
+        if nueva < self.distancia[indice]:
+            self.distancia[indice] = nueva
+            self._propagar(deque((indice,)))
+
+    def _celda_bloqueada(self, indice):
+        distancia, vecinos = self.distancia, self.vecinos
+        if self._semilla_activa(indice) or distancia[indice] == CampoDistancias.INFINITO:
+            return
+
+        # 1. Invalidar las celdas que solo tenían apoyo a través de la bloqueada
+        anterior = {indice: distancia[indice]}
+        distancia[indice] = CampoDistancias.INFINITO
+        afectadas = []
+        cola = deque((indice,))
+        while cola:
+            actual = cola.popleft()
+            esperado = anterior[actual] + 1
+            for vecino in vecinos[actual]:
+                if distancia[vecino] != esperado or vecino in self.semillas:
+                    continue
+                if any(distancia[w] == esperado - 1 for w in vecinos[vecino]):
+                    continue
+                anterior[vecino] = distancia[vecino]
+                distancia[vecino] = CampoDistancias.INFINITO
+                afectadas.append(vecino)
+                cola.append(vecino)
+
+        # 2. Reasignarlas desde el borde que sigue siendo válido
+        monticulo = []
+        for celda in afectadas:
+            candidata = self._mejor_vecino(celda) + 1
+            if candidata < CampoDistancias.INFINITO:
+                heapq.heappush(monticulo, (candidata, celda))
+        celdas = self.ocupacion.celdas
+        while monticulo:
+            valor, actual = heapq.heappop(monticulo)
+            if valor >= distancia[actual]:
+                continue
+            distancia[actual] = valor
+            for vecino in vecinos[actual]:
+                if valor + 1 < distancia[vecino] and not celdas[vecino]:
+                    heapq.heappush(monticulo, (valor + 1, vecino))
+
+    def distancia_celda(self, celda):
+        """Pasos hasta el destino desde 'celda' (puede estar ocupada, p. ej. la estación)."""
+        if not self.ocupacion.dentro(celda):
+            return CampoDistancias.INFINITO
+        indice = self.ocupacion.indice(celda)
+        if self._semilla_activa(indice) or self._transitable(indice):
+            return self.distancia[indice]
+        return self._mejor_vecino(indice) + 1
+
+    def distancia_pixel(self, pos):
+        return self.distancia_celda((pos[0] // Config.TAMANO_CELDA, pos[1] // Config.TAMANO_CELDA))
+
+    def ruta_desde(self, pos):
+        """Ruta en centros de píxel bajando por el gradiente, o None si no hay camino."""
+        celda = (pos[0] // Config.TAMANO_CELDA, pos[1] // Config.TAMANO_CELDA)
+        restante = self.distancia_celda(celda)
+        if restante == CampoDistancias.INFINITO:
+            return None
+
+        distancia, vecinos, filas = self.distancia, self.vecinos, self.filas
+        actual = self.ocupacion.indice(celda)
+        ruta = []
+        while restante > 0:
+            restante -= 1
+            actual = next(v for v in vecinos[actual] if distancia[v] == restante)
+            ruta.append(((actual // filas) * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2,
+                         (actual % filas) * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2))
+        return ruta
@@ -1,14 +1,27 @@
-import pygame
 import os
 # ==============================================================================
 # CLASE 1: Configuración (Config)
 # Responsabilidad: Almacenar todas las constantes y parámetros del juego.
 # Facilita cambiar la configuración sin tener que buscar en todo el código.
 # ==============================================================================
-pygame.init()
-info_display = pygame.display.Info()
-SCREEN_ANCHO, SCREEN_ALTO = info_display.current_w, info_display.current_h
-pygame.quit()
+# Resolución usada cuando no hay pantalla que consultar (pruebas, simulación,
+# procesos de trabajo). Se puede cambiar por proceso con la variable de entorno
+# AGENTQUEST_PANTALLA="ANCHOxALTO" o llamando a Config.establecer_pantalla().
+PANTALLA_POR_DEFECTO = (1920, 1080)
+
+
+def _resolucion_por_defecto():
+    valor = os.environ.get("AGENTQUEST_PANTALLA")
+    if valor:
+        try:
+            ancho, alto = (int(v) for v in valor.lower().split("x"))
+            return ancho, alto
+        except ValueError:
+            print(f"Advertencia: AGENTQUEST_PANTALLA='{valor}' no es válido, se usa {PANTALLA_POR_DEFECTO}")
+    return PANTALLA_POR_DEFECTO
+
+
+SCREEN_ANCHO, SCREEN_ALTO = _resolucion_por_defecto()
 
 class Config:
     TAMANO_CELDA = 30
@@ -90,7 +103,24 @@ class Config:
 
     POS_X_CENTRADA = (SCREEN_ANCHO - ANCHO) // 2
     POS_Y_CENTRADA = (SCREEN_ALTO - ALTO) // 2
-    os.environ['SDL_VIDEO_WINDOW_POS'] = f"{POS_X_CENTRADA},{POS_Y_CENTRADA}"
+
+    @classmethod
+    def establecer_pantalla(cls, ancho, alto):
+        """Fija la resolución y recalcula el tamaño de la cuadrícula."""
+        cls.SCREEN_ANCHO = ancho
+        cls.SCREEN_ALTO = alto
+        cls.ANCHO = (ancho // cls.TAMANO_CELDA) * cls.TAMANO_CELDA
+        cls.ALTO = (alto // cls.TAMANO_CELDA) * cls.TAMANO_CELDA
+        cls.POS_X_CENTRADA = (ancho - cls.ANCHO) // 2
+        cls.POS_Y_CENTRADA = (alto - cls.ALTO) // 2
+
+    @classmethod
+    def detectar_pantalla(cls):
+        """Usa la resolución del monitor real. Requiere pygame.init() previo."""
+        import pygame
+        info_display = pygame.display.Info()
+        cls.establecer_pantalla(info_display.current_w, info_display.current_h)
+        os.environ['SDL_VIDEO_WINDOW_POS'] = f"{cls.POS_X_CENTRADA},{cls.POS_Y_CENTRADA}"
 
     # Colores y Fuentes
     NEGRO = (0, 0, 0); BLANCO = (220, 220, 220); VERDE = (0, 200, 0)
@@ -105,6 +135,47 @@ class Config:
     TASA_RECARGA = CARGA_MAXIMA / 30 
     MARGEN_SEGURIDAD_BATERIA = 1.25
     MAX_TURNOS_ATASCADO = 1
+    LONGITUD_RASTRO = 512  # Posiciones que recuerdan camino_normal y camino_dev
+    # Con True el robot sigue un recorrido planificado (orden de pelotas y recargas)
+    # en lugar de ir siempre a la pelota más cercana
+    PLANIFICAR_RECORRIDO = False
+    MAX_PASADAS_2OPT = 50
+    # Pelotas vecinas con las que la búsqueda local del recorrido prueba movimientos
+    VECINAS_RECORRIDO = 8
+    # Planes completos (con recargas) que evalúa como mucho cada búsqueda local
+    MAX_EVALUACIONES_RECORRIDO = 2000
+    # Con más pelotas que estas no se planifica (un campo de distancias por pelota)
+    MAX_PELOTAS_RECORRIDO = 60
+
+    # Motor de búsqueda por defecto de Pathfinder: "CLASICO", "PLANO", "JPS" o "INCREMENTAL"
+    MOTOR_BUSQUEDA = "PLANO"
+    # Búsquedas D* Lite que el motor INCREMENTAL mantiene vivas a la vez
+    MAX_PLANIFICADORES_INCREMENTALES = 8
+    # Rutas recordadas por Pathfinder (0 desactiva la caché)
+    TAMANO_CACHE_RUTAS = 256
+    # Orígenes repetidos (celdas de entrega, estación) con un campo de distancias
+    # propio para responder sin buscar a "¿cuál es la pelota más cercana?"
+    TAMANO_CACHE_CAMPOS = 4
+    # Una búsqueda que expande más que esta fracción de las celdas del tablero se marca como patológica
+    FRACCION_BUSQUEDA_PATOLOGICA = 0.5
+
+    # Bucle de paso fijo del juego: la lógica avanza en ticks de esta duración
+    # (tiempo simulado) sin depender de cuántos fotogramas se dibujen
+    PASO_FIJO_MS = 1000 / 60
+    VELOCIDADES = (1, 2, 5, 10, 25, 50, 100, None)  # None = "MAX", tan rápido como se pueda
+    MAX_RETRASO_MS = 250  # Tiempo real máximo que se recupera tras un fotograma lento
+    PRESUPUESTO_FOTOGRAMA_MS = 1000 / 30  # Lógica como mucho por fotograma antes de dibujar
+
+    # Perfilador (F3 lo activa en el juego, F4 exporta las trazas)
+    VENTANA_PERFIL = 300  # Fotogramas sobre los que se calculan p50/p99
+    MAX_TRAZAS_PERFIL = 36000  # Fotogramas que se guardan para exportar (10 min a 60 fps)
+
+    # Parámetros de la Simulación sin pantalla
+    MAX_TICKS_SIMULACION = 20000
+
+    # Parámetros de la Flota (varios robots en el mismo mundo)
+    NUM_ROBOTS_FLOTA = 8
+    VENTANA_RESERVA = 16  # Ticks que reserva cada plan cooperativo
     
     # Parámetros del Mundo
     NUM_PELOTAS = 10
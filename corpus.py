@@ -0,0 +1,98 @@
+import argparse
+import os
+import sys
+import numpy as np
+# Sin pantalla no hace falta el saludo de pygame en la salida estándar
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from world import World
+
+# ==============================================================================
+# CLASE 14: Corpus de Mundos (CorpusMundos)
+# Responsabilidad: Guardar muchas disposiciones en un directorio de arreglos
+# .npy planos (uno por campo, más los desplazamientos de cada mundo) que se
+# abren mapeados en memoria. Cargar el mundo i es copiar unas pocas filas,
+# sin volver a generarlo ni interpretar texto.
+# ==============================================================================
+class CorpusMundos:
+    # Columnas de 'fijos': estación (x, y, ancho, alto), canasta (x, y, ancho, alto), robot (x, y)
+    ARCHIVOS = ("fijos", "semillas", "obstaculos", "inicio_obstaculos", "pelotas", "inicio_pelotas")
+
+    def __init__(self, directorio):
+        self.directorio = directorio
+        self.tamano = np.load(os.path.join(directorio, "tamano.npy"))
+        World.comprobar_tamano(self.tamano)
+        for nombre in CorpusMundos.ARCHIVOS:
+            setattr(self, nombre, np.load(os.path.join(directorio, nombre + ".npy"), mmap_mode='r'))
+
+    def __len__(self):
+        return len(self.semillas)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.mundo(i)
+
+    def disposicion(self, i):
+        fijos = self.fijos[i]
+        return {
+            "tamano": self.tamano,
+            "semilla": self.semillas[i],
+            "estacion": fijos[0:4],
+            "canasta": fijos[4:8],
+            "robot": fijos[8:10],
+            "obstaculos": self.obstaculos[self.inicio_obstaculos[i]:self.inicio_obstaculos[i + 1]],
+            "pelotas": self.pelotas[self.inicio_pelotas[i]:self.inicio_pelotas[i + 1]],
+        }
+
+    def mundo(self, i):
+        return World(disposicion=self.disposicion(i))
+
+    @staticmethod
+    def escribir(directorio, mundos):
+        """Guarda los mundos (o sus disposiciones) en 'directorio' y devuelve el corpus abierto."""
+        fijos, semillas, obstaculos, pelotas = [], [], [], []
+        inicio_obstaculos, inicio_pelotas = [0], [0]
+        tamano = World.tamano_rejilla()
+        for mundo in mundos:
+            datos = mundo.disposicion() if isinstance(mundo, World) else mundo
+            if not np.array_equal(datos["tamano"], tamano):
+                raise ValueError("Todos los mundos de un corpus deben tener el tamaño de la rejilla actual")
+            fijos.append(np.concatenate([datos["estacion"], datos["canasta"], datos["robot"]]))
+            semillas.append(int(datos["semilla"]))
+            obstaculos.append(datos["obstaculos"])
+            pelotas.append(datos["pelotas"])
+            inicio_obstaculos.append(inicio_obstaculos[-1] + len(datos["obstaculos"]))
+            inicio_pelotas.append(inicio_pelotas[-1] + len(datos["pelotas"]))
+
+        os.makedirs(directorio, exist_ok=True)
+        arreglos = {
+            "tamano": tamano,
+            "fijos": np.array(fijos, dtype=np.int32).reshape(-1, 10),
+            "semillas": np.array(semillas, dtype=np.int64),
+            "obstaculos": np.concatenate(obstaculos).astype(np.int32) if obstaculos else np.zeros((0, 4), np.int32),
+            "inicio_obstaculos": np.array(inicio_obstaculos, dtype=np.int64),
+            "pelotas": np.concatenate(pelotas).astype(np.int32) if pelotas else np.zeros((0, 2), np.int32),
+            "inicio_pelotas": np.array(inicio_pelotas, dtype=np.int64),
+        }
+        for nombre, arreglo in arreglos.items():
+            np.save(os.path.join(directorio, nombre + ".npy"), arreglo)
+        return CorpusMundos(directorio)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Crea un corpus de mundos a partir de semillas consecutivas.")
+    parser.add_argument("salida", help="Directorio del corpus")
+    parser.add_argument("--mundos", type=int, default=1000, help="Semillas a probar")
+    parser.add_argument("--semilla", type=int, default=0, help="Primera semilla")
+    parser.add_argument("--resultado", nargs="+", default=None,
+                        help="Guardar solo los mundos cuyo episodio termina así (p. ej. GAME_OVER_STUCK MUERTO)")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--max-ticks", type=int, default=None)
+    args = parser.parse_args()
+
+    semillas = range(args.semilla, args.semilla + args.mundos)
+    if args.resultado:
+        from lote import Lote
+        lote = Lote(args.mundos, args.semilla, args.procesos, args.max_ticks)
+        semillas = sorted(r["semilla"] for r in lote.ejecutar() if r["resultado"] in args.resultado)
+    corpus = CorpusMundos.escribir(args.salida, (World(semilla) for semilla in semillas))
+    print(f"{len(corpus)} mundos guardados en {args.salida}", file=sys.stderr)
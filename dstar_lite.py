@@ -0,0 +1,151 @@
+import heapq
+from motor_astar import MotorRejilla
+
+# ==============================================================================
+# CLASE 11: Planificador Incremental (PlanificadorIncremental)
+# Responsabilidad: Mantener una búsqueda D* Lite hacia un objetivo fijo entre
+# decisiones. La búsqueda va del objetivo hacia el robot, así que el robot
+# puede moverse sin invalidarla; cuando una celda cambia (se recoge o se
+# suelta una pelota) solo se reparan los nodos afectados.
+# ==============================================================================
+class PlanificadorIncremental:
+    INFINITO = float('inf')
+
+    def __init__(self, ocupacion, objetivo):
+        """'objetivo' es el índice plano de la celda destino."""
+        self.ocupacion = ocupacion
+        self.objetivo = objetivo
+        self.filas = ocupacion.filas
+        self.vecinos = MotorRejilla.tabla_vecinos(ocupacion.columnas, ocupacion.filas, ocupacion.fila_minima)
+        total = ocupacion.columnas * ocupacion.filas
+        self.g = [PlanificadorIncremental.INFINITO] * total
+        self.rhs = [PlanificadorIncremental.INFINITO] * total
+        self.km = 0
+        self.ultimo_inicio = None
+        self.inicio = None
+        # Montículo con borrado perezoso: solo vale la entrada cuya clave coincide
+        self.lista_abierta = []
+        self.clave_en_cola = {}
+        self.pendientes = []
+        # Trabajo de la última llamada a ruta() (mismos contadores que MotorRejilla)
+        self.expandidos = 0
+        self.empujes = 0
+        self.descartes = 0
+        self.pico_abierta = 0
+
+        self.rhs[objetivo] = 0
+        self._insertar(objetivo, (self._heuristica(objetivo), 0))
+        ocupacion.suscribir(self._celda_cambiada)
+
+    def liberar(self):
+        self.ocupacion.desuscribir(self._celda_cambiada)
+
+    def _celda_cambiada(self, indice, bloqueada):
+        self.pendientes.append(indice)
+
+    def _heuristica(self, indice):
+        if self.inicio is None:
+            return 0
+        filas = self.filas
+        return abs(indice // filas - self.inicio // filas) + abs(indice % filas - self.inicio % filas)
+
+    def _transitable(self, indice):
+        return indice == self.objetivo or not self.ocupacion.celdas[indice]
+
+    def _calcular_clave(self, indice):
+        minimo = min(self.g[indice], self.rhs[indice])
+        return (minimo + self._heuristica(indice) + self.km, minimo)
+
+    def _insertar(self, indice, clave):
+        self.clave_en_cola[indice] = clave
+        heapq.heappush(self.lista_abierta, (clave[0], clave[1], indice))
+        self.empujes += 1
+        if len(self.lista_abierta) > self.pico_abierta:
+            self.pico_abierta = len(self.lista_abierta)
+
+    def _clave_superior(self):
+        lista_abierta, clave_en_cola = self.lista_abierta, self.clave_en_cola
+        while lista_abierta:
+            k1, k2, indice = lista_abierta[0]
+            if clave_en_cola.get(indice) == (k1, k2):
+                return (k1, k2)
+            heapq.heappop(lista_abierta)
+            self.descartes += 1
+        return (PlanificadorIncremental.INFINITO, PlanificadorIncremental.INFINITO)
+
+    def _actualizar_vertice(self, indice):
+        if indice != self.objetivo:
+            g = self.g
+            mejor = PlanificadorIncremental.INFINITO
+            for vecino in self.vecinos[indice]:
+                if g[vecino] + 1 < mejor and self._transitable(vecino):
+                    mejor = g[vecino] + 1
+            self.rhs[indice] = mejor
+        self.clave_en_cola.pop(indice, None)
+        if self.g[indice] != self.rhs[indice]:
+            self._insertar(indice, self._calcular_clave(indice))
+
+    def _calcular_ruta_mas_corta(self):
+        g, rhs, vecinos, inicio = self.g, self.rhs, self.vecinos, self.inicio
+        while True:
+            clave_superior = self._clave_superior()
+            if clave_superior >= self._calcular_clave(inicio) and rhs[inicio] == g[inicio]:
+                return
+            if clave_superior[0] == PlanificadorIncremental.INFINITO:
+                return
+            _, _, actual = heapq.heappop(self.lista_abierta)
+            del self.clave_en_cola[actual]
+            self.expandidos += 1
+
+            clave_nueva = self._calcular_clave(actual)
+            if clave_superior < clave_nueva:
+                self._insertar(actual, clave_nueva)
+            elif g[actual] > rhs[actual]:
+                g[actual] = rhs[actual]
+                for vecino in vecinos[actual]:
+                    self._actualizar_vertice(vecino)
+            else:
+                g[actual] = PlanificadorIncremental.INFINITO
+                self._actualizar_vertice(actual)
+                for vecino in vecinos[actual]:
+                    self._actualizar_vertice(vecino)
+
+    def ruta(self, inicio):
+        """Camino en índices planos desde 'inicio' (sin incluirlo) o None."""
+        self.expandidos = 0
+        self.empujes = 0
+        self.descartes = 0
+        # La lista abierta sobrevive entre llamadas: el pico parte de lo que ya había
+        self.pico_abierta = len(self.lista_abierta)
+        if self.ultimo_inicio is None:
+            self.ultimo_inicio = inicio
+        self.inicio = inicio
+        filas = self.filas
+        self.km += abs(inicio // filas - self.ultimo_inicio // filas) + abs(inicio % filas - self.ultimo_inicio % filas)
+        self.ultimo_inicio = inicio
+
+        # Entrar en una celda que cambió cuesta distinto: se revisan sus vecinos
+        if self.pendientes:
+            cambiadas = set(self.pendientes)
+            self.pendientes = []
+            for celda in cambiadas:
+                self._actualizar_vertice(celda)
+                for vecino in self.vecinos[celda]:
+                    self._actualizar_vertice(vecino)
+
+        self._calcular_ruta_mas_corta()
+        if self.g[inicio] == PlanificadorIncremental.INFINITO and self.rhs[inicio] == PlanificadorIncremental.INFINITO:
+            return None
+
+        camino = []
+        g, vecinos = self.g, self.vecinos
+        actual = inicio
+        restante = min(g[inicio], self.rhs[inicio])
+        while actual != self.objetivo:
+            siguiente = min((v for v in vecinos[actual] if self._transitable(v)), key=g.__getitem__, default=None)
+            if siguiente is None or g[siguiente] >= restante:
+                return None
+            restante = g[siguiente]
+            camino.append(siguiente)
+            actual = siguiente
+        return camino
@@ -0,0 +1,63 @@
+from config import Config
+
+# ==============================================================================
+# CLASE 22: Estadísticas de Búsqueda (EstadisticasBusqueda)
+# Responsabilidad: Contar el trabajo de una búsqueda (nodos expandidos,
+# entradas metidas en la lista abierta, entradas obsoletas descartadas, el
+# tamaño máximo de la lista abierta y el tiempo) y sumar muchas búsquedas en
+# un acumulado por episodio. Sirve para comparar heurísticas y motores con
+# números y para señalar los mapas en los que las búsquedas se disparan.
+# ==============================================================================
+class EstadisticasBusqueda:
+    CONTADORES = ("expandidos", "empujes", "descartes")
+
+    def __init__(self, expandidos=0, empujes=0, descartes=0, pico_abierta=0, tiempo_ms=0.0):
+        """Sin argumentos es un acumulado vacío, para ir sumando búsquedas con sumar()."""
+        self.expandidos = expandidos
+        self.empujes = empujes
+        self.descartes = descartes
+        self.pico_abierta = pico_abierta
+        self.tiempo_ms = tiempo_ms
+        self.busquedas = 0
+        self.max_expandidos = expandidos
+        self.patologicas = 0
+
+    @classmethod
+    def de_motor(cls, motor, tiempo_ms, celdas=None):
+        """
+        Una búsqueda terminada, con los contadores que deja un motor (MotorRejilla,
+        PlanificadorIncremental) al buscar. Con 'celdas' (las del tablero) se
+        comprueba si es patológica; una búsqueda en anchura hacia muchos objetivos
+        recorre medio tablero por diseño y no se marca.
+        """
+        busqueda = cls(motor.expandidos, motor.empujes, motor.descartes, motor.pico_abierta, tiempo_ms)
+        busqueda.busquedas = 1
+        busqueda.patologicas = int(celdas is not None and cls.es_patologica(busqueda.expandidos, celdas))
+        return busqueda
+
+    @staticmethod
+    def es_patologica(expandidos, celdas):
+        """Una búsqueda que recorre buena parte del tablero delata un mapa problemático."""
+        return expandidos > Config.FRACCION_BUSQUEDA_PATOLOGICA * celdas
+
+    def sumar(self, otra):
+        for campo in EstadisticasBusqueda.CONTADORES:
+            setattr(self, campo, getattr(self, campo) + getattr(otra, campo))
+        self.tiempo_ms += otra.tiempo_ms
+        self.busquedas += otra.busquedas
+        self.patologicas += otra.patologicas
+        self.pico_abierta = max(self.pico_abierta, otra.pico_abierta)
+        self.max_expandidos = max(self.max_expandidos, otra.max_expandidos)
+        return self
+
+    def resumen(self):
+        """Contadores deterministas (sin el tiempo), para el resumen de un episodio."""
+        return {
+            "busquedas": self.busquedas,
+            "expandidos": self.expandidos,
+            "empujes": self.empujes,
+            "descartes": self.descartes,
+            "pico_abierta": self.pico_abierta,
+            "max_expandidos": self.max_expandidos,
+            "busquedas_patologicas": self.patologicas,
+        }
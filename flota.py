@@ -0,0 +1,576 @@
+import argparse
+import heapq
+import os
+import time
+from collections import deque
+import numpy as np
+# Sin pantalla no hace falta el saludo de pygame en la salida estándar
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from config import Config
+from motor_astar import MotorRejilla
+from ocupacion import Ocupacion
+from reservas import TablaReservas
+from poblacion import Poblacion
+from world import World
+
+# ==============================================================================
+# CLASE 18: Flota de Robots (Flota)
+# Responsabilidad: Mover muchos robots en un mismo mundo sin que choquen.
+# Cada pelota la reclama un solo robot; las rutas se planifican con A*
+# cooperativo por ventanas (WHCA*): cada robot busca en espacio-tiempo solo
+# los próximos ticks de la ventana, respetando lo que ya reservaron los demás,
+# y no vuelve a planificar hasta agotar lo planeado. Solo funciona sin
+# pantalla (python flota.py); Game sigue jugando con un único robot.
+# ==============================================================================
+class Flota:
+    INFINITO = float('inf')
+
+    def __init__(self, num_robots=None, semilla=None, max_ticks=None, mundo=None, ventana=None):
+        self.mundo = mundo if mundo is not None else World(semilla)
+        self.semilla = semilla if semilla is not None else self.mundo.semilla
+        self.max_ticks = max_ticks if max_ticks is not None else Config.MAX_TICKS_SIMULACION
+        self.ventana = ventana or Config.VENTANA_RESERVA
+        ocupacion = self.ocupacion = self.mundo.ocupacion
+        self.filas = ocupacion.filas
+        self.vecinos = MotorRejilla.tabla_vecinos(ocupacion.columnas, ocupacion.filas, ocupacion.fila_minima)
+        self.motor = MotorRejilla(ocupacion.columnas, ocupacion.filas, ocupacion.fila_minima)
+        self.reservas = TablaReservas()
+
+        self.estacion = ocupacion.indice(Ocupacion.celda_de_pixel(self.mundo.rect_estacion.center))
+        self.total_pelotas = len(self.mundo.pelotas)
+        # pelota (índice de celda) -> robot que la reclamó
+        self.reclamadas = {}
+        # Distancias reales hasta cada pelota reclamada y cada casa (heurística de A*)
+        self.campos = {}
+        # Turnos para los embudos: solo van hacia la canasta tantos robots como
+        # celdas de entrega tiene, y a la estación de uno en uno. El resto espera
+        # quieto (esperar no gasta batería) en vez de atascarse a la entrada.
+        entregas = sum(1 for d in self.mundo.campo_canasta.distancia if d == 0)
+        self.cupos = {'CANASTA': max(entregas, 1), 'ESTACION': 1}
+        self.con_turno = {destino: set() for destino in self.cupos}
+        self.colas = {destino: deque() for destino in self.cupos}
+
+        # El primer robot sale de donde lo puso el mundo; el resto, de su casa
+        self.casas = np.array(self._elegir_casas(num_robots or Config.NUM_ROBOTS_FLOTA))
+        salidas = [self.mundo.pos_inicio_robot] + [self._esquina(casa) for casa in self.casas[1:].tolist()]
+        # Estado de todos en arreglos; 'robots' son vistas con los atributos de Robot
+        self.poblacion = Poblacion(salidas, self.mundo)
+        self.robots = self.poblacion.vistas
+        self.celdas = [self._celda_robot(robot) for robot in self.robots]
+        self.planes = [deque() for _ in self.robots]
+        # Tick hasta el que un robot sin tarea espera antes de volver a buscar
+        self.en_espera = np.zeros(len(self.robots), dtype=np.int64)
+        for i, celda in enumerate(self.celdas):
+            self.reservas.aparcar(i, celda, 0)
+
+        self.tick = 0
+        self.pasos = 0
+        self.entregadas = 0
+        self.planificaciones = 0
+        self.expandidos = 0
+        self.resultado = None
+
+    def _elegir_casas(self, cantidad):
+        """
+        Celdas donde espera cada robot cuando no tiene nada que hacer. Se buscan
+        en campo abierto (sus 8 vecinas libres), lejos de la canasta y de la
+        estación y sin tocarse entre sí: un robot quieto ahí siempre se puede
+        rodear, así que nunca tapa un pasillo. Si no hay bastantes, se completan
+        con celdas que tampoco cortan el paso (ver _corta_el_paso), para que
+        los robots parados no encierren a los que trabajan, y solo con el mapa
+        lleno con cualquier celda libre.
+        """
+        ocupacion = self.ocupacion
+        canasta, estacion = self.mundo.campo_canasta.distancia, self.mundo.campo_estacion.distancia
+        inicio = ocupacion.indice(Ocupacion.celda_de_pixel(self.mundo.pos_inicio_robot))
+        libres = [ocupacion.indice((x, y)) for x in range(ocupacion.columnas) for y in range(ocupacion.fila_minima, ocupacion.filas)
+                  if not ocupacion.celda_bloqueada((x, y)) and ocupacion.indice((x, y)) != inicio]
+        self.mundo.aleatorio.shuffle(libres)
+
+        def alrededor(indice):
+            x, y = divmod(indice, self.filas)
+            return [(x + dx, y + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+        casas, tomadas = [], {inicio}
+        for indice in libres:
+            if len(casas) == cantidad:
+                break
+            if canasta[indice] <= 2 or estacion[indice] <= 2 or canasta[indice] == Flota.INFINITO:
+                continue
+            cerca = alrededor(indice)
+            if any(ocupacion.celda_bloqueada(c) or c[1] < ocupacion.fila_minima or ocupacion.indice(c) in tomadas for c in cerca):
+                continue
+            casas.append(indice)
+            tomadas.add(indice)
+            tomadas.update(ocupacion.indice(c) for c in cerca)
+        elegidas = set(casas)
+        for indice in libres:
+            if len(casas) == cantidad:
+                break
+            if indice in elegidas or canasta[indice] <= 2 or estacion[indice] <= 2 or canasta[indice] == Flota.INFINITO:
+                continue
+            if not self._corta_el_paso(indice, elegidas):
+                casas.append(indice)
+                elegidas.add(indice)
+        # Último recurso, con el mapa lleno: cualquier celda libre (los que estorben se apartarán)
+        casas.extend([indice for indice in libres if indice not in elegidas][:cantidad - len(casas)])
+        if len(casas) < cantidad:
+            raise ValueError(f"No caben {cantidad} robots: solo hay {len(libres) + 1} celdas libres")
+        return casas
+
+    def _corta_el_paso(self, indice, casas):
+        """
+        ¿Dejaría un robot aparcado en 'indice' incomunicadas celdas de paso
+        (libres o con pelota, sin contar las 'casas')? Es una comprobación
+        local: no corta nada si sus vecinas de paso siguen unidas rodeándola por
+        su anillo de 8 celdas. Además necesita una salida propia, y cada casa
+        vecina tiene que conservar otra, o su robot no podría volver a salir.
+        """
+        ocupacion = self.ocupacion
+        x, y = divmod(indice, self.filas)
+
+        def de_paso(celda, sin=None):
+            return (ocupacion.dentro(celda) and celda[1] >= ocupacion.fila_minima
+                    and ocupacion.celdas[ocupacion.indice(celda)] in (Ocupacion.LIBRE, Ocupacion.PELOTA)
+                    and ocupacion.indice(celda) not in casas and celda != sin)
+
+        # Anillo en orden: dos celdas consecutivas se tocan por un lado; las pares son las vecinas
+        anillo = [(x, y - 1), (x + 1, y - 1), (x + 1, y), (x + 1, y + 1),
+                  (x, y + 1), (x - 1, y + 1), (x - 1, y), (x - 1, y - 1)]
+        libre = [de_paso(celda) for celda in anillo]
+        if not any(libre[0::2]):
+            return True
+        tramos = 0
+        for inicio in range(8):
+            if libre[inicio] and not libre[inicio - 1]:
+                k, con_vecina = inicio, False
+                while libre[k % 8] and k < inicio + 8:
+                    con_vecina |= k % 2 == 0
+                    k += 1
+                tramos += con_vecina
+        if tramos > 1:
+            return True
+        for vecina in anillo[0::2]:
+            if ocupacion.dentro(vecina) and ocupacion.indice(vecina) in casas:
+                vx, vy = vecina
+                if not any(de_paso(c, sin=(x, y)) for c in ((vx + 1, vy), (vx - 1, vy), (vx, vy + 1), (vx, vy - 1))):
+                    return True
+        return False
+
+    def _celda_robot(self, robot):
+        return self.ocupacion.indice(Ocupacion.celda_de_pixel(robot.rect.center))
+
+    def _esquina(self, indice):
+        return ((indice // self.filas) * Config.TAMANO_CELDA, (indice % self.filas) * Config.TAMANO_CELDA)
+
+    def _pixel(self, indice):
+        return ((indice // self.filas) * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2,
+                (indice % self.filas) * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2)
+
+    def _campo_hacia(self, meta):
+        """BFS desde 'meta' tratando las pelotas como libres: nunca sobreestima."""
+        distancia = self.campos.get(meta)
+        if distancia is None:
+            celdas, vecinos = self.ocupacion.celdas, self.vecinos
+            distancia = [Flota.INFINITO] * len(celdas)
+            distancia[meta] = 0
+            cola = deque((meta,))
+            while cola:
+                actual = cola.popleft()
+                siguiente = distancia[actual] + 1
+                for vecino in vecinos[actual]:
+                    if siguiente < distancia[vecino] and celdas[vecino] in (Ocupacion.LIBRE, Ocupacion.PELOTA):
+                        distancia[vecino] = siguiente
+                        cola.append(vecino)
+            self.campos[meta] = distancia
+        return distancia
+
+    # --- Un tick ---
+
+    def paso(self):
+        """Avanza un tick: decide quién replanifica y mueve a todos una celda como mucho."""
+        if self.resultado:
+            return self.resultado
+
+        t = self.tick
+        self.reservas.olvidar_antes(t)
+        # Los que esperan sin tarea no se miran hasta que vence su espera
+        planes, poblacion = self.planes, self.poblacion
+        despiertos = poblacion.vivos() & ((self.en_espera <= t) | (poblacion.estado != Poblacion.CODIGOS['BUSCANDO'])
+                                          | (np.array(self.celdas) != self.casas))
+        for i in np.flatnonzero(despiertos).tolist():
+            if not planes[i]:
+                self._decidir(i, self.robots[i], t)
+
+        # Todos los movimientos del tick (y su gasto de batería) de una sola vez
+        self.poblacion.recargar()
+        indices, destinos = [], []
+        for i, plan in enumerate(self.planes):
+            if not plan:
+                continue
+            siguiente = plan.popleft()
+            if siguiente != self.celdas[i]:
+                indices.append(i)
+                destinos.append(self._esquina(siguiente))
+                self.celdas[i] = siguiente
+        self.pasos += len(indices)
+        for i in self.poblacion.mover(indices, destinos).tolist():
+            # Un robot sin batería queda fuera de juego y deja de reservar celdas
+            self._soltar_reclamo(self.robots[i])
+            self._soltar_turno(i, 'CANASTA')
+            self._soltar_turno(i, 'ESTACION')
+            self.planes[i].clear()
+            self.reservas.desaparcar(i)
+
+        self.tick += 1
+        self.resultado = self._comprobar_final()
+        return self.resultado
+
+    def _decidir(self, i, robot, t):
+        celda = self.celdas[i]
+        self._manejar_llegada(i, robot, celda)
+
+        if robot.estado == 'RECARGANDO':
+            # La carga la suma Poblacion.recargar a todos los de la estación a la vez
+            if robot.carga < Config.CARGA_MAXIMA:
+                return
+            robot.estado = 'RECOGIDO' if robot.lleva_pelota else 'BUSCANDO'
+            self._soltar_turno(i, 'ESTACION')
+
+        if robot.carga <= self._carga_para_volver(celda) and robot.estado in ('BUSCANDO', 'RECOGIDO'):
+            # Va a cargar con la pelota a cuestas (si la lleva) y luego sigue con la entrega
+            self._soltar_reclamo(robot)
+            self._soltar_turno(i, 'CANASTA')
+            robot.estado = 'CARGAR'
+
+        distancia = meta_bloqueada = None
+        if robot.estado == 'CARGAR':
+            if not self._pedir_turno(i, 'ESTACION'):
+                return
+            distancia, meta_bloqueada = self.mundo.campo_estacion.distancia, self.estacion
+        elif robot.estado == 'RECOGIDO':
+            if self._pedir_turno(i, 'CANASTA'):
+                distancia = self.mundo.campo_canasta.distancia
+        elif robot.pelota_objetivo is not None or (t >= self.en_espera[i] and self._reclamar_pelota(i, robot, celda)):
+            meta_bloqueada = self.ocupacion.indice(Ocupacion.celda_de_pixel(robot.pelota_objetivo))
+            distancia = self._campo_hacia(meta_bloqueada)
+        else:
+            # Nada alcanzable: vuelve a mirar tras una ventana
+            self.en_espera[i] = max(self.en_espera[i], t + self.ventana)
+
+        if distancia is None:
+            # Sin tarea o esperando turno: se espera en casa para no tapar el paso
+            if celda == self.casas[i]:
+                return
+            meta_bloqueada = self.casas[i]
+            distancia = self._campo_hacia(meta_bloqueada)
+
+        plan = self._planificar(i, celda, t, distancia, meta_bloqueada)
+        if (not plan or all(c == celda for c in plan)) and self._apartar(i, celda, t, distancia, meta_bloqueada) and plan:
+            # Se vuelve a planificar en cuanto se haya apartado
+            plan = plan[:1]
+        if plan:
+            self.planes[i].extend(plan)
+            self.reservas.reservar(i, celda, t, plan)
+
+    def _apartar(self, i, celda, t, distancia, meta_bloqueada):
+        """
+        El robot 'i' no avanza y mira a los robots parados (sin plan o
+        esperando) en las vecinas por las que se acercaría a su meta. Si 'i' va
+        a por una pelota y uno de ellos está buscando, se intercambian las
+        pelotas. Si no, los de menos prioridad (_rango, y a igualdad el índice
+        mayor, así que dos nunca se empujan mutuamente) se van a la celda libre
+        más próxima que no esté en su camino, y esa celda pasa a ser su casa.
+        Sin esto los robots que esperan en su casa pueden encerrar para siempre
+        a los que trabajan en un pasillo estrecho. Devuelve si cambió algo.
+        """
+        poblacion = self.poblacion
+        vivos = poblacion.vivos()
+        quietos = {c: j for j, c in enumerate(self.celdas) if vivos[j] and all(p == c for p in self.planes[j])
+                   and poblacion.estado[j] != Poblacion.CODIGOS['RECARGANDO']}
+        delante = [v for v in self.vecinos[celda] if v in quietos and (v == meta_bloqueada or distancia[v] < distancia[celda])]
+        if self.robots[i].pelota_objetivo is not None:
+            # Las pelotas son todas iguales: se la queda el que está parado delante
+            for v in delante:
+                j = quietos[v]
+                if self.robots[j].estado == 'BUSCANDO' and not self.robots[j].lleva_pelota:
+                    self._intercambiar_pelotas(i, j, t)
+                    return True
+
+        # Robots que 'i' puede empujar, por celda
+        prioridad = (self._rango(i), -i)
+        empujables = {c: j for c, j in quietos.items() if (self._rango(j), -j) < prioridad}
+        estorbos = [v for v in delante if v in empujables]
+        if not estorbos:
+            return False
+
+        # Camino que seguiría 'i' si nadie estorbara: ahí no se aparca
+        camino, actual = {celda}, celda
+        for _ in range(self.ventana):
+            siguiente = min(self.vecinos[actual], key=lambda v: distancia[v])
+            if distancia[siguiente] >= distancia[actual]:
+                break
+            camino.add(siguiente)
+            actual = siguiente
+        ocupadas = {c for j, c in enumerate(self.celdas) if vivos[j]}
+        apartados = 0
+        for origen in estorbos:
+            if origen in empujables and self._empujar(origen, t, camino, ocupadas, empujables):
+                apartados += 1
+        return apartados > 0
+
+    def _empujar(self, origen, t, camino, ocupadas, empujables):
+        """
+        Lleva al robot de 'origen' a la celda libre más cercana fuera de
+        'camino'. Si por el medio hay otros robots empujables, se mueven todos a
+        la vez por la misma ruta, cada uno hasta donde estaba el siguiente y el
+        último hasta el refugio, como un tren que avanza un hueco.
+        """
+        casas = set(self.casas.tolist())
+        canasta, estacion = self.mundo.campo_canasta.distancia, self.mundo.campo_estacion.distancia
+        celdas = self.ocupacion.celdas
+        padre = {origen: None}
+        cola = deque((origen,))
+        while cola:
+            actual = cola.popleft()
+            if actual not in ocupadas and actual not in camino and actual not in casas \
+                    and canasta[actual] > 1 and estacion[actual] > 1:
+                ruta = [actual]
+                while padre[ruta[-1]] is not None:
+                    ruta.append(padre[ruta[-1]])
+                ruta.reverse()
+                if self._mover_tren(ruta, t, empujables):
+                    return True
+                continue
+            for vecino in self.vecinos[actual]:
+                if vecino not in padre and celdas[vecino] == Ocupacion.LIBRE \
+                        and (vecino not in ocupadas or vecino in empujables):
+                    padre[vecino] = actual
+                    cola.append(vecino)
+        return False
+
+    def _mover_tren(self, ruta, t, empujables):
+        """Mueve por 'ruta' a los robots empujables que están en ella (ver _empujar), si sus reservas lo permiten."""
+        posiciones = [k for k, c in enumerate(ruta) if c in empujables]
+        tren = [empujables[ruta[k]] for k in posiciones]
+        tramos = [ruta[k + 1:hasta + 1] for k, hasta in zip(posiciones, posiciones[1:] + [len(ruta) - 1])]
+        if not all(self._ruta_libre(j, ruta[k], t, tramo, ignorar=tren) for j, k, tramo in zip(tren, posiciones, tramos)):
+            return False
+        # De delante hacia atrás: cada uno aparca donde ya no está aparcado el siguiente
+        for j, k, tramo in reversed(list(zip(tren, posiciones, tramos))):
+            # Lo que le quedaba era esperar ahí: se cambia por el tramo del tren
+            self.reservas.cancelar(j, t, self.planes[j])
+            self.planes[j].clear()
+            self.planes[j].extend(tramo)
+            self.reservas.reservar(j, ruta[k], t, tramo)
+            self.casas[j] = tramo[-1]
+            del empujables[ruta[k]]
+        return True
+
+    def _intercambiar_pelotas(self, i, j, t):
+        """'i' cede su pelota a 'j', que está parado más cerca de ella, y se queda con la de 'j' (si tenía)."""
+        a, b = self.robots[i], self.robots[j]
+        a.pelota_objetivo, b.pelota_objetivo = b.pelota_objetivo, a.pelota_objetivo
+        for robot, k in ((a, i), (b, j)):
+            if robot.pelota_objetivo is not None:
+                self.reclamadas[self.ocupacion.indice(Ocupacion.celda_de_pixel(robot.pelota_objetivo))] = k
+        # 'j' solo estaba esperando: vuelve a decidir, sin dejar de ocupar su celda
+        self.reservas.cancelar(j, t, self.planes[j])
+        self.planes[j].clear()
+        self.reservas.aparcar(j, self.celdas[j], t)
+        self.en_espera[j] = min(self.en_espera[j], t)
+
+    def _rango(self, i):
+        """Quién se abre paso: primero los que tienen turno, luego los que van a por una pelota."""
+        if i in self.con_turno['CANASTA'] or i in self.con_turno['ESTACION']:
+            return 2
+        return 1 if self.robots[i].pelota_objetivo is not None else 0
+
+    def _ruta_libre(self, i, inicio, t0, ruta, ignorar=()):
+        """¿Puede 'i' seguir 'ruta' desde 'inicio' en t0, un paso por tick, y quedarse al final?"""
+        reservas, anterior = self.reservas, inicio
+        for t, celda in enumerate(ruta, t0 + 1):
+            if not reservas.libre(i, anterior, celda, t, ignorar):
+                return False
+            anterior = celda
+        return reservas.puede_aparcar(anterior, t0 + len(ruta), ignorar)
+
+    def _carga_para_volver(self, celda):
+        """
+        Batería con la que hay que ir a cargar desde 'celda', como
+        Robot.carga_para_volver: la distancia a la estación por el margen de
+        seguridad. Como no se vuelve a mirar hasta acabar lo planificado, se
+        cuenta una ventana entera alejándose: la distancia crece en 'ventana'
+        celdas y se gasta lo de esos pasos. Nunca menos que CARGA_EMERGENCIA.
+        """
+        distancia = self.mundo.campo_estacion.distancia[celda]
+        if distancia == Flota.INFINITO:
+            return Config.CARGA_EMERGENCIA
+        return max(Config.CARGA_EMERGENCIA,
+                   (distancia + self.ventana) * Config.CARGA_POR_MOVIMIENTO * Config.MARGEN_SEGURIDAD_BATERIA
+                   + self.ventana * Config.CARGA_POR_MOVIMIENTO)
+
+    def _pedir_turno(self, i, destino):
+        """Pone al robot en la cola de 'destino' y dice si ya puede ir (por orden de llegada)."""
+        if i in self.con_turno[destino]:
+            return True
+        cola = self.colas[destino]
+        if i not in cola:
+            cola.append(i)
+        if cola[0] == i and len(self.con_turno[destino]) < self.cupos[destino]:
+            cola.popleft()
+            self.con_turno[destino].add(i)
+            return True
+        return False
+
+    def _soltar_turno(self, i, destino):
+        self.con_turno[destino].discard(i)
+        if i in self.colas[destino]:
+            self.colas[destino].remove(i)
+
+    def _manejar_llegada(self, i, robot, celda):
+        if robot.estado == 'BUSCANDO' and robot.pelota_objetivo is not None \
+                and Ocupacion.celda_de_pixel(robot.pelota_objetivo) == Ocupacion.celda_de_pixel(robot.rect.center):
+            pelota = robot.pelota_objetivo
+            self._soltar_reclamo(robot)
+            self.mundo.pelotas.remove(pelota)
+            self.ocupacion.retirar_pelota(pelota)
+            robot.lleva_pelota = True
+            robot.estado = 'RECOGIDO'
+        elif robot.estado == 'RECOGIDO' and self.mundo.campo_canasta.distancia[celda] == 0:
+            robot.lleva_pelota = False
+            self._soltar_turno(i, 'CANASTA')
+            robot.recogidas += 1
+            self.entregadas += 1
+            robot.estado = 'BUSCANDO'
+        elif robot.estado == 'CARGAR' and celda == self.estacion:
+            robot.estado = 'RECARGANDO'
+
+    def _reclamar_pelota(self, i, robot, celda):
+        libres = {self.ocupacion.indice(Ocupacion.celda_de_pixel(p)) for p in self.mundo.pelotas}
+        libres.difference_update(self.reclamadas)
+        if not libres:
+            return False
+        pelota, _ = self.motor.bfs_multiobjetivo(celda, libres, self.ocupacion.celdas)
+        if pelota is None:
+            return False
+        self.reclamadas[pelota] = i
+        robot.pelota_objetivo = self._pixel(pelota)
+        return True
+
+    def _soltar_reclamo(self, robot):
+        if robot.pelota_objetivo is not None:
+            pelota = self.ocupacion.indice(Ocupacion.celda_de_pixel(robot.pelota_objetivo))
+            self.reclamadas.pop(pelota, None)
+            self.campos.pop(pelota, None)
+            robot.pelota_objetivo = None
+
+    def _planificar(self, i, inicio, t0, distancia, meta_bloqueada):
+        """
+        A* en espacio-tiempo hasta la meta o hasta el final de la ventana, lo que
+        llegue antes. Esperar en el sitio también es un movimiento. Al llegar al
+        borde de la ventana se cuenta la distancia real que falta, así que el plan
+        parcial avanza hacia la meta. Devuelve las celdas de los ticks t0+1, t0+2...
+        """
+        self.planificaciones += 1
+        reservas, celdas, vecinos = self.reservas, self.ocupacion.celdas, self.vecinos
+        limite = t0 + self.ventana
+        h_inicio = distancia[inicio]
+        if h_inicio == Flota.INFINITO:
+            # Se sale de una celda ocupada (la estación, p. ej.): vale su mejor vecino
+            h_inicio = min(distancia[v] for v in vecinos[inicio]) + 1
+            if h_inicio == Flota.INFINITO:
+                return None
+
+        reservas.desaparcar(i)
+        padre = {(inicio, t0): None}
+        abierta = [(h_inicio, h_inicio, t0, inicio)]
+        final = None
+        while abierta:
+            _, h, t, actual = heapq.heappop(abierta)
+            self.expandidos += 1
+            if (h == 0 or t == limite) and reservas.puede_aparcar(actual, t):
+                final = (actual, t)
+                break
+            if t == limite:
+                continue
+            for vecino in vecinos[actual] + (actual,):
+                if (vecino, t + 1) in padre:
+                    continue
+                if vecino != actual and celdas[vecino] and vecino != meta_bloqueada:
+                    continue
+                if not reservas.libre(i, actual, vecino, t + 1):
+                    continue
+                h_vecino = h if vecino == actual else distancia[vecino]
+                if h_vecino == Flota.INFINITO:
+                    continue
+                padre[(vecino, t + 1)] = (actual, t)
+                heapq.heappush(abierta, (t + 1 - t0 + h_vecino, h_vecino, t + 1, vecino))
+
+        if final is None:
+            reservas.aparcar(i, inicio, t0)
+            return None
+        plan = []
+        while final[1] > t0:
+            plan.append(final[0])
+            final = padre[final]
+        plan.reverse()
+        if not plan:
+            reservas.aparcar(i, inicio, t0)
+        return plan
+
+    def _comprobar_final(self):
+        poblacion = self.poblacion
+        vivos = np.flatnonzero(poblacion.vivos()).tolist()
+        if self.entregadas == self.total_pelotas:
+            return 'GAME_OVER'
+        if not vivos:
+            return 'MUERTO'
+        if not self.reclamadas and (poblacion.estado[vivos] == Poblacion.CODIGOS['BUSCANDO']).all() \
+                and not poblacion.lleva_pelota[vivos].any() and (self.en_espera[vivos] >= self.tick).all():
+            # Quedan pelotas, pero ningún robot vivo llega a ninguna
+            return 'GAME_OVER_STUCK'
+        if self.tick >= self.max_ticks:
+            return 'LIMITE_TICKS'
+        return None
+
+    def ejecutar(self):
+        inicio = time.perf_counter()
+        while not self.paso():
+            pass
+        self.duracion = time.perf_counter() - inicio
+        return self.resumen()
+
+    def resumen(self):
+        return {
+            "semilla": self.semilla,
+            "robots": len(self.robots),
+            "resultado": self.resultado,
+            "ticks": self.tick,
+            "pasos": self.pasos,
+            "recogidas": self.entregadas,
+            "pelotas": self.total_pelotas,
+            "vivos": sum(robot.estado != 'MUERTO' for robot in self.robots),
+            "bateria_usada": self.pasos * Config.CARGA_POR_MOVIMIENTO,
+            "planificaciones": self.planificaciones,
+            "expandidos": self.expandidos,
+        }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Varios robots recogiendo pelotas en el mismo mundo, sin pantalla.")
+    parser.add_argument("--robots", type=int, default=None)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--pelotas", type=int, default=None)
+    parser.add_argument("--obstaculos", type=int, default=None)
+    parser.add_argument("--ventana", type=int, default=None, help="Ticks que abarca cada plan cooperativo")
+    parser.add_argument("--max-ticks", type=int, default=None)
+    args = parser.parse_args()
+
+    mundo = World(args.semilla, args.obstaculos, num_pelotas=args.pelotas)
+    flota = Flota(args.robots, max_ticks=args.max_ticks, mundo=mundo, ventana=args.ventana)
+    resumen = flota.ejecutar()
+    print(f"{resumen['robots']} robots (semilla {resumen['semilla']}): {resumen['resultado']} | "
+          f"ticks: {resumen['ticks']} | recogidas: {resumen['recogidas']}/{resumen['pelotas']} | "
+          f"vivos: {resumen['vivos']} | planificaciones: {resumen['planificaciones']} | "
+          f"{flota.duracion / max(resumen['ticks'], 1) * 1000:.2f} ms/tick")
@@ -1,12 +1,17 @@
 # game.py (Versión Completa y Final)
 import pygame
 import sys
-import os
+import time
 from config import Config
 from render import Render
 from robot import Robot
 from world import World
 from pathfinder import Pathfinder
+from recursos import Recursos
+from audio import Audio
+from reloj_simulacion import RelojSimulacion
+from perfilador import Perfilador
+from planificador_recorrido import PlanificadorRecorrido
 
 pygame.init()
 # ==============================================================================
@@ -16,18 +21,19 @@ pygame.init()
 # ==============================================================================
 class Game:
     def __init__(self):
-        # Configuración de la Pantalla
+        # Configuración de la Pantalla (la cuadrícula se ajusta al monitor real)
+        Config.detectar_pantalla()
         self.pantalla = pygame.display.set_mode((Config.ANCHO, Config.ALTO), pygame.FULLSCREEN)
         pygame.display.set_caption("AgentQuest v3.0")
         self.reloj = pygame.time.Clock()
+        # La lógica avanza a paso fijo y a la velocidad elegida (+/-), aparte de los fotogramas
+        self.reloj_simulacion = RelojSimulacion()
+        self.pos_anterior_robot = None
+        # Instrumentación opcional (F3); apagada no envuelve nada
+        self.perfilador = Perfilador(Game.objetivos_perfil())
 
-        # GESTIÓN DE AUDIO (Inicialización)
-        pygame.mixer.init()
-
-        # Ruta de la carpeta de sonidos (asumiendo 'Sonido' singular)
-        self.ruta_base_sonidos = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Sonido")
-        # Canal para efectos de sonido (SFX) para no interferir con la música
-        self.canal_sfx = pygame.mixer.Channel(0) 
+        # GESTIÓN DE AUDIO (Inicialización): efectos en memoria y música en su propio hilo
+        self.audio = Audio()
 
         # Variables de Juego/Menú
         self.pathfinder = None
@@ -37,6 +43,11 @@ class Game:
         self.paso_dev = False
         self.mantener_dev = False
         
+        # Mientras se muestra el menú, un hilo lee del disco las imágenes de todos
+        # los temas, las fuentes y los efectos de sonido
+        imagenes, fuentes = Render.recursos_necesarios()
+        Recursos.precargar(imagenes, fuentes, self.audio.rutas_sfx())
+
         # Inicialización del Renderizador
         tema_default = list(Config.TEMAS.keys())[0]
         self.render = Render(self.pantalla, tema_default) 
@@ -48,47 +59,19 @@ class Game:
     # LÓGICA DE AUDIO
     
     def reproducir_sfx(self, nombre_archivo, loop=0):
-        """Carga y reproduce un efecto de sonido sin detener la música."""
-        try:
-            ruta = os.path.join(self.ruta_base_sonidos, nombre_archivo)
-            sfx = pygame.mixer.Sound(ruta)
-            self.canal_sfx.play(sfx, loop)
-            return True
-        except Exception as e:
-            print(f"Advertencia: No se pudo cargar el SFX '{nombre_archivo}': {e}")
-            return False
+        """Reproduce un efecto de sonido sin detener la música."""
+        return self.audio.reproducir_sfx(nombre_archivo, loop)
 
     def cargar_musica_menu(self):
-        """Carga y reproduce la música de fondo para los estados de menú/selección."""
-        try:
-            pygame.mixer.music.stop() 
-            self.canal_sfx.stop() 
-            ruta = os.path.join(self.ruta_base_sonidos, Config.MUSICA_MENU)
-            pygame.mixer.music.load(ruta)
-            pygame.mixer.music.play(-1)
-        except Exception as e:
-            print(f"Advertencia: No se pudo cargar la música del menú: {e}")
+        """Pone la música de fondo de los estados de menú/selección (sin esperar a que cargue)."""
+        self.audio.cambiar_musica(Config.MUSICA_MENU)
 
     def cargar_musica_tema(self):
-        """Carga y reproduce la música de fondo del tema actualmente elegido."""
+        """Pone la música de fondo del tema actualmente elegido (sin esperar a que cargue)."""
         if not self.tema_elegido:
-            pygame.mixer.music.stop()
+            self.audio.detener_musica()
             return
-            
-        tema = Config.TEMAS[self.tema_elegido]
-        nombre_musica = tema.get("musica_fondo")
-        
-        if nombre_musica:
-            try:
-                pygame.mixer.music.stop() 
-                self.canal_sfx.stop() 
-                ruta = os.path.join(self.ruta_base_sonidos, nombre_musica)
-                pygame.mixer.music.load(ruta)
-                pygame.mixer.music.play(-1)
-            except Exception as e:
-                print(f"Advertencia: No se pudo cargar la música del tema '{self.tema_elegido}': {e}")
-        else:
-            pygame.mixer.music.stop()
+        self.audio.cambiar_musica(Config.TEMAS[self.tema_elegido].get("musica_fondo"))
             
 
     # LÓGICA DE ESTADO Y MENÚ
@@ -112,16 +95,52 @@ class Game:
         self.render = Render(self.pantalla, tema_key)
         self.pathfinder = Pathfinder()
         self.mundo = World()
-        self.robot = Robot(self.mundo.pos_inicio_robot[0], self.mundo.pos_inicio_robot[1])
+        self.robot = Robot(self.mundo.pos_inicio_robot[0], self.mundo.pos_inicio_robot[1], self.mundo)
+        # Los enfriamientos del robot cuentan tiempo simulado, no tiempo real
+        self.reloj_simulacion.reiniciar()
+        self.robot.reloj = self.reloj_simulacion.tiempo_logico
+        if Config.PLANIFICAR_RECORRIDO:
+            self.robot.recorrido = PlanificadorRecorrido(self.mundo)
+        self.pos_anterior_robot = None
         self.estado_juego = 'MENU' 
 
+    @staticmethod
+    def objetivos_perfil():
+        """Partes del fotograma que mide el perfilador: (sección, clase o módulo, método)."""
+        return [
+            ("eventos", Game, "manejar_eventos"),
+            ("logica", Game, "actualizar"),
+            ("busqueda", Pathfinder, "buscar"),
+            ("busqueda", Pathfinder, "buscar_pelota_cercana"),
+            ("busqueda", Pathfinder, "a_estrella"),
+            ("busqueda_paso", Pathfinder, "iniciar_busqueda"),
+            ("busqueda_paso", Pathfinder, "paso"),
+            ("capa_estatica", Render, "_obtener_capa_estatica"),
+            ("capa_astar", Render, "_capa_puntajes_astar"),
+            ("pelotas", Render, "_dibujar_pelotas"),
+            ("robot", Render, "_dibujar_robot"),
+            ("hud", Render, "_dibujar_hud"),
+            ("overlays", Render, "_dibujar_overlays"),
+            ("volcado", pygame.display, "flip"),
+            ("volcado", pygame.display, "update"),
+        ]
+
     def ejecutar(self):
         corriendo = True
+        anterior = time.perf_counter()
         while corriendo:
             corriendo = self.manejar_eventos()
-            self.actualizar()
+            ahora = time.perf_counter()
+            self.reloj_simulacion.avanzar((ahora - anterior) * 1000, self.actualizar,
+                                          lambda: self.estado_juego == 'RUNNING')
+            anterior = ahora
+            # Las órdenes de música cuyo archivo ya leyó el hilo de audio
+            self.audio.atender()
             self.dibujar()
+            self.perfilador.cerrar_fotograma()
             self.reloj.tick(60)
+        self.perfilador.desactivar()
+        self.audio.cerrar()
         pygame.quit()
         sys.exit()
 
@@ -134,6 +153,24 @@ class Game:
                 
                 if evento.key == pygame.K_ESCAPE:
                     return False
+
+                # Perfilador: F3 lo enciende/apaga, F4 guarda las trazas en CSV y JSON
+                if evento.key == pygame.K_F3:
+                    self.perfilador.alternar()
+                    continue
+                if evento.key == pygame.K_F4 and self.perfilador.trazas:
+                    base = time.strftime("perfil_%Y%m%d_%H%M%S")
+                    self.perfilador.exportar(base + ".csv")
+                    self.perfilador.exportar(base + ".json")
+                    continue
+
+                # Velocidad de la simulación (+ y -): de x1 a x100 y MAX
+                if evento.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    self.reloj_simulacion.acelerar()
+                    continue
+                if evento.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    self.reloj_simulacion.frenar()
+                    continue
                 
                 # Regresar a SELECCION (Q)
                 if evento.key == pygame.K_q and self.estado_juego != 'SELECCION':
@@ -161,10 +198,10 @@ class Game:
                 if evento.key == pygame.K_SPACE and self.estado_juego in ['RUNNING', 'PAUSED']:
                     if self.estado_juego == 'RUNNING':
                         self.estado_juego = 'PAUSED'
-                        pygame.mixer.music.pause()
+                        self.audio.pausar_musica()
                     else:
                         self.estado_juego = 'RUNNING'
-                        pygame.mixer.music.unpause()
+                        self.audio.reanudar_musica()
                     continue
 
                 # Lógica de REINICIO SUAVE (R)
@@ -196,6 +233,7 @@ class Game:
         teclas = pygame.key.get_pressed()
         if self.modo_desarrollador: 
             self.mantener_dev = teclas[pygame.K_a]
+        self.pos_anterior_robot = self.robot.rect.topleft
 
         nuevo_estado = self.robot.actualizar(
             self.mundo.pelotas, self.mundo.rect_estacion, self.mundo.rect_canasta, self.pathfinder,
@@ -209,7 +247,7 @@ class Game:
             self.estado_juego = nuevo_estado
             
             # Detener la música de fondo y reproducir SFX
-            pygame.mixer.music.stop()
+            self.audio.detener_musica()
             
             if nuevo_estado == 'GAME_OVER': # Éxito: Pelotas entregadas
                 self.reproducir_sfx(Config.SONIDO_VICTORIA)
@@ -221,10 +259,21 @@ class Game:
                     self.reproducir_sfx(nombre_gameover)
         self.robot.animar_movimiento(self.modo_desarrollador)
 
+    def posicion_robot_interpolada(self):
+        """Dónde dibujar el robot: entre su posición del tick anterior y la actual."""
+        if self.estado_juego != 'RUNNING' or self.pos_anterior_robot is None or self.modo_desarrollador:
+            return None
+        alfa = self.reloj_simulacion.interpolacion()
+        (x0, y0), (x1, y1) = self.pos_anterior_robot, self.robot.rect.topleft
+        return (round(x0 + (x1 - x0) * alfa), round(y0 + (y1 - y0) * alfa))
+
     def dibujar(self):
         self.render.dibujar(
             self.estado_juego, self.mundo, self.robot, self.modo_desarrollador, 
-            self.pathfinder, self.opciones_menu, self.opcion_seleccionada
+            self.pathfinder, self.opciones_menu, self.opcion_seleccionada,
+            posicion_robot=self.posicion_robot_interpolada(),
+            velocidad=self.reloj_simulacion.texto_velocidad(),
+            perfil=self.perfilador.resumen() if self.perfilador.activo else None
         )
 
 
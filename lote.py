@@ -0,0 +1,169 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+# Sin pantalla no hace falta el saludo de pygame (ni en cada proceso de trabajo)
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from config import Config
+from corpus import CorpusMundos
+from simulacion import Simulacion
+
+# ==============================================================================
+# CLASE 12: Ejecución por Lotes (Lote)
+# Responsabilidad: Correr muchos episodios sin pantalla, cada uno con su
+# semilla, repartidos en un grupo de procesos. Entrega los resultados de cada
+# episodio en cuanto terminan y acumula las estadísticas del lote completo.
+# ==============================================================================
+RESULTADOS_FINALES = ('GAME_OVER', 'MUERTO', 'GAME_OVER_STUCK', 'LIMITE_TICKS')
+# Corpus ya abiertos en este proceso (se mapean una sola vez por proceso)
+_corpus_abiertos = {}
+
+
+def _iniciar_proceso(ancho, alto):
+    # Los procesos hijos usan la misma cuadrícula que el proceso principal
+    Config.establecer_pantalla(ancho, alto)
+
+
+def _abrir_corpus(directorio):
+    if directorio not in _corpus_abiertos:
+        _corpus_abiertos[directorio] = CorpusMundos(directorio)
+    return _corpus_abiertos[directorio]
+
+
+def _ejecutar_episodio(argumentos):
+    semilla, max_ticks, motor, corpus, recorrido = argumentos
+    inicio = time.perf_counter()
+    if corpus is None:
+        simulacion = Simulacion(semilla, max_ticks, motor, recorrido=recorrido)
+        resumen = simulacion.ejecutar()
+    else:
+        # Con corpus, 'semilla' es el índice del mundo dentro del corpus
+        simulacion = Simulacion(None, max_ticks, motor, _abrir_corpus(corpus).mundo(semilla), recorrido)
+        resumen = simulacion.ejecutar()
+        resumen["indice_corpus"] = semilla
+    resumen["duracion"] = time.perf_counter() - inicio
+    resumen["tiempo_busqueda_ms"] = simulacion.pathfinder.estadisticas.tiempo_ms
+    return resumen
+
+
+class Lote:
+    def __init__(self, episodios, semilla_inicial=0, procesos=None, max_ticks=None, motor=None, corpus=None,
+                 recorrido=None):
+        """
+        Con 'corpus' (directorio de CorpusMundos) se juegan sus mundos desde el
+        índice 'semilla_inicial'; 'episodios' None significa hasta el final.
+        """
+        if corpus is not None and episodios is None:
+            episodios = len(_abrir_corpus(corpus)) - semilla_inicial
+        self.episodios = episodios
+        self.corpus = corpus
+        self.semilla_inicial = semilla_inicial
+        self.procesos = procesos or multiprocessing.cpu_count()
+        self.max_ticks = max_ticks
+        self.motor = motor
+        self.recorrido = recorrido
+        self.resultados = Counter()
+        self.completados = 0
+        self.total_pasos = 0
+        self.total_bateria = 0.0
+        self.total_recogidas = 0
+        self.duracion = 0.0
+        # Trabajo de búsqueda de todos los episodios (ver EstadisticasBusqueda)
+        self.total_busquedas = 0
+        self.total_expandidos = 0
+        self.total_empujes = 0
+        self.total_descartes = 0
+        self.pico_abierta = 0
+        self.tiempo_busqueda_ms = 0.0
+        # Episodios con alguna búsqueda patológica: semilla (o índice del corpus) para reproducirlos
+        self.patologicos = []
+
+    def ejecutar(self):
+        """Generador: devuelve el resumen de cada episodio en cuanto termina."""
+        argumentos = [(self.semilla_inicial + i, self.max_ticks, self.motor, self.corpus, self.recorrido)
+                      for i in range(self.episodios)]
+        inicio = time.perf_counter()
+        if self.procesos <= 1:
+            for resumen in map(_ejecutar_episodio, argumentos):
+                self._acumular(resumen)
+                self.duracion = time.perf_counter() - inicio
+                yield resumen
+            return
+
+        # Bloques pequeños: reparto equilibrado sin pagar un viaje por episodio
+        tamano_bloque = max(1, self.episodios // (self.procesos * 8))
+        with multiprocessing.Pool(self.procesos, _iniciar_proceso, (Config.SCREEN_ANCHO, Config.SCREEN_ALTO)) as grupo:
+            for resumen in grupo.imap_unordered(_ejecutar_episodio, argumentos, tamano_bloque):
+                self._acumular(resumen)
+                self.duracion = time.perf_counter() - inicio
+                yield resumen
+
+    def _acumular(self, resumen):
+        self.completados += 1
+        self.resultados[resumen["resultado"]] += 1
+        self.total_pasos += resumen["pasos"]
+        self.total_bateria += resumen["bateria_usada"]
+        self.total_recogidas += resumen["recogidas"]
+        self.total_busquedas += resumen["busquedas"]
+        self.total_expandidos += resumen["expandidos"]
+        self.total_empujes += resumen["empujes"]
+        self.total_descartes += resumen["descartes"]
+        self.pico_abierta = max(self.pico_abierta, resumen["pico_abierta"])
+        self.tiempo_busqueda_ms += resumen.get("tiempo_busqueda_ms", 0.0)
+        if resumen["busquedas_patologicas"]:
+            self.patologicos.append(resumen.get("indice_corpus", resumen["semilla"]))
+
+    def estadisticas(self):
+        completados = max(self.completados, 1)
+        return {
+            "episodios": self.completados,
+            "procesos": self.procesos,
+            "duracion": self.duracion,
+            "episodios_por_segundo": self.completados / self.duracion if self.duracion else 0.0,
+            "resultados": {clave: self.resultados.get(clave, 0) for clave in RESULTADOS_FINALES},
+            "tasa_exito": self.resultados.get('GAME_OVER', 0) / completados,
+            "tasa_atascado": self.resultados.get('GAME_OVER_STUCK', 0) / completados,
+            "pasos_medios": self.total_pasos / completados,
+            "bateria_media": self.total_bateria / completados,
+            "recogidas_medias": self.total_recogidas / completados,
+            "busquedas_medias": self.total_busquedas / completados,
+            "expandidos_por_busqueda": self.total_expandidos / max(self.total_busquedas, 1),
+            "empujes_por_busqueda": self.total_empujes / max(self.total_busquedas, 1),
+            "descartes_por_busqueda": self.total_descartes / max(self.total_busquedas, 1),
+            "pico_abierta": self.pico_abierta,
+            "tiempo_busqueda_medio_ms": self.tiempo_busqueda_ms / completados,
+            "episodios_patologicos": sorted(self.patologicos),
+        }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Ejecuta muchos episodios sin pantalla en paralelo.")
+    parser.add_argument("--episodios", type=int, default=None, help="Por defecto 1000, o todo el corpus")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del primer episodio")
+    parser.add_argument("--procesos", type=int, default=None, help="Por defecto, uno por núcleo")
+    parser.add_argument("--max-ticks", type=int, default=None)
+    parser.add_argument("--motor", choices=["CLASICO", "PLANO", "JPS", "INCREMENTAL"], default=None)
+    parser.add_argument("--salida", default=None, help="Archivo JSON Lines con un resumen por episodio")
+    parser.add_argument("--corpus", default=None, help="Directorio de un corpus de mundos (ver corpus.py)")
+    parser.add_argument("--recorrido", action="store_true", default=None,
+                        help="Recorrido planificado en vez de la pelota más cercana")
+    args = parser.parse_args()
+
+    if args.episodios is None and args.corpus is None:
+        args.episodios = 1000
+    lote = Lote(args.episodios, args.semilla, args.procesos, args.max_ticks, args.motor, args.corpus, args.recorrido)
+    salida = open(args.salida, "w") if args.salida else None
+    try:
+        for resumen in lote.ejecutar():
+            if salida:
+                salida.write(json.dumps(resumen) + "\n")
+            if lote.completados % 100 == 0:
+                print(f"{lote.completados}/{lote.episodios} episodios "
+                      f"({lote.completados / lote.duracion:.1f} episodios/s)", file=sys.stderr)
+    finally:
+        if salida:
+            salida.close()
+    print(json.dumps(lote.estadisticas(), indent=2))
@@ -0,0 +1,347 @@
+import heapq
+from collections import deque
+from functools import lru_cache
+import numpy as np
+
+# ==============================================================================
+# CLASE 9: Motor A* sobre arreglos planos (MotorRejilla)
+# Responsabilidad: Ejecutar A* con índices enteros de celda en lugar de tuplas.
+# Los arreglos de puntajes y padres se reservan una sola vez y se reutilizan
+# entre búsquedas gracias a un sello de generación, así que nunca se limpian.
+# El índice de la celda (x, y) es x * filas + y, el mismo orden que las tuplas,
+# por lo que los desempates (y las rutas) son idénticos a Pathfinder.a_estrella.
+# ==============================================================================
+class MotorRejilla:
+    # Mismo orden de vecinos que Pathfinder: abajo, arriba, derecha, izquierda
+    DIRECCIONES = ((0, 1), (0, -1), (1, 0), (-1, 0))
+    # Bits reservados para el índice de celda y para cada puntaje en el montículo
+    BITS_INDICE = 24
+    BITS_PUNTAJE = 24
+
+    def __init__(self, columnas, filas, fila_minima=0):
+        self.columnas = columnas
+        self.filas = filas
+        self.fila_minima = fila_minima
+        total = columnas * filas
+
+        self.puntaje_g = [0] * total
+        self.padre = [0] * total
+        self.sello = [0] * total
+        self.generacion = 0
+        # Trabajo de la última búsqueda: nodos expandidos, entradas metidas en la
+        # lista abierta, entradas obsoletas sacadas sin expandir y tamaño máximo
+        self.expandidos = 0
+        self.empujes = 0
+        self.descartes = 0
+        self.pico_abierta = 0
+        # Tablas de salto de JPS+ y la versión del mapa con la que se calcularon
+        self.saltos_derecha = None
+        self.saltos_izquierda = None
+        self.clave_saltos = None
+
+        self.coord_x = [i // filas for i in range(total)]
+        self.coord_y = [i % filas for i in range(total)]
+        self.vecinos = MotorRejilla.tabla_vecinos(columnas, filas, fila_minima)
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def tabla_vecinos(columnas, filas, fila_minima):
+        """Vecinos válidos (dentro del tablero y fuera del HUD) de cada índice plano."""
+        vecinos = []
+        for i in range(columnas * filas):
+            x, y = i // filas, i % filas
+            vecinos.append(tuple(
+                (x + dx) * filas + (y + dy) for dx, dy in MotorRejilla.DIRECCIONES
+                if 0 <= x + dx < columnas and fila_minima <= y + dy < filas
+            ))
+        return tuple(vecinos)
+
+    def indice(self, celda):
+        return celda[0] * self.filas + celda[1]
+
+    def celda(self, indice):
+        return (self.coord_x[indice], self.coord_y[indice])
+
+    def nueva_generacion(self):
+        self.generacion += 1
+        return self.generacion
+
+    def _anotar(self, expandidos, empujes, descartes, pico_abierta):
+        self.expandidos = expandidos
+        self.empujes = empujes
+        self.descartes = descartes
+        self.pico_abierta = pico_abierta
+
+    def reconstruir(self, inicio, actual):
+        camino = []
+        padre = self.padre
+        while actual != inicio:
+            camino.append(actual)
+            actual = padre[actual]
+        camino.reverse()
+        return camino
+
+    def a_estrella(self, inicio, objetivo, bloqueadas):
+        """
+        Busca de 'inicio' a 'objetivo' (índices planos). 'bloqueadas' se indexa
+        por índice plano y es distinto de cero en las celdas no transitables.
+        Devuelve la lista de índices del camino (sin el inicio) o None.
+        """
+        puntaje_g, padre, sello, vecinos = self.puntaje_g, self.padre, self.sello, self.vecinos
+        coord_x, coord_y = self.coord_x, self.coord_y
+        objetivo_x, objetivo_y = coord_x[objetivo], coord_y[objetivo]
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        generacion = self.nueva_generacion()
+        # Contadores en variables locales: se copian al motor al terminar
+        expandidos, empujes, descartes, pico = 0, 1, 0, 1
+        sello[inicio] = generacion
+        puntaje_g[inicio] = 0
+        puntaje_h_inicial = abs(coord_x[inicio] - objetivo_x) + abs(coord_y[inicio] - objetivo_y)
+        # Cada entrada es un solo entero (f, h, índice) empaquetado en bits:
+        # se compara igual que la tupla pero sin crear objetos en el montículo.
+        desp_h, desp_f = MotorRejilla.BITS_INDICE, MotorRejilla.BITS_INDICE + MotorRejilla.BITS_PUNTAJE
+        mascara_indice = (1 << desp_h) - 1
+        mascara_h = (1 << MotorRejilla.BITS_PUNTAJE) - 1
+        lista_abierta = [(puntaje_h_inicial << desp_f) | (puntaje_h_inicial << desp_h) | inicio]
+
+        while lista_abierta:
+            entrada = heappop(lista_abierta)
+            actual = entrada & mascara_indice
+            if actual == objetivo:
+                self._anotar(expandidos, empujes, descartes, pico)
+                return self.reconstruir(inicio, actual)
+
+            g_actual = puntaje_g[actual]
+            if g_actual + ((entrada >> desp_h) & mascara_h) < (entrada >> desp_f):
+                # Entrada obsoleta: el nodo ya se expandió con un puntaje mejor
+                descartes += 1
+                continue
+
+            expandidos += 1
+            g_tentativo = g_actual + 1
+            for vecino in vecinos[actual]:
+                if sello[vecino] == generacion and g_tentativo >= puntaje_g[vecino]:
+                    continue
+                if bloqueadas[vecino] and vecino != objetivo:
+                    continue
+                sello[vecino] = generacion
+                puntaje_g[vecino] = g_tentativo
+                padre[vecino] = actual
+                dx = coord_x[vecino] - objetivo_x
+                dy = coord_y[vecino] - objetivo_y
+                puntaje_h_val = (dx if dx >= 0 else -dx) + (dy if dy >= 0 else -dy)
+                heappush(lista_abierta, ((g_tentativo + puntaje_h_val) << desp_f) | (puntaje_h_val << desp_h) | vecino)
+                empujes += 1
+            if len(lista_abierta) > pico:
+                pico = len(lista_abierta)
+        self._anotar(expandidos, empujes, descartes, pico)
+        return None
+
+    def bfs_multiobjetivo(self, inicio, objetivos, bloqueadas):
+        """
+        Búsqueda en anchura desde 'inicio' que se detiene en el primer índice de
+        'objetivos' que alcanza (el más cercano por camino). Los objetivos pueden
+        estar bloqueados. Devuelve (objetivo, camino) o (None, None).
+        """
+        if inicio in objetivos:
+            self._anotar(0, 0, 0, 0)
+            return inicio, []
+        padre, sello, vecinos = self.padre, self.sello, self.vecinos
+        generacion = self.nueva_generacion()
+        sello[inicio] = generacion
+        cola = deque((inicio,))
+        # En anchura no hay entradas obsoletas: cada celda entra en la cola una sola vez
+        expandidos, pico = 0, 1
+        while cola:
+            if len(cola) > pico:
+                pico = len(cola)
+            actual = cola.popleft()
+            expandidos += 1
+            for vecino in vecinos[actual]:
+                if sello[vecino] == generacion:
+                    continue
+                if vecino in objetivos:
+                    padre[vecino] = actual
+                    self._anotar(expandidos, expandidos + len(cola), 0, pico)
+                    return vecino, self.reconstruir(inicio, vecino)
+                sello[vecino] = generacion
+                if bloqueadas[vecino]:
+                    continue
+                padre[vecino] = actual
+                cola.append(vecino)
+        self._anotar(expandidos, expandidos, 0, pico)
+        return None, None
+
+    def preparar_saltos(self, bloqueadas, clave_mapa=None):
+        """
+        Precalcula (JPS+) para cada celda y sentido horizontal la primera parada
+        de un salto: un vecino forzado (x >= 0) o una pared (codificada como
+        -(x + 2)). Con 'clave_mapa' (p. ej. la versión de la rejilla) las tablas
+        se reutilizan mientras el mapa no cambie.
+        """
+        if clave_mapa is not None and clave_mapa == self.clave_saltos:
+            return
+        columnas, filas = self.columnas, self.filas
+        # Rejilla con un borde bloqueado alrededor; el HUD también cuenta como pared
+        bloqueo = np.ones((columnas + 2, filas + 2), dtype=bool)
+        bloqueo[1:-1, 1:-1] = np.frombuffer(bloqueadas, dtype=np.uint8).reshape(columnas, filas) != 0
+        bloqueo[:, :self.fila_minima + 1] = True
+        libre = ~bloqueo
+        centro = bloqueo[1:-1, 1:-1]
+        xs = np.arange(columnas)[:, None]
+        sin_parada = columnas + 1
+
+        def tabla(desplazamiento):
+            # Vecino forzado: se puede girar en vertical pero no desde la celda anterior
+            anterior = slice(1 - desplazamiento, columnas + 1 - desplazamiento)
+            forzado = (libre[1:-1, 2:] & bloqueo[anterior, 2:]) | (libre[1:-1, :-2] & bloqueo[anterior, :-2])
+            es_parada = centro | forzado
+            codigo = np.where(centro, -(xs + 2), xs)
+            if desplazamiento > 0:
+                posiciones = np.where(es_parada, xs, sin_parada)
+                siguiente = np.minimum.accumulate(posiciones[::-1], axis=0)[::-1]
+                siguiente = np.vstack([siguiente[1:], np.full((1, filas), sin_parada)])
+                borde = -(columnas + 2)
+            else:
+                posiciones = np.where(es_parada, xs, -1)
+                siguiente = np.maximum.accumulate(posiciones, axis=0)
+                siguiente = np.vstack([np.full((1, filas), -1), siguiente[:-1]])
+                borde = -1
+            fuera = (siguiente == sin_parada) | (siguiente < 0)
+            indices = np.clip(siguiente, 0, columnas - 1)
+            resultado = np.where(fuera, borde, np.take_along_axis(codigo, indices, axis=0))
+            return resultado.reshape(-1).tolist()
+
+        self.saltos_derecha = tabla(1)
+        self.saltos_izquierda = tabla(-1)
+        self.clave_saltos = clave_mapa
+
+    def jps(self, inicio, objetivo, bloqueadas, clave_mapa=None):
+        """
+        Jump Point Search para la rejilla 4-conexa de coste uniforme. Solo expande
+        los puntos de salto; los tramos rectos se resuelven con las tablas de
+        preparar_saltos(). Las rutas tienen la misma longitud que las de
+        a_estrella (el desempate entre rutas igual de cortas puede ser distinto).
+        """
+        self.preparar_saltos(bloqueadas, clave_mapa)
+        columnas, filas, fila_minima = self.columnas, self.filas, self.fila_minima
+        coord_x, coord_y = self.coord_x, self.coord_y
+        puntaje_g, padre, sello = self.puntaje_g, self.padre, self.sello
+        saltos_derecha, saltos_izquierda = self.saltos_derecha, self.saltos_izquierda
+        objetivo_x, objetivo_y = coord_x[objetivo], coord_y[objetivo]
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        def libre(x, y):
+            if not (0 <= x < columnas and fila_minima <= y < filas):
+                return False
+            indice = x * filas + y
+            return not bloqueadas[indice] or indice == objetivo
+
+        def saltar_horizontal_lento(x, y, dx):
+            # Recorrido celda a celda; solo junto a la fila del objetivo, donde
+            # la excepción del objetivo cambia qué vecinos son forzados
+            while True:
+                x += dx
+                if not libre(x, y):
+                    return None
+                if x == objetivo_x and y == objetivo_y:
+                    return x, y
+                if (libre(x, y + 1) and not libre(x - dx, y + 1)) or \
+                   (libre(x, y - 1) and not libre(x - dx, y - 1)):
+                    return x, y
+
+        def saltar_horizontal(x, y, dx):
+            if y == objetivo_y - 1 or y == objetivo_y + 1:
+                return saltar_horizontal_lento(x, y, dx)
+            parada = (saltos_derecha if dx > 0 else saltos_izquierda)[x * filas + y]
+            pared = parada < 0
+            parada_x = -parada - 2 if pared else parada
+            if y == objetivo_y and (x < objetivo_x <= parada_x if dx > 0 else parada_x <= objetivo_x < x):
+                return objetivo_x, y
+            return None if pared else (parada_x, y)
+
+        def saltar_vertical(x, y, dy):
+            # En vertical, cualquier punto de salto alcanzable de lado convierte
+            # la celda actual en punto de salto (los giros a horizontal son naturales)
+            while True:
+                y += dy
+                if not libre(x, y):
+                    return None
+                if x == objetivo_x and y == objetivo_y:
+                    return x, y
+                if saltar_horizontal(x, y, 1) is not None or saltar_horizontal(x, y, -1) is not None:
+                    return x, y
+
+        generacion = self.nueva_generacion()
+        expandidos, empujes, descartes, pico = 0, 1, 0, 1
+        sello[inicio] = generacion
+        puntaje_g[inicio] = 0
+        desp_h, desp_f = MotorRejilla.BITS_INDICE, MotorRejilla.BITS_INDICE + MotorRejilla.BITS_PUNTAJE
+        mascara_indice = (1 << desp_h) - 1
+        mascara_h = (1 << MotorRejilla.BITS_PUNTAJE) - 1
+        puntaje_h_inicial = abs(coord_x[inicio] - objetivo_x) + abs(coord_y[inicio] - objetivo_y)
+        lista_abierta = [(puntaje_h_inicial << desp_f) | (puntaje_h_inicial << desp_h) | inicio]
+
+        while lista_abierta:
+            entrada = heappop(lista_abierta)
+            actual = entrada & mascara_indice
+            if actual == objetivo:
+                self._anotar(expandidos, empujes, descartes, pico)
+                return self._interpolar(self.reconstruir(inicio, actual), inicio)
+
+            g_actual = puntaje_g[actual]
+            if g_actual + ((entrada >> desp_h) & mascara_h) < (entrada >> desp_f):
+                descartes += 1
+                continue
+            expandidos += 1
+
+            x, y = coord_x[actual], coord_y[actual]
+            saltos = []
+            if actual == inicio:
+                saltos = [saltar_vertical(x, y, 1), saltar_vertical(x, y, -1),
+                          saltar_horizontal(x, y, 1), saltar_horizontal(x, y, -1)]
+            else:
+                px, py = coord_x[padre[actual]], coord_y[padre[actual]]
+                if px == x:
+                    dy = 1 if y > py else -1
+                    saltos = [saltar_vertical(x, y, dy), saltar_horizontal(x, y, 1), saltar_horizontal(x, y, -1)]
+                else:
+                    dx = 1 if x > px else -1
+                    saltos = [saltar_horizontal(x, y, dx)]
+                    for dy in (1, -1):
+                        if libre(x, y + dy) and not libre(x - dx, y + dy):
+                            saltos.append(saltar_vertical(x, y, dy))
+
+            for salto in saltos:
+                if salto is None:
+                    continue
+                sx, sy = salto
+                vecino = sx * filas + sy
+                g_tentativo = g_actual + abs(sx - x) + abs(sy - y)
+                if sello[vecino] == generacion and g_tentativo >= puntaje_g[vecino]:
+                    continue
+                sello[vecino] = generacion
+                puntaje_g[vecino] = g_tentativo
+                padre[vecino] = actual
+                puntaje_h_val = abs(sx - objetivo_x) + abs(sy - objetivo_y)
+                heappush(lista_abierta, ((g_tentativo + puntaje_h_val) << desp_f) | (puntaje_h_val << desp_h) | vecino)
+                empujes += 1
+            if len(lista_abierta) > pico:
+                pico = len(lista_abierta)
+        self._anotar(expandidos, empujes, descartes, pico)
+        return None
+
+    def _interpolar(self, puntos_salto, inicio):
+        """Rellena las celdas intermedias entre puntos de salto consecutivos."""
+        camino = []
+        filas = self.filas
+        actual = inicio
+        for siguiente in puntos_salto:
+            paso = filas if self.coord_x[siguiente] > self.coord_x[actual] else \
+                -filas if self.coord_x[siguiente] < self.coord_x[actual] else \
+                1 if siguiente > actual else -1
+            while actual != siguiente:
+                actual += paso
+                camino.append(actual)
+        return camino
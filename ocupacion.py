@@ -0,0 +1,91 @@
+import numpy as np
+from config import Config
+
+# ==============================================================================
+# CLASE 8: Rejilla de Ocupación (Ocupacion)
+# Responsabilidad: Guardar qué celdas del mundo están bloqueadas en un arreglo
+# compacto de NumPy. El mundo la construye una vez y la actualiza al recoger o
+# soltar pelotas; el robot y el buscador de caminos la leen directamente.
+# ==============================================================================
+class Ocupacion:
+    LIBRE = 0
+    OBSTACULO = 1
+    PELOTA = 2
+    ESTACION = 3
+    CANASTA = 4
+
+    def __init__(self, columnas=None, filas=None):
+        self.columnas = columnas if columnas is not None else Config.ANCHO // Config.TAMANO_CELDA
+        self.filas = filas if filas is not None else Config.ALTO // Config.TAMANO_CELDA
+        self.fila_minima = Config.ALTURA_HUD // Config.TAMANO_CELDA
+        # Indexada como rejilla[x, y]; en memoria el índice plano es x * filas + y
+        self.rejilla = np.zeros((self.columnas, self.filas), dtype=np.uint8)
+        # Vista plana para lecturas rápidas desde Python puro (devuelve int)
+        self.celdas = memoryview(self.rejilla.reshape(-1))
+        # Aumenta con cada cambio; sirve para invalidar resultados guardados
+        self.version = 0
+        # Funciones f(indice, bloqueada) avisadas cada vez que una celda cambia
+        self.suscriptores = []
+
+    @staticmethod
+    def celda_de_pixel(pos):
+        return (pos[0] // Config.TAMANO_CELDA, pos[1] // Config.TAMANO_CELDA)
+
+    def indice(self, celda):
+        return celda[0] * self.filas + celda[1]
+
+    def dentro(self, celda):
+        return 0 <= celda[0] < self.columnas and 0 <= celda[1] < self.filas
+
+    def celda_bloqueada(self, celda):
+        if not self.dentro(celda):
+            return True
+        return self.celdas[celda[0] * self.filas + celda[1]] != Ocupacion.LIBRE
+
+    def __contains__(self, pos):
+        # Permite usar la rejilla igual que el antiguo conjunto de centros en píxeles
+        return self.celda_bloqueada(Ocupacion.celda_de_pixel(pos))
+
+    def suscribir(self, funcion):
+        self.suscriptores.append(funcion)
+
+    def desuscribir(self, funcion):
+        if funcion in self.suscriptores:
+            self.suscriptores.remove(funcion)
+
+    def _avisar(self, indice, valor):
+        for funcion in self.suscriptores:
+            funcion(indice, valor != Ocupacion.LIBRE)
+
+    def marcar_rect(self, rect, valor):
+        x0, y0 = rect.left // Config.TAMANO_CELDA, rect.top // Config.TAMANO_CELDA
+        x1, y1 = -(-rect.right // Config.TAMANO_CELDA), -(-rect.bottom // Config.TAMANO_CELDA)
+        x0, y0 = max(x0, 0), max(y0, 0)
+        self.rejilla[x0:x1, y0:y1] = valor
+        self.version += 1
+        if self.suscriptores:
+            for x in range(x0, min(x1, self.columnas)):
+                for y in range(y0, min(y1, self.filas)):
+                    self._avisar(x * self.filas + y, valor)
+
+    def marcar_pixel(self, pos, valor):
+        celda = Ocupacion.celda_de_pixel(pos)
+        if not self.dentro(celda):
+            return False
+        self.rejilla[celda] = valor
+        self.version += 1
+        self._avisar(self.indice(celda), valor)
+        return True
+
+    def retirar_pelota(self, pos):
+        celda = Ocupacion.celda_de_pixel(pos)
+        if self.dentro(celda) and self.rejilla[celda] == Ocupacion.PELOTA:
+            return self.marcar_pixel(pos, Ocupacion.LIBRE)
+        return False
+
+    def colocar_pelota(self, pos):
+        # Nunca se pisa un obstáculo fijo: al recogerla se borraría por error
+        celda = Ocupacion.celda_de_pixel(pos)
+        if self.dentro(celda) and self.rejilla[celda] == Ocupacion.LIBRE:
+            return self.marcar_pixel(pos, Ocupacion.PELOTA)
+        return False
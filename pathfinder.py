@@ -1,5 +1,12 @@
 import heapq
+import time
+from collections import OrderedDict
 from config import Config
+from ocupacion import Ocupacion
+from motor_astar import MotorRejilla
+from campo_distancias import CampoDistancias
+from dstar_lite import PlanificadorIncremental
+from estadisticas_busqueda import EstadisticasBusqueda
 
 # ==============================================================================
 # CLASE 2: Buscador de Caminos (Pathfinder)
@@ -7,7 +14,34 @@ from config import Config
 # es recibir un inicio, un fin y obstáculos, y devolver el mejor camino.
 # ==============================================================================
 class Pathfinder:
-    def __init__(self):
+    MOTORES = ("CLASICO", "PLANO", "JPS", "INCREMENTAL")
+
+    def __init__(self, motor=None, tamano_cache=None):
+        self.motor = motor or Config.MOTOR_BUSQUEDA
+        if self.motor not in Pathfinder.MOTORES:
+            raise ValueError(f"Motor de búsqueda desconocido: {self.motor}")
+        # El motor plano y la caché se conservan entre búsquedas (no los toca limpiar())
+        self.motor_rejilla = None
+        self.tamano_cache = Config.TAMANO_CACHE_RUTAS if tamano_cache is None else tamano_cache
+        # (inicio, objetivo) -> (ruta, índices de sus celdas); caduca solo lo que toca una celda cambiada
+        self.cache_rutas = OrderedDict()
+        # Para buscar pelotas: orígenes ya vistos y, si se repiten, un campo de distancias desde ellos
+        self.origenes_vistos = set()
+        self.campos_origen = OrderedDict()
+        self.aciertos_cache = 0
+        self.fallos_cache = 0
+        self._cache_ocupacion = None
+        self._cache_version = None
+        # Búsquedas D* Lite vivas por celda objetivo (motor INCREMENTAL)
+        self.planificadores = OrderedDict()
+        self._planificadores_ocupacion = None
+        self.planificadores_reutilizados = 0
+        # Cambia con cada limpiar(): quien dibuje los puntajes sabe que empezó otra búsqueda
+        self.generacion_busqueda = 0
+        # Trabajo de la última búsqueda terminada y el acumulado de toda la
+        # vida de la instancia (un episodio: Game y Simulacion crean una por partida)
+        self.ultima_busqueda = None
+        self.estadisticas = EstadisticasBusqueda()
         self.limpiar()
 
     def limpiar(self):
@@ -16,19 +50,50 @@ class Pathfinder:
         self.lista_abierta = []
         self.lista_cerrada = set()
         self.pos_objetivo = None
-        self.celdas_obstaculos = set()
+        self.celda_bloqueada = lambda celda: False
         self.camino_final = set()
+        # Nodos cuyo puntaje o color cambió desde la última vez que se dibujaron
+        self.nodos_modificados = set()
+        self.generacion_busqueda += 1
+        # Contadores de la búsqueda paso a paso en curso (ver iniciar_busqueda)
+        self.busqueda_en_curso = None
+
+    def tomar_nodos_modificados(self):
+        """Devuelve los nodos cambiados desde la llamada anterior y vacía la lista."""
+        nodos, self.nodos_modificados = self.nodos_modificados, set()
+        return nodos
 
     @staticmethod
     def heuristica(a, b):
         return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
     @staticmethod
-    def a_estrella(nodo_inicio, nodo_objetivo, obstaculos):
+    def funcion_bloqueo(obstaculos):
+        """Devuelve una función celda -> bool para un conjunto de píxeles o una Ocupacion."""
+        if isinstance(obstaculos, Ocupacion):
+            return obstaculos.celda_bloqueada
+        return {(obs[0] // Config.TAMANO_CELDA, obs[1] // Config.TAMANO_CELDA) for obs in obstaculos}.__contains__
+
+    @staticmethod
+    def celdas_tablero(motor=None):
+        """Celdas transitables en principio (todo el tablero menos el HUD)."""
+        if motor is not None:
+            return motor.columnas * (motor.filas - motor.fila_minima)
+        return (Config.ANCHO // Config.TAMANO_CELDA) * ((Config.ALTO - Config.ALTURA_HUD) // Config.TAMANO_CELDA)
+
+    def _registrar(self, fuente, inicio, celdas=None):
+        """Guarda como última búsqueda los contadores de 'fuente' y los suma al acumulado."""
+        tiempo_ms = (time.perf_counter() - inicio) * 1000
+        self.ultima_busqueda = EstadisticasBusqueda.de_motor(fuente or EstadisticasBusqueda(), tiempo_ms, celdas)
+        self.estadisticas.sumar(self.ultima_busqueda)
+
+    @staticmethod
+    def a_estrella(nodo_inicio, nodo_objetivo, obstaculos, estadisticas=None):
+        """Con 'estadisticas' (EstadisticasBusqueda) se anotan en ella los contadores de la búsqueda."""
         pos_inicio = (nodo_inicio[0] // Config.TAMANO_CELDA, nodo_inicio[1] // Config.TAMANO_CELDA)
         pos_objetivo = (nodo_objetivo[0] // Config.TAMANO_CELDA, nodo_objetivo[1] // Config.TAMANO_CELDA)
 
-        celdas_obstaculos = {(obs[0] // Config.TAMANO_CELDA, obs[1] // Config.TAMANO_CELDA) for obs in obstaculos}
+        celda_bloqueada = Pathfinder.funcion_bloqueo(obstaculos)
 
         vecinos = [(0, 1), (0, -1), (1, 0), (-1, 0)]
         puntaje_g = {pos_inicio: 0}
@@ -39,12 +104,15 @@ class Pathfinder:
         
         viene_de = {}
         lista_cerrada = set()
+        expandidos, empujes, descartes, pico = 0, 1, 0, 1
 
         while lista_abierta:
             # --- MODIFICADO: Obtener el tercer elemento [2] de la tupla ---
             actual = heapq.heappop(lista_abierta)[2]
             
             if actual == pos_objetivo:
+                if estadisticas is not None:
+                    Pathfinder._anotar(estadisticas, expandidos, empujes, descartes, pico)
                 camino = []
                 while actual in viene_de:
                     camino.append(actual)
@@ -53,35 +121,294 @@ class Pathfinder:
                 return [(p[0] * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2,
                          p[1] * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2) for p in camino]
 
+            if actual in lista_cerrada:
+                # Entrada obsoleta: con una heurística consistente volver a expandir no mejora nada
+                descartes += 1
+                continue
             lista_cerrada.add(actual)
+            expandidos += 1
             for dx, dy in vecinos:
                 vecino = actual[0] + dx, actual[1] + dy
                 g_tentativo = puntaje_g[actual] + 1
                 if g_tentativo < puntaje_g.get(vecino, float('inf')):
                     es_valido = (0 <= vecino[0] < Config.ANCHO // Config.TAMANO_CELDA and
                                  Config.ALTURA_HUD // Config.TAMANO_CELDA <= vecino[1] < Config.ALTO // Config.TAMANO_CELDA and
-                                 (vecino not in celdas_obstaculos or vecino == pos_objetivo))
+                                 (not celda_bloqueada(vecino) or vecino == pos_objetivo))
                     if es_valido:
                         viene_de[vecino] = actual
                         puntaje_g[vecino] = g_tentativo
                         puntaje_h_val = Pathfinder.heuristica(vecino, pos_objetivo)
                         puntaje_f_val = g_tentativo + puntaje_h_val
                         heapq.heappush(lista_abierta, (puntaje_f_val, puntaje_h_val, vecino))
+                        empujes += 1
+            pico = max(pico, len(lista_abierta))
+        if estadisticas is not None:
+            Pathfinder._anotar(estadisticas, expandidos, empujes, descartes, pico)
+        return None
+
+    @staticmethod
+    def _anotar(estadisticas, expandidos, empujes, descartes, pico_abierta):
+        estadisticas.expandidos = expandidos
+        estadisticas.empujes = empujes
+        estadisticas.descartes = descartes
+        estadisticas.pico_abierta = pico_abierta
+
+    def obtener_motor_rejilla(self, columnas, filas, fila_minima):
+        motor = self.motor_rejilla
+        if motor is None or (motor.columnas, motor.filas, motor.fila_minima) != (columnas, filas, fila_minima):
+            motor = self.motor_rejilla = MotorRejilla(columnas, filas, fila_minima)
+        return motor
+
+    def preparar_rejilla(self, obstaculos):
+        """Devuelve el motor plano y las celdas bloqueadas indexables por índice plano."""
+        if isinstance(obstaculos, Ocupacion):
+            motor = self.obtener_motor_rejilla(obstaculos.columnas, obstaculos.filas, obstaculos.fila_minima)
+            return motor, obstaculos.celdas
+
+        columnas = Config.ANCHO // Config.TAMANO_CELDA
+        filas = Config.ALTO // Config.TAMANO_CELDA
+        motor = self.obtener_motor_rejilla(columnas, filas, Config.ALTURA_HUD // Config.TAMANO_CELDA)
+        bloqueadas = bytearray(columnas * filas)
+        for obs in obstaculos:
+            x, y = obs[0] // Config.TAMANO_CELDA, obs[1] // Config.TAMANO_CELDA
+            if 0 <= x < columnas and 0 <= y < filas:
+                bloqueadas[x * filas + y] = 1
+        return motor, bloqueadas
+
+    def vaciar_cache(self):
+        if self._cache_ocupacion is not None:
+            self._cache_ocupacion.desuscribir(self._celda_cambiada)
+        for campo in self.campos_origen.values():
+            campo.liberar()
+        self.cache_rutas.clear()
+        self.campos_origen.clear()
+        self.origenes_vistos.clear()
+        self._cache_ocupacion = None
+        self._cache_version = None
+
+    def _seguir_rejilla(self, ocupacion):
+        """La caché se suscribe a la rejilla para enterarse de cada celda que cambia."""
+        if ocupacion is self._cache_ocupacion and ocupacion.version == self._cache_version:
+            return
+        # Otra rejilla, o esta cambió sin avisar (se tocó el arreglo a mano): se empieza de cero
+        self.vaciar_cache()
+        ocupacion.suscribir(self._celda_cambiada)
+        self._cache_ocupacion = ocupacion
+        self._cache_version = ocupacion.version
+
+    def _celda_cambiada(self, indice, bloqueada):
+        """
+        Solo caducan las rutas que la celda puede cambiar: si se bloquea, las que
+        pasan por ella; si se libera, las que pasan por ella, las que no
+        encontraron camino y las que podrían acortarse cruzándola (según la
+        distancia Manhattan, que nunca sobreestima).
+        """
+        self._cache_version = self._cache_ocupacion.version
+        celda = divmod(indice, self._cache_ocupacion.filas)
+        for clave, (ruta, celdas) in list(self.cache_rutas.items()):
+            if ruta is None:
+                caduca = not bloqueada
+            elif indice in celdas:
+                caduca = True
+            else:
+                inicio, objetivo = clave
+                caduca = not bloqueada and self.heuristica(inicio, celda) + self.heuristica(celda, objetivo) < len(ruta)
+            if caduca:
+                del self.cache_rutas[clave]
+
+    def _consultar_cache(self, obstaculos, clave):
+        """Devuelve (encontrado, ruta). Solo se guarda lo calculado sobre una Ocupacion."""
+        if self.tamano_cache <= 0 or not isinstance(obstaculos, Ocupacion):
+            return False, None
+        self._seguir_rejilla(obstaculos)
+        if clave in self.cache_rutas:
+            self.cache_rutas.move_to_end(clave)
+            self.aciertos_cache += 1
+            return True, self.cache_rutas[clave][0]
+        self.fallos_cache += 1
+        return False, None
+
+    def _guardar_cache(self, obstaculos, clave, ruta):
+        if self.tamano_cache <= 0 or not isinstance(obstaculos, Ocupacion):
+            return
+        celdas = None if ruta is None else frozenset(obstaculos.indice(Ocupacion.celda_de_pixel(p)) for p in ruta)
+        self.cache_rutas[clave] = (ruta, celdas)
+        if len(self.cache_rutas) > self.tamano_cache:
+            self.cache_rutas.popitem(last=False)
+
+    def buscar(self, nodo_inicio, nodo_objetivo, obstaculos):
+        """Calcula una ruta completa con el motor elegido para esta instancia."""
+        clave = ((nodo_inicio[0] // Config.TAMANO_CELDA, nodo_inicio[1] // Config.TAMANO_CELDA),
+                 (nodo_objetivo[0] // Config.TAMANO_CELDA, nodo_objetivo[1] // Config.TAMANO_CELDA))
+        encontrado, ruta = self._consultar_cache(obstaculos, clave)
+        if not encontrado:
+            inicio = time.perf_counter()
+            ruta, fuente = self._buscar_sin_cache(nodo_inicio, nodo_objetivo, obstaculos)
+            self._registrar(fuente, inicio, self.celdas_tablero(self.motor_rejilla if self.motor != "CLASICO" else None))
+            self._guardar_cache(obstaculos, clave, ruta)
+        # El robot consume la ruta con pop(): se entrega siempre una copia
+        return list(ruta) if ruta is not None else None
+
+    def _buscar_sin_cache(self, nodo_inicio, nodo_objetivo, obstaculos):
+        """Devuelve (ruta, fuente): 'fuente' es lo que guarda los contadores de la búsqueda (o None)."""
+        if self.motor == "CLASICO":
+            estadisticas = EstadisticasBusqueda()
+            return self.a_estrella(nodo_inicio, nodo_objetivo, obstaculos, estadisticas), estadisticas
+
+        motor, bloqueadas = self.preparar_rejilla(obstaculos)
+        inicio = (nodo_inicio[0] // Config.TAMANO_CELDA, nodo_inicio[1] // Config.TAMANO_CELDA)
+        objetivo = (nodo_objetivo[0] // Config.TAMANO_CELDA, nodo_objetivo[1] // Config.TAMANO_CELDA)
+        if not (0 <= objetivo[0] < motor.columnas and motor.fila_minima <= objetivo[1] < motor.filas):
+            return None, None
+        if not (0 <= inicio[0] < motor.columnas and 0 <= inicio[1] < motor.filas):
+            return None, None
+
+        fuente = motor
+        if self.motor == "INCREMENTAL" and isinstance(obstaculos, Ocupacion):
+            fuente = self.obtener_planificador(obstaculos, motor.indice(objetivo))
+            camino = fuente.ruta(motor.indice(inicio))
+        elif self.motor == "JPS":
+            clave_mapa = (obstaculos, obstaculos.version) if isinstance(obstaculos, Ocupacion) else None
+            camino = motor.jps(motor.indice(inicio), motor.indice(objetivo), bloqueadas, clave_mapa)
+        else:
+            camino = motor.a_estrella(motor.indice(inicio), motor.indice(objetivo), bloqueadas)
+        if camino is None:
+            return None, fuente
+        return [self.centro_de_indice(motor, i) for i in camino], fuente
+
+    def obtener_planificador(self, ocupacion, objetivo):
+        """Devuelve (o crea) la búsqueda incremental hacia 'objetivo' sobre esta rejilla."""
+        if ocupacion is not self._planificadores_ocupacion:
+            self.descartar_planificadores()
+            self._planificadores_ocupacion = ocupacion
+        planificador = self.planificadores.get(objetivo)
+        if planificador is None:
+            planificador = self.planificadores[objetivo] = PlanificadorIncremental(ocupacion, objetivo)
+            if len(self.planificadores) > Config.MAX_PLANIFICADORES_INCREMENTALES:
+                self.planificadores.popitem(last=False)[1].liberar()
+        else:
+            self.planificadores.move_to_end(objetivo)
+            self.planificadores_reutilizados += 1
+        return planificador
+
+    def descartar_planificadores(self):
+        for planificador in self.planificadores.values():
+            planificador.liberar()
+        self.planificadores.clear()
+        self._planificadores_ocupacion = None
+
+    def buscar_pelota_cercana(self, nodo_inicio, pelotas, obstaculos):
+        """
+        Una sola búsqueda en anchura que se detiene en la primera pelota alcanzable.
+        Devuelve (pelota, ruta) o (None, None) si ninguna es alcanzable. Desde un
+        origen que se repite (la celda de entrega, la estación) responde un campo
+        de distancias que se repara solo cuando cambian las pelotas.
+        """
+        celda = (nodo_inicio[0] // Config.TAMANO_CELDA, nodo_inicio[1] // Config.TAMANO_CELDA)
+        campo = self._campo_origen(obstaculos, celda)
+        if campo is not None:
+            return self._pelota_por_campo(campo, celda, pelotas)
+        inicio = time.perf_counter()
+        (pelota, ruta), fuente = self._buscar_pelota_sin_cache(nodo_inicio, pelotas, obstaculos)
+        self._registrar(fuente, inicio)
+        return pelota, ruta
+
+    def _campo_origen(self, obstaculos, celda):
+        """
+        Campo de distancias desde 'celda' si ya lo hay (un acierto). La segunda
+        búsqueda desde un mismo origen lo crea para las siguientes.
+        """
+        if self.tamano_cache <= 0 or not isinstance(obstaculos, Ocupacion) or not obstaculos.dentro(celda):
+            return None
+        self._seguir_rejilla(obstaculos)
+        indice = obstaculos.indice(celda)
+        campo = self.campos_origen.get(indice)
+        if campo is not None:
+            self.campos_origen.move_to_end(indice)
+            self.aciertos_cache += 1
+            return campo
+        self.fallos_cache += 1
+        if indice not in self.origenes_vistos:
+            self.origenes_vistos.add(indice)
+            return None
+        self.campos_origen[indice] = CampoDistancias(obstaculos, [celda], semillas_bloqueadas=True)
+        if len(self.campos_origen) > Config.TAMANO_CACHE_CAMPOS:
+            self.campos_origen.popitem(last=False)[1].liberar()
         return None
 
+    @staticmethod
+    def _pelota_por_campo(campo, celda, pelotas):
+        """La pelota más cercana según el campo (empates: la primera de la lista) y su ruta."""
+        mejor, mejor_distancia = None, CampoDistancias.INFINITO
+        for pelota in pelotas:
+            celda_pelota = (pelota[0] // Config.TAMANO_CELDA, pelota[1] // Config.TAMANO_CELDA)
+            if celda_pelota == celda:
+                return pelota, []
+            distancia = campo.distancia_celda(celda_pelota)
+            if distancia < mejor_distancia:
+                mejor, mejor_distancia = pelota, distancia
+        if mejor is None:
+            return None, None
+        # El gradiente baja desde la pelota hasta el origen: la ruta es ese camino al revés
+        camino = campo.ruta_desde(mejor)
+        centro = ((mejor[0] // Config.TAMANO_CELDA) * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2,
+                  (mejor[1] // Config.TAMANO_CELDA) * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2)
+        return mejor, camino[-2::-1] + [centro]
+
+    def _buscar_pelota_sin_cache(self, nodo_inicio, pelotas, obstaculos):
+        motor, bloqueadas = self.preparar_rejilla(obstaculos)
+        inicio = (nodo_inicio[0] // Config.TAMANO_CELDA, nodo_inicio[1] // Config.TAMANO_CELDA)
+        if not (0 <= inicio[0] < motor.columnas and 0 <= inicio[1] < motor.filas):
+            return (None, None), None
+
+        objetivos = {}
+        for pelota in pelotas:
+            celda = (pelota[0] // Config.TAMANO_CELDA, pelota[1] // Config.TAMANO_CELDA)
+            if 0 <= celda[0] < motor.columnas and motor.fila_minima <= celda[1] < motor.filas:
+                objetivos[motor.indice(celda)] = pelota
+
+        alcanzado, camino = motor.bfs_multiobjetivo(motor.indice(inicio), objetivos, bloqueadas)
+        if alcanzado is None:
+            return (None, None), motor
+        return (objetivos[alcanzado], [self.centro_de_indice(motor, i) for i in camino]), motor
+
+    @staticmethod
+    def centro_de_indice(motor, indice):
+        return (motor.coord_x[indice] * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2,
+                motor.coord_y[indice] * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2)
+
     def iniciar_busqueda(self, nodo_inicio, nodo_objetivo, obstaculos):
         self.limpiar()
         self.pos_objetivo = (nodo_objetivo[0] // Config.TAMANO_CELDA, nodo_objetivo[1] // Config.TAMANO_CELDA)
         pos_inicio = (nodo_inicio[0] // Config.TAMANO_CELDA, nodo_inicio[1] // Config.TAMANO_CELDA)
-        self.celdas_obstaculos = {(obs[0] // Config.TAMANO_CELDA, obs[1] // Config.TAMANO_CELDA) for obs in obstaculos}
+        self.celda_bloqueada = self.funcion_bloqueo(obstaculos)
 
         self.puntaje_g = {pos_inicio: 0}
+        self.nodos_modificados.add(pos_inicio)
         puntaje_h_inicial = self.heuristica(pos_inicio, self.pos_objetivo)
         heapq.heappush(self.lista_abierta, (puntaje_h_inicial, puntaje_h_inicial, pos_inicio))
+        self.busqueda_en_curso = EstadisticasBusqueda(empujes=1, pico_abierta=1)
 
+    def _terminar_busqueda_en_curso(self):
+        estadisticas = self.busqueda_en_curso
+        if estadisticas is not None:
+            self.ultima_busqueda = EstadisticasBusqueda.de_motor(estadisticas, estadisticas.tiempo_ms, self.celdas_tablero())
+            self.estadisticas.sumar(self.ultima_busqueda)
+            self.busqueda_en_curso = None
 
     def paso(self):
+        """Expande un nodo de la búsqueda iniciada con iniciar_busqueda (modo desarrollador)."""
+        estadisticas = self.busqueda_en_curso
+        inicio = time.perf_counter()
+        try:
+            return self._paso(estadisticas)
+        finally:
+            if estadisticas is not None:
+                estadisticas.tiempo_ms += (time.perf_counter() - inicio) * 1000
+
+    def _paso(self, estadisticas):
         if not self.lista_abierta:
+            self._terminar_busqueda_en_curso()
             return "SIN_CAMINO"
 
         actual = heapq.heappop(self.lista_abierta)[2]
@@ -93,10 +420,19 @@ class Pathfinder:
                 actual = self.viene_de[actual]
             camino.reverse()
             self.camino_final = set(camino)
+            self.nodos_modificados.update(camino)
+            self._terminar_busqueda_en_curso()
             return [(p[0] * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2,
                      p[1] * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2) for p in camino]
 
+        if actual in self.lista_cerrada:
+            # Entrada obsoleta: ya se expandió con un puntaje mejor
+            if estadisticas is not None:
+                estadisticas.descartes += 1
+            return "SEARCHING"
         self.lista_cerrada.add(actual)
+        if estadisticas is not None:
+            estadisticas.expandidos += 1
         vecinos = [(0, 1), (0, -1), (1, 0), (-1, 0)]
         for dx, dy in vecinos:
             vecino = actual[0] + dx, actual[1] + dy
@@ -104,11 +440,16 @@ class Pathfinder:
             if g_tentativo < self.puntaje_g.get(vecino, float('inf')):
                 es_valido = (0 <= vecino[0] < Config.ANCHO // Config.TAMANO_CELDA and
                             Config.ALTURA_HUD // Config.TAMANO_CELDA <= vecino[1] < Config.ALTO // Config.TAMANO_CELDA and
-                            (vecino not in self.celdas_obstaculos or vecino == self.pos_objetivo))
+                            (not self.celda_bloqueada(vecino) or vecino == self.pos_objetivo))
                 if es_valido and vecino not in self.lista_cerrada:
                     self.viene_de[vecino] = actual
                     self.puntaje_g[vecino] = g_tentativo
+                    self.nodos_modificados.add(vecino)
                     puntaje_h_val = self.heuristica(vecino, self.pos_objetivo)
                     puntaje_f_val = g_tentativo + puntaje_h_val
                     heapq.heappush(self.lista_abierta, (puntaje_f_val, puntaje_h_val, vecino))
+                    if estadisticas is not None:
+                        estadisticas.empujes += 1
+        if estadisticas is not None:
+            estadisticas.pico_abierta = max(estadisticas.pico_abierta, len(self.lista_abierta))
         return "SEARCHING"
\ No newline at end of file
@@ -0,0 +1,123 @@
+import csv
+import json
+import time
+from collections import deque
+import numpy as np
+from config import Config
+
+# ==============================================================================
+# CLASE 21: Perfilador por Subsistema (Perfilador)
+# Responsabilidad: Medir cuánto tarda cada parte del fotograma (eventos,
+# lógica, búsquedas, cada etapa del dibujado, el volcado a pantalla). Solo
+# existe mientras está activo: al activarlo envuelve los métodos indicados
+# con un cronómetro y al desactivarlo deja los originales, así que apagado no
+# cuesta nada. Guarda una ventana móvil por sección (para p50/p99 en el HUD)
+# y una traza por fotograma que se puede exportar a CSV o JSON.
+# ==============================================================================
+class Perfilador:
+    def __init__(self, objetivos):
+        """
+        'objetivos' son tuplas (sección, dueño, atributo): una clase o un módulo
+        y el nombre del método o función a medir. Varias pueden compartir sección.
+        Los tiempos son inclusivos: una búsqueda lanzada desde la lógica cuenta
+        en las dos secciones.
+        """
+        self.objetivos = objetivos
+        self.secciones = list(dict.fromkeys(seccion for seccion, _, _ in objetivos))
+        self.activo = False
+        self.originales = []
+        self.tiempo = dict.fromkeys(self.secciones, 0.0)
+        self.llamadas = dict.fromkeys(self.secciones, 0)
+        # Llamadas anidadas de una misma sección (buscar -> a_estrella) se miden una sola vez
+        self.profundidad = dict.fromkeys(self.secciones, 0)
+        self.ventanas = {seccion: deque(maxlen=Config.VENTANA_PERFIL) for seccion in self.secciones + ["fotograma"]}
+        self.trazas = deque(maxlen=Config.MAX_TRAZAS_PERFIL)
+        self.fotograma = 0
+        self.inicio_fotograma = None
+
+    def _envolver(self, seccion, funcion):
+        tiempo, llamadas, profundidad, reloj = self.tiempo, self.llamadas, self.profundidad, time.perf_counter
+
+        def medida(*args, **kwargs):
+            if profundidad[seccion]:
+                return funcion(*args, **kwargs)
+            profundidad[seccion] = 1
+            inicio = reloj()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                tiempo[seccion] += reloj() - inicio
+                llamadas[seccion] += 1
+                profundidad[seccion] = 0
+        medida.__wrapped__ = funcion
+        return medida
+
+    def activar(self):
+        if self.activo:
+            return
+        for seccion, dueno, atributo in self.objetivos:
+            # Se mira el __dict__ de la clase para no perder @staticmethod / @classmethod
+            original = vars(dueno).get(atributo, getattr(dueno, atributo))
+            if isinstance(original, staticmethod):
+                envuelto = staticmethod(self._envolver(seccion, original.__func__))
+            elif isinstance(original, classmethod):
+                envuelto = classmethod(self._envolver(seccion, original.__func__))
+            else:
+                envuelto = self._envolver(seccion, original)
+            self.originales.append((dueno, atributo, original))
+            setattr(dueno, atributo, envuelto)
+        self.activo = True
+        self.inicio_fotograma = time.perf_counter()
+
+    def desactivar(self):
+        # En orden inverso: si dos objetivos tocan el mismo atributo, queda el primero
+        for dueno, atributo, original in reversed(self.originales):
+            setattr(dueno, atributo, original)
+        self.originales = []
+        self.activo = False
+
+    def alternar(self):
+        self.desactivar() if self.activo else self.activar()
+        return self.activo
+
+    def cerrar_fotograma(self):
+        """Pasa lo medido desde el fotograma anterior a las ventanas y a la traza."""
+        if not self.activo:
+            return
+        ahora = time.perf_counter()
+        traza = {"fotograma": self.fotograma, "fotograma_ms": (ahora - self.inicio_fotograma) * 1000}
+        self.ventanas["fotograma"].append(traza["fotograma_ms"])
+        for seccion in self.secciones:
+            milisegundos = self.tiempo[seccion] * 1000
+            self.ventanas[seccion].append(milisegundos)
+            traza[f"{seccion}_ms"] = milisegundos
+            traza[f"{seccion}_llamadas"] = self.llamadas[seccion]
+            self.tiempo[seccion] = 0.0
+            self.llamadas[seccion] = 0
+        self.trazas.append(traza)
+        self.fotograma += 1
+        self.inicio_fotograma = ahora
+
+    def resumen(self):
+        """[(sección, p50, p99)] en milisegundos por fotograma sobre la ventana móvil."""
+        filas = []
+        for seccion in ["fotograma"] + self.secciones:
+            valores = self.ventanas[seccion]
+            if valores:
+                p50, p99 = np.percentile(np.fromiter(valores, dtype=np.float64, count=len(valores)), (50, 99))
+                filas.append((seccion, float(p50), float(p99)))
+        return filas
+
+    def exportar(self, ruta):
+        """Vuelca las trazas por fotograma; el formato sale de la extensión (.csv o .json)."""
+        trazas = list(self.trazas)
+        if ruta.endswith(".json"):
+            with open(ruta, "w") as archivo:
+                json.dump({"secciones": self.secciones, "resumen": self.resumen(), "fotogramas": trazas}, archivo, indent=1)
+            return ruta
+        columnas = ["fotograma", "fotograma_ms"] + [f"{s}_{c}" for s in self.secciones for c in ("ms", "llamadas")]
+        with open(ruta, "w", newline="") as archivo:
+            escritor = csv.DictWriter(archivo, fieldnames=columnas)
+            escritor.writeheader()
+            escritor.writerows(trazas)
+        return ruta
@@ -0,0 +1,503 @@
+import math
+from collections import deque
+from config import Config
+from ocupacion import Ocupacion
+from campo_distancias import CampoDistancias
+from pathfinder import Pathfinder
+
+# ==============================================================================
+# CLASE 23: Planificador de Recorrido (PlanificadorRecorrido)
+# Responsabilidad: Decidir en qué orden recoge un robot todas las pelotas y
+# cuándo pasa por la estación, en vez de ir a la más cercana cada vez y
+# reaccionar a la batería baja. Guarda un campo de distancias por pelota (se
+# calculan una vez por mundo y se reparan solos cuando la rejilla cambia), de
+# modo que todas las distancias robot/pelota/canasta/estación son consultas
+# directas. Cada campo se suscribe a la rejilla y repara su parte con cada
+# pelota que se coloca o se retira, por eso solo se planifica con hasta
+# MAX_PELOTAS_RECORRIDO pelotas (con más, el robot va a la más cercana hasta
+# que queden menos). El orden sale de una inserción por cercanía y del orden
+# del robot sin plan, mejorados con búsqueda local (2-opt y reubicaciones entre
+# pelotas vecinas), y las recargas se colocan al empezar el tramo en que menos
+# pasos cuestan. La batería se modela igual que la vigila el robot: un
+# tramo vale si en ninguna de sus celdas salta carga_para_volver. El plan solo
+# se adopta si gana en pasos a lo que haría el robot sin plan (la pelota más
+# cercana y media vuelta cuando salta el aviso), simulado con el mismo modelo.
+# ==============================================================================
+class PlanificadorRecorrido:
+    # Paradas en la estación: antes de ir a por la siguiente pelota, o con la pelota recién recogida
+    ESTACION = "ESTACION"
+    ESTACION_CON_PELOTA = "ESTACION_CON_PELOTA"
+    INFINITO = CampoDistancias.INFINITO
+    # Dónde empieza un tramo, además de la celda de entrega tras la pelota j (j >= 0)
+    INICIO, EN_ESTACION, ENTREGA_ESTACION = -1, -2, -3
+
+    def __init__(self, mundo):
+        self.mundo = mundo
+        self.celda_estacion = Ocupacion.celda_de_pixel(mundo.rect_estacion.center)
+        # Un campo por pelota, creado la primera vez que se planifica con ella
+        self.campos = {}
+        # Paradas que faltan (pelotas o ESTACION); None hasta la primera planificación
+        self.paradas = None
+        # Pelotas que el plan aún espera encontrar en el mundo
+        self.pelotas_planificadas = None
+        self.factible = False
+        self.pasos_previstos = None
+        # Pasos del robot sin plan desde el mismo punto: el plan tiene que bajar de aquí
+        self.pasos_voraz = None
+        # Si el robot sin plan gana, sigue así hasta el final y no se vuelve a planificar
+        self.gana_voraz = False
+        self.planificaciones = 0
+
+    def liberar(self):
+        for campo in self.campos.values():
+            campo.liberar()
+        self.campos.clear()
+
+    def _campo(self, pelota):
+        campo = self.campos.get(pelota)
+        if campo is None:
+            campo = self.campos[pelota] = CampoDistancias(self.mundo.ocupacion, [Ocupacion.celda_de_pixel(pelota)],
+                                                          semillas_bloqueadas=True)
+        return campo
+
+    def siguiente_parada(self, pos, carga, pelotas):
+        """
+        Próxima parada (una pelota o ESTACION) para un robot en 'pos' con 'carga'
+        que está libre para ir a buscar. Si las pelotas ya no son las del plan
+        (se soltó una, el aviso de batería cortó el camino...) se planifica de
+        nuevo desde aquí. Devuelve None si no hay plan factible o si no gana al
+        robot sin plan; entonces el robot va a la más cercana.
+        """
+        if self.gana_voraz:
+            return None
+        if self.pelotas_planificadas is None or set(pelotas) != self.pelotas_planificadas:
+            self.planificar(pos, carga, pelotas)
+        # Una recarga con pelota que no se llegó a hacer ya no tiene sentido aquí
+        while self.paradas and self.paradas[0] == PlanificadorRecorrido.ESTACION_CON_PELOTA:
+            self.paradas.pop(0)
+        if not self.factible or not self.paradas:
+            return None
+        parada = self.paradas.pop(0)
+        self.pelotas_planificadas.discard(parada)
+        return parada
+
+    def ruta_a_pelota(self, pos, pelota):
+        """La ruta desde 'pos' con la que el plan midió el tramo hasta 'pelota'."""
+        return self._campo(pelota).ruta_desde(pos)
+
+    def recargar_ahora(self):
+        """Para un robot que acaba de recoger su pelota: si el plan pasa ya por la estación, la consume."""
+        if self.factible and self.paradas and self.paradas[0] == PlanificadorRecorrido.ESTACION_CON_PELOTA:
+            self.paradas.pop(0)
+            return True
+        return False
+
+    def planificar(self, pos, carga, pelotas):
+        """Calcula el orden de todas las 'pelotas' empezando en 'pos' con 'carga'."""
+        self.planificaciones += 1
+        for pelota in [p for p in self.campos if p not in pelotas]:
+            # Pelotas que ya no están: su campo ya no hace falta
+            self.campos.pop(pelota).liberar()
+        pelotas = list(pelotas)
+        self.paradas, self.factible, self.pasos_previstos, self.pasos_voraz = [], False, None, None
+        self.pelotas_planificadas = set(pelotas)
+        if len(pelotas) > Config.MAX_PELOTAS_RECORRIDO:
+            # Demasiados campos que mantener al día: sin plan, hasta que queden menos
+            return self.paradas
+        if not pelotas:
+            self.factible = True
+            return self.paradas
+
+        distancias = self._distancias(pos, pelotas)
+        if distancias is None:
+            return self.paradas
+        self.pasos_voraz, orden_voraz = self._simular(pos, carga, pelotas)
+        orden_voraz += [k for k in range(len(pelotas)) if k not in orden_voraz]
+        mejor = None
+        # Se mejoran dos órdenes de partida: la inserción por cercanía y el del
+        # robot sin plan (con sus recargas ya colocadas donde menos cuestan)
+        for orden in (self._insercion_cercana(distancias), orden_voraz):
+            resultado = self._mejorar(orden, carga, distancias)
+            if resultado is not None and (mejor is None or resultado[0] < mejor[0]):
+                mejor = resultado
+        # El plan se comprueba igual que el robot sin plan, con la rejilla cambiando por el camino
+        paradas = [parada if isinstance(parada, str) else pelotas[parada] for parada in mejor[1]] if mejor else None
+        pasos = self._simular(pos, carga, pelotas, paradas)[0] if mejor else math.inf
+        if pasos >= self.pasos_voraz:
+            self.gana_voraz = self.pasos_voraz < math.inf
+            return self.paradas
+        self.pasos_previstos, self.paradas, self.factible = pasos, paradas, True
+        return self.paradas
+
+    def _distancias(self, pos, pelotas):
+        """
+        Todas las distancias (en pasos) que usa el plan, o None si alguna pelota es
+        inalcanzable. Tras entregar la pelota i el robot queda en la celda de
+        entrega a la que baja su ruta, y desde ahí sale hacia la siguiente.
+        """
+        campo_canasta, campo_estacion = self.mundo.campo_canasta, self.mundo.campo_estacion
+        campos = [self._campo(pelota) for pelota in pelotas]
+        entregas = [self._celda_entrega(pelota) for pelota in pelotas]
+        entrega_estacion = self._celda_entrega(self.mundo.rect_estacion.center)
+        centro_estacion = self._centro(self.celda_estacion)
+
+        distancias = {
+            "desde_inicio": [campo.distancia_pixel(pos) for campo in campos],
+            "desde_estacion": [campo.distancia_celda(self.celda_estacion) for campo in campos],
+            "a_canasta": [campo_canasta.distancia_pixel(pelota) for pelota in pelotas],
+            "a_estacion": [campo_estacion.distancia_celda(entrega) for entrega in entregas],
+            "inicio_a_estacion": campo_estacion.distancia_pixel(pos),
+            "entre": [[campo.distancia_celda(entrega) for campo in campos] for entrega in entregas],
+            # Tras recargar con una pelota encima se va de la estación a la canasta
+            "estacion_a_canasta": campo_canasta.distancia_celda(self.celda_estacion),
+            "entrega_estacion_a_estacion": campo_estacion.distancia_celda(entrega_estacion),
+            "desde_entrega_estacion": [campo.distancia_celda(entrega_estacion) for campo in campos],
+            # Carga con la que hay que empezar cada tramo (ver _exigencia); las de ir
+            # a por una pelota se calculan al pedirlas, porque son una por pareja
+            "exige_a_canasta": [self._exigencia(pelota, campo_canasta.ruta_desde(pelota)) for pelota in pelotas],
+            "exige_estacion_a_canasta": self._exigencia(centro_estacion, campo_canasta.ruta_desde(centro_estacion)),
+            "campos": campos,
+            "origenes": {PlanificadorRecorrido.INICIO: pos, PlanificadorRecorrido.EN_ESTACION: centro_estacion,
+                         PlanificadorRecorrido.ENTREGA_ESTACION: self._centro(entrega_estacion),
+                         **{i: self._centro(entrega) for i, entrega in enumerate(entregas)}},
+        }
+        # Distancias a cada pelota según dónde empieza el tramo (INICIO, EN_ESTACION, ...)
+        distancias["desde"] = {PlanificadorRecorrido.INICIO: distancias["desde_inicio"],
+                               PlanificadorRecorrido.EN_ESTACION: distancias["desde_estacion"],
+                               PlanificadorRecorrido.ENTREGA_ESTACION: distancias["desde_entrega_estacion"],
+                               **dict(enumerate(distancias["entre"]))}
+        distancias["exige_a_pelota"] = {ubicacion: [None] * len(pelotas) for ubicacion in distancias["desde"]}
+        if PlanificadorRecorrido.INFINITO in (distancias["desde_inicio"] + distancias["desde_estacion"] +
+                                              distancias["a_canasta"] + distancias["a_estacion"]):
+            return None
+        return distancias
+
+    def _celda_entrega(self, pos):
+        """Celda junto a la canasta en la que termina la ruta de entrega desde 'pos'."""
+        ruta = self.mundo.campo_canasta.ruta_desde(pos)
+        return Ocupacion.celda_de_pixel(ruta[-1] if ruta else pos)
+
+    @staticmethod
+    def _centro(celda):
+        return (celda[0] * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2,
+                celda[1] * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2)
+
+    @staticmethod
+    def _umbral(campo_estacion, pos):
+        """La carga con la que el robot da media vuelta en 'pos' (Robot.carga_para_volver)."""
+        distancia = campo_estacion.distancia_pixel(pos)
+        if distancia == PlanificadorRecorrido.INFINITO:
+            return Config.CARGA_EMERGENCIA
+        return (distancia + 1) * Config.CARGA_POR_MOVIMIENTO * Config.MARGEN_SEGURIDAD_BATERIA
+
+    def _exigencia(self, pos, ruta):
+        """
+        Carga con la que hay que salir de 'pos' por 'ruta' para que el aviso de
+        batería no salte en ninguna celda antes de la última (el robot lo mira
+        antes de cada paso, con lo que ya ha gastado hasta ahí).
+        """
+        if not ruta:
+            return 0
+        campo_estacion = self.mundo.campo_estacion
+        return max(self._umbral(campo_estacion, celda) + k * Config.CARGA_POR_MOVIMIENTO
+                   for k, celda in enumerate([pos] + ruta[:-1]))
+
+    def _exige(self, distancias, ubicacion, pelota):
+        """Exigencia del tramo desde 'ubicacion' hasta la pelota 'pelota'; se guarda en exige_a_pelota."""
+        origen = distancias["origenes"][ubicacion]
+        exige = self._exigencia(origen, distancias["campos"][pelota].ruta_desde(origen))
+        distancias["exige_a_pelota"][ubicacion][pelota] = exige
+        return exige
+
+    def _simular(self, pos, carga, pelotas, paradas=None):
+        """
+        Juega el resto del episodio desde 'pos' con 'carga' sobre una copia de
+        la rejilla, que cambia al recoger y soltar pelotas igual que cambiará la
+        del mundo (las rutas se acortan al quitar pelotas). Sin 'paradas' hace
+        lo que el robot sin plan: le pide a un Pathfinder la pelota más cercana
+        y, si salta el aviso de batería, suelta la que lleva y va a recargar.
+        Con 'paradas' las sigue por las rutas de los campos, como el robot con
+        plan, y si el aviso salta el plan falla. Devuelve (pasos, orden) con las
+        pelotas por orden de primera recogida; los pasos son infinitos si el
+        robot se queda sin batería, no avanza o el plan falla.
+        """
+        ocupacion = Ocupacion(self.mundo.ocupacion.columnas, self.mundo.ocupacion.filas)
+        ocupacion.rejilla[:] = self.mundo.ocupacion.rejilla
+        campo_estacion = CampoDistancias(ocupacion, [self.celda_estacion], semillas_bloqueadas=True)
+        campo_canasta = CampoDistancias(ocupacion, self.mundo.celdas_entrega)
+        # Sin plan, como el robot: sus empates dependen de la búsqueda, no del orden de la lista
+        buscador = Pathfinder() if paradas is None else None
+        original = {pelota: k for k, pelota in enumerate(pelotas)}
+        pendientes, orden = list(pelotas), []
+        paradas = deque(paradas) if paradas is not None else None
+        estacion = self._centro(self.celda_estacion)
+        pasos, llevada, posicion = 0, None, pos
+        while (pendientes if paradas is None else paradas) or llevada is not None:
+            recargar = False
+            if llevada is None and paradas is not None:
+                objetivo = paradas.popleft()
+                recargar = objetivo == PlanificadorRecorrido.ESTACION
+                if not recargar:
+                    campo = CampoDistancias(ocupacion, [Ocupacion.celda_de_pixel(objetivo)], semillas_bloqueadas=True)
+                    ruta = campo.ruta_desde(posicion)
+                    campo.liberar()
+            elif llevada is None:
+                objetivo, ruta = buscador.buscar_pelota_cercana(posicion, pendientes, ocupacion)
+            elif paradas and paradas[0] == PlanificadorRecorrido.ESTACION_CON_PELOTA:
+                paradas.popleft()
+                recargar = True
+            else:
+                ruta = campo_canasta.ruta_desde(posicion)
+
+            if not recargar:
+                if ruta is None:
+                    return math.inf, orden
+                recien_cargado = posicion == estacion and carga == Config.CARGA_MAXIMA
+                avance = 0
+                for celda in [posicion] + ruta[:-1] if ruta else ():
+                    if carga <= self._umbral(campo_estacion, celda):
+                        break
+                    carga -= Config.CARGA_POR_MOVIMIENTO
+                    avance += 1
+                pasos += avance
+                if avance:
+                    posicion = ruta[avance - 1]
+                if avance == len(ruta):
+                    if llevada is None:
+                        ocupacion.retirar_pelota(objetivo)
+                        if paradas is None:
+                            pendientes.remove(objetivo)
+                        llevada = original[objetivo]
+                        if llevada not in orden:
+                            orden.append(llevada)
+                    else:
+                        llevada = None
+                    continue
+                # Salta el aviso: el plan no contaba con ello; sin plan se suelta la pelota
+                if paradas is not None or recien_cargado:
+                    return math.inf, orden
+                if llevada is not None and ocupacion.colocar_pelota(posicion):
+                    original[posicion] = llevada
+                    pendientes.append(posicion)
+                    llevada = None
+
+            a_estacion = campo_estacion.distancia_pixel(posicion)
+            if carga <= a_estacion * Config.CARGA_POR_MOVIMIENTO:
+                return math.inf, orden
+            pasos += a_estacion
+            carga, posicion = Config.CARGA_MAXIMA, estacion
+        return pasos, orden
+
+    @staticmethod
+    def _costo(distancias, anterior, siguiente):
+        """Pasos para ir a recoger 'siguiente' y entregarla; 'anterior' None es el inicio."""
+        ida = distancias["desde_inicio"][siguiente] if anterior is None else distancias["entre"][anterior][siguiente]
+        return ida + distancias["a_canasta"][siguiente]
+
+    def _insercion_cercana(self, distancias):
+        """Inserción por cercanía: entra la pelota más próxima al recorrido, en el hueco que menos alarga."""
+        costo = self._costo
+        pendientes = set(range(len(distancias["a_canasta"])))
+        # Cercanía de cada pendiente al recorrido actual (al principio solo está el inicio)
+        cercania = {j: costo(distancias, None, j) for j in pendientes}
+        orden = []
+        while pendientes:
+            nueva = min(pendientes, key=lambda j: (cercania[j], j))
+            pendientes.remove(nueva)
+            mejor_hueco, mejor_aumento = 0, math.inf
+            for hueco in range(len(orden) + 1):
+                anterior = orden[hueco - 1] if hueco else None
+                aumento = costo(distancias, anterior, nueva)
+                if hueco < len(orden):
+                    siguiente = orden[hueco]
+                    aumento += costo(distancias, nueva, siguiente) - costo(distancias, anterior, siguiente)
+                if aumento < mejor_aumento:
+                    mejor_hueco, mejor_aumento = hueco, aumento
+            orden.insert(mejor_hueco, nueva)
+            for j in pendientes:
+                cercania[j] = min(cercania[j], costo(distancias, nueva, j))
+        return orden
+
+    def _mejorar(self, orden, carga, distancias):
+        """
+        Búsqueda local sobre el orden: 2-opt (invertir un tramo) y reubicar una
+        pelota junto a otra, aceptando la primera mejora que aparece. Como cada
+        entrega vuelve a la canasta, lo que más cambia entre órdenes es qué
+        pelotas caben en cada carga y cuánto se desvía el robot para pasar por
+        la estación; por eso se evalúa el plan completo con las recargas. Esa
+        evaluación es cara, así que solo se prueban movimientos entre pelotas
+        vecinas (VECINAS_RECORRIDO) y antes se calcula en O(1) cuánto cambian
+        los pasos sin recargas: si ya no baja del mejor plan, se descarta.
+        Devuelve (pasos, paradas) del mejor orden, o None si ninguno es factible.
+        """
+        n = len(orden)
+        mejor = self._programar_recargas(orden, carga, distancias)
+        mejor_pasos = mejor[0] if mejor else math.inf
+        cercanas = self._cercanas(distancias)
+        evaluaciones = 0
+        for _ in range(Config.MAX_PASADAS_2OPT):
+            mejorado = False
+            for pelota in range(n):
+                # Las posiciones y los tramos cambian con cada mejora aceptada
+                posicion = {p: k for k, p in enumerate(orden)}
+                base, ida, vuelta = self._tramos(orden, distancias)
+                for candidato, diferencia in self._movimientos(orden, posicion[pelota], cercanas[pelota],
+                                                               posicion, ida, vuelta, distancias):
+                    if base + diferencia >= mejor_pasos:
+                        continue
+                    if evaluaciones == Config.MAX_EVALUACIONES_RECORRIDO:
+                        return mejor
+                    evaluaciones += 1
+                    resultado = self._programar_recargas(candidato, carga, distancias)
+                    if resultado is not None and resultado[0] < mejor_pasos:
+                        orden, mejor, mejor_pasos = candidato, resultado, resultado[0]
+                        mejorado = True
+                        break
+            if not mejorado:
+                break
+        return mejor
+
+    def _cercanas(self, distancias):
+        """Para cada pelota, las VECINAS_RECORRIDO más próximas (en cualquier sentido)."""
+        entre = distancias["entre"]
+        n = len(entre)
+        return [sorted((k for k in range(n) if k != j), key=lambda k: (min(entre[j][k], entre[k][j]), k))
+                [:Config.VECINAS_RECORRIDO] for j in range(n)]
+
+    def _tramos(self, orden, distancias):
+        """
+        Pasos del orden sin recargas y sumas acumuladas de sus tramos: ida[t]
+        hasta el tramo que llega a orden[t-1], y vuelta[t] igual pero con cada
+        tramo recorrido al revés (de orden[t] a orden[t-1]), para invertir
+        trozos sin recorrerlos.
+        """
+        costo = self._costo
+        ida, vuelta = [0], [0, 0]
+        for t, pelota in enumerate(orden):
+            ida.append(ida[-1] + costo(distancias, orden[t - 1] if t else None, pelota))
+            if t:
+                vuelta.append(vuelta[-1] + costo(distancias, pelota, orden[t - 1]))
+        return ida[-1], ida, vuelta
+
+    def _movimientos(self, orden, i, cercanas, posicion, ida, vuelta, distancias):
+        """
+        Candidatos (orden, diferencia de pasos sin recargas) que acercan la
+        pelota en la posición 'i' a sus vecinas: invertir el tramo entre ambas
+        (con o sin los extremos) y llevarla justo antes o justo después.
+        """
+        costo = self._costo
+        n = len(orden)
+        x = orden[i]
+        for vecina in cercanas:
+            k = posicion[vecina]
+            a, b = min(i, k), max(i, k)
+            for desde, hasta in ((a, b), (a + 1, b), (a, b - 1)):
+                if hasta - desde < 1:
+                    continue
+                # Invertir orden[desde..hasta]
+                anterior = orden[desde - 1] if desde else None
+                diferencia = (costo(distancias, anterior, orden[hasta]) + vuelta[hasta + 1] - vuelta[desde + 1]
+                              - (ida[hasta + 1] - ida[desde]))
+                if hasta + 1 < n:
+                    siguiente = orden[hasta + 1]
+                    diferencia += costo(distancias, orden[desde], siguiente) - costo(distancias, orden[hasta], siguiente)
+                yield orden[:desde] + orden[desde:hasta + 1][::-1] + orden[hasta + 1:], diferencia
+
+            resto = orden[:i] + orden[i + 1:]
+            anterior = orden[i - 1] if i else None
+            quitar = -costo(distancias, anterior, x)
+            if i + 1 < n:
+                quitar += costo(distancias, anterior, orden[i + 1]) - costo(distancias, x, orden[i + 1])
+            k_resto = k - 1 if k > i else k
+            for j in (k_resto, k_resto + 1):
+                if j == i:
+                    continue
+                anterior = resto[j - 1] if j else None
+                poner = costo(distancias, anterior, x)
+                if j < len(resto):
+                    poner += costo(distancias, x, resto[j]) - costo(distancias, anterior, resto[j])
+                yield resto[:j] + [x] + resto[j:], quitar + poner
+
+    def _programar_recargas(self, orden, carga, distancias):
+        """
+        Para un orden fijo, decide dónde se pasa por la estación (programación
+        dinámica sobre la última recarga). Se puede recargar al empezar
+        cualquier tramo: antes de ir a por una pelota o justo después de
+        recogerla (el robot la lleva consigo a la estación y luego la entrega).
+        Desviarse a mitad de tramo nunca ahorra pasos frente a hacerlo al
+        empezarlo. Un tramo sin recarga solo vale si el aviso de batería no
+        salta por el camino (_exigencia), y para ir a recargar basta con llegar
+        a la estación. Devuelve (pasos, paradas) o None.
+        """
+        n, puntos = len(orden), 2 * len(orden)
+        movimiento = Config.CARGA_POR_MOVIMIENTO
+        desde, desde_estacion = distancias["desde"], distancias["desde_estacion"]
+        a_canasta, a_estacion = distancias["a_canasta"], distancias["a_estacion"]
+        exige_a_canasta, exige_a_pelota = distancias["exige_a_canasta"], distancias["exige_a_pelota"]
+        estacion_a_canasta, exige_estacion_a_canasta, entrega_estacion_a_estacion = (
+            distancias["estacion_a_canasta"], distancias["exige_estacion_a_canasta"],
+            distancias["entrega_estacion_a_estacion"])
+        # llegada[p]: pasos mínimos para estar en la estación (llenos) en el punto p;
+        # el punto 2k es antes de ir a por orden[k] y el 2k + 1, con ella recién recogida
+        llegada = [math.inf] * puntos
+        viene_de = [None] * puntos
+        final, viene_final = math.inf, None
+
+        if carga > distancias["inicio_a_estacion"] * movimiento:
+            llegada[0], viene_de[0] = distancias["inicio_a_estacion"], -1
+
+        # Cada tramo de la programación empieza en el inicio (-1) o en una recarga en el punto r
+        for r in range(-1, puntos):
+            if r == -1:
+                pasos, restante, ubicacion, k, con_pelota = 0, carga, PlanificadorRecorrido.INICIO, 0, False
+            elif llegada[r] == math.inf:
+                continue
+            else:
+                pasos, restante, ubicacion = llegada[r], Config.CARGA_MAXIMA, PlanificadorRecorrido.EN_ESTACION
+                k, con_pelota = divmod(r, 2)
+            while k < n:
+                pelota = orden[k]
+                if con_pelota:
+                    # Recargó con la pelota encima: de la estación a la canasta
+                    tramo, exige, a_la_estacion = estacion_a_canasta, exige_estacion_a_canasta, entrega_estacion_a_estacion
+                    ubicacion = PlanificadorRecorrido.ENTREGA_ESTACION
+                else:
+                    # Ir a por la pelota; desde ella se podría ir a recargar con ella encima
+                    exige = exige_a_pelota[ubicacion][pelota]
+                    if exige is None:
+                        exige = self._exige(distancias, ubicacion, pelota)
+                    if restante <= exige:
+                        break
+                    tramo = desde[ubicacion][pelota]
+                    pasos += tramo
+                    restante -= tramo * movimiento
+                    if restante > desde_estacion[pelota] * movimiento and pasos + desde_estacion[pelota] < llegada[2 * k + 1]:
+                        llegada[2 * k + 1], viene_de[2 * k + 1] = pasos + desde_estacion[pelota], r
+                    tramo, exige, a_la_estacion, ubicacion = a_canasta[pelota], exige_a_canasta[pelota], a_estacion[pelota], pelota
+                if restante <= exige:
+                    break
+                pasos += tramo
+                restante -= tramo * movimiento
+                k, con_pelota = k + 1, False
+                if k == n:
+                    if pasos < final:
+                        final, viene_final = pasos, r
+                elif restante > a_la_estacion * movimiento and pasos + a_la_estacion < llegada[2 * k]:
+                    llegada[2 * k], viene_de[2 * k] = pasos + a_la_estacion, r
+
+        if viene_final is None:
+            return None
+        # Se reconstruyen los puntos de recarga hacia atrás
+        recargas = set()
+        r = viene_final
+        while r is not None and r >= 0:
+            recargas.add(r)
+            r = viene_de[r]
+        paradas = []
+        for k, pelota in enumerate(orden):
+            if 2 * k in recargas:
+                paradas.append(PlanificadorRecorrido.ESTACION)
+            paradas.append(pelota)
+            if 2 * k + 1 in recargas:
+                paradas.append(PlanificadorRecorrido.ESTACION_CON_PELOTA)
+        return final, paradas
@@ -0,0 +1,157 @@
+from collections import deque
+import numpy as np
+import pygame
+from config import Config
+
+# ==============================================================================
+# CLASE 19: Población de Robots (Poblacion)
+# Responsabilidad: Guardar el estado de muchos robots en arreglos de NumPy
+# (una columna por atributo) en vez de un objeto por robot, para mover,
+# descontar batería y recargar a todos con una sola operación por tick. La
+# flota no tiene pantalla, así que los robots llegan a su celda en el acto y
+# no hay animación entre celdas. VistaRobot expone una fila con los nombres
+# de atributo que leen Render y la flota (robot.carga, robot.estado,
+# robot.rect...); no tiene los métodos de Robot (actualizar, ruta_actual,
+# animar_movimiento...), así que no sustituye a un Robot.
+# ==============================================================================
+class Poblacion:
+    ESTADOS = ('BUSCANDO', 'RECOGIDO', 'CARGAR', 'RECARGANDO', 'MUERTO')
+    CODIGOS = {estado: codigo for codigo, estado in enumerate(ESTADOS)}
+    MUERTO = CODIGOS['MUERTO']
+    RECARGANDO = CODIGOS['RECARGANDO']
+
+    def __init__(self, posiciones, mundo=None):
+        """'posiciones' son las esquinas superiores izquierdas (píxeles) de cada robot."""
+        cantidad = len(posiciones)
+        self.mundo = mundo
+        self.posicion = np.array(posiciones, dtype=np.int32).reshape(cantidad, 2)
+        self.direccion = np.zeros((cantidad, 2), dtype=np.int8)
+        self.direccion[:, 1] = 1  # Abajo por defecto, como Robot
+        self.carga = np.full(cantidad, Config.CARGA_MAXIMA, dtype=np.float64)
+        self.estado = np.zeros(cantidad, dtype=np.uint8)
+        self.lleva_pelota = np.zeros(cantidad, dtype=bool)
+        self.recogidas = np.zeros(cantidad, dtype=np.int32)
+        # Lo que no es un número se queda en listas de Python, una entrada por robot
+        self.pelota_objetivo = [None] * cantidad
+        self.camino_normal = [deque(maxlen=Config.LONGITUD_RASTRO) for _ in range(cantidad)]
+        self.vistas = [VistaRobot(self, i) for i in range(cantidad)]
+
+    def __len__(self):
+        return len(self.vistas)
+
+    def __getitem__(self, indice):
+        return self.vistas[indice]
+
+    def __iter__(self):
+        return iter(self.vistas)
+
+    def vivos(self):
+        return self.estado != Poblacion.MUERTO
+
+    def mover(self, indices, destinos):
+        """
+        Lleva a cada robot de 'indices' a su celda de 'destinos' (esquinas en
+        píxeles) y descuenta un movimiento de batería. Llegan en el acto, como
+        en la simulación sin pantalla. Devuelve los que se quedaron sin batería
+        en este movimiento.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        if not len(indices):
+            return indices
+        destinos = np.asarray(destinos, dtype=np.int32).reshape(len(indices), 2)
+        self.direccion[indices] = np.sign(destinos - self.posicion[indices])
+        self.posicion[indices] = destinos
+        for i, (x, y) in zip(indices.tolist(), destinos.tolist()):
+            self.camino_normal[i].append((x, y))
+        return self.consumir(indices)
+
+    def consumir(self, indices):
+        """Descuenta un movimiento de batería; los que llegan a cero quedan MUERTO."""
+        self.carga[indices] -= Config.CARGA_POR_MOVIMIENTO
+        sin_bateria = indices[(self.carga[indices] <= 0) & (self.estado[indices] != Poblacion.MUERTO)]
+        self.estado[sin_bateria] = Poblacion.MUERTO
+        return sin_bateria
+
+    def recargar(self):
+        """Suma TASA_RECARGA a todos los que están en la estación; devuelve los que ya están llenos."""
+        en_estacion = self.estado == Poblacion.RECARGANDO
+        self.carga[en_estacion] = np.minimum(self.carga[en_estacion] + Config.TASA_RECARGA, Config.CARGA_MAXIMA)
+        return np.flatnonzero(en_estacion & (self.carga >= Config.CARGA_MAXIMA))
+
+
+class VistaRobot:
+    """
+    Una fila de la población con los atributos de Robot que leen Render y la
+    flota (lee y escribe en sus arreglos). Solo datos: sin los métodos de Robot.
+    """
+    __slots__ = ('poblacion', 'indice')
+
+    def __init__(self, poblacion, indice):
+        self.poblacion = poblacion
+        self.indice = indice
+
+    @property
+    def mundo(self):
+        return self.poblacion.mundo
+
+    @property
+    def rect(self):
+        # Copia: para mover al robot se asigna un rect nuevo (o se usa Poblacion.mover)
+        x, y = self.poblacion.posicion[self.indice].tolist()
+        return pygame.Rect(x, y, Config.TAMANO_CELDA, Config.TAMANO_CELDA)
+
+    @rect.setter
+    def rect(self, rect):
+        self.poblacion.posicion[self.indice] = rect.topleft
+
+    @property
+    def carga(self):
+        return float(self.poblacion.carga[self.indice])
+
+    @carga.setter
+    def carga(self, valor):
+        self.poblacion.carga[self.indice] = valor
+
+    @property
+    def estado(self):
+        return Poblacion.ESTADOS[self.poblacion.estado[self.indice]]
+
+    @estado.setter
+    def estado(self, valor):
+        self.poblacion.estado[self.indice] = Poblacion.CODIGOS[valor]
+
+    @property
+    def lleva_pelota(self):
+        return bool(self.poblacion.lleva_pelota[self.indice])
+
+    @lleva_pelota.setter
+    def lleva_pelota(self, valor):
+        self.poblacion.lleva_pelota[self.indice] = valor
+
+    @property
+    def recogidas(self):
+        return int(self.poblacion.recogidas[self.indice])
+
+    @recogidas.setter
+    def recogidas(self, valor):
+        self.poblacion.recogidas[self.indice] = valor
+
+    @property
+    def direccion(self):
+        return tuple(self.poblacion.direccion[self.indice].tolist())
+
+    @direccion.setter
+    def direccion(self, valor):
+        self.poblacion.direccion[self.indice] = valor
+
+    @property
+    def pelota_objetivo(self):
+        return self.poblacion.pelota_objetivo[self.indice]
+
+    @pelota_objetivo.setter
+    def pelota_objetivo(self, valor):
+        self.poblacion.pelota_objetivo[self.indice] = valor
+
+    @property
+    def camino_normal(self):
+        return self.poblacion.camino_normal[self.indice]
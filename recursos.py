@@ -0,0 +1,161 @@
+import io
+import threading
+import pygame
+
+# ==============================================================================
+# CLASE 15: Caché de Recursos (Recursos)
+# Responsabilidad: Cargar cada imagen, fuente y sonido una sola vez por
+# proceso, guardados por (ruta, tamaño). Un hilo en segundo plano puede
+# adelantar la lectura de disco mientras el jugador está en el menú, de modo
+# que reiniciar o cambiar de tema no vuelva a tocar el disco. El hilo solo
+# lee imágenes y bytes de archivo: los objetos Font y Sound (SDL_ttf y
+# SDL_mixer no admiten uso concurrente) se crean en el hilo principal.
+# ==============================================================================
+class Recursos:
+    # Marca para distinguir "no se ha leído" de "no existe" (None)
+    _SIN_LEER = object()
+    # (ruta, tamaño) -> Surface lista para dibujar, o None si no se pudo leer
+    imagenes = {}
+    # (ruta, tamaño) -> Surface escalada leída por el hilo de precarga, aún sin convertir
+    _crudas = {}
+    # (nombre, tamaño) -> pygame.font.Font
+    fuentes = {}
+    # nombre -> bytes del archivo de la fuente leídos por el hilo (None: la de pygame por defecto)
+    _fuentes_crudas = {}
+    # ruta -> pygame.mixer.Sound
+    sonidos = {}
+    # ruta -> bytes del archivo de sonido leídos por el hilo, aún sin decodificar
+    _sonidos_crudos = {}
+    _candado = threading.Lock()
+    _hilo_precarga = None
+    _aviso_cierre = False
+
+    @staticmethod
+    def _leer_imagen(ruta, tamano):
+        try:
+            return pygame.transform.scale(pygame.image.load(ruta), tamano)
+        except (pygame.error, FileNotFoundError):
+            return None
+
+    @classmethod
+    def imagen(cls, ruta, tamano):
+        """Imagen escalada a 'tamano' con canal alfa, o None si no existe."""
+        clave = (ruta, tuple(tamano))
+        if clave in cls.imagenes:
+            return cls.imagenes[clave]
+        with cls._candado:
+            cruda = cls._crudas.pop(clave, cls._SIN_LEER)
+        if cruda is cls._SIN_LEER:
+            cruda = cls._leer_imagen(ruta, clave[1])
+        imagen = cruda
+        if cruda is not None:
+            # La conversión al formato de la pantalla se hace aquí, en el hilo principal
+            try:
+                imagen = cruda.convert_alpha()
+            except pygame.error:
+                pass  # Sin modo de video todavía: se usa tal cual
+        cls.imagenes[clave] = imagen
+        return imagen
+
+    @classmethod
+    def _vigilar_cierre(cls):
+        # Fuentes y sonidos dejan de ser válidos tras pygame.quit(): se olvidan entonces
+        if not cls._aviso_cierre:
+            cls._aviso_cierre = True
+            pygame.register_quit(cls._al_cerrar_pygame)
+
+    @classmethod
+    def _al_cerrar_pygame(cls):
+        cls._aviso_cierre = False
+        cls.fuentes.clear()
+        cls.sonidos.clear()
+
+    @staticmethod
+    def _leer_archivo(ruta):
+        try:
+            with open(ruta, "rb") as archivo:
+                return archivo.read()
+        except OSError:
+            return None
+
+    @classmethod
+    def fuente(cls, nombre, tamano):
+        """Fuente del sistema 'nombre' a 'tamano'. Solo desde el hilo principal."""
+        clave = (nombre, tamano)
+        fuente = cls.fuentes.get(clave)
+        if fuente is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            cls._vigilar_cierre()
+            with cls._candado:
+                datos = cls._fuentes_crudas.get(nombre)
+            # Con los bytes ya leídos se crea igual que SysFont, sin buscar ni leer el archivo
+            fuente = pygame.font.Font(io.BytesIO(datos), tamano) if datos else pygame.font.SysFont(nombre, tamano)
+            fuente = cls.fuentes.setdefault(clave, fuente)
+        return fuente
+
+    @classmethod
+    def sonido(cls, ruta):
+        """
+        Efecto de sonido decodificado una sola vez. Lanza pygame.error si no se
+        puede leer. Solo desde el hilo principal.
+        """
+        sonido = cls.sonidos.get(ruta)
+        if sonido is None:
+            cls._vigilar_cierre()
+            with cls._candado:
+                datos = cls._sonidos_crudos.pop(ruta, None)
+            sonido = pygame.mixer.Sound(file=io.BytesIO(datos)) if datos else pygame.mixer.Sound(ruta)
+            sonido = cls.sonidos.setdefault(ruta, sonido)
+        return sonido
+
+    @classmethod
+    def precargar(cls, imagenes=(), fuentes=(), sonidos=()):
+        """
+        Lee en un hilo aparte las imágenes [(ruta, tamaño)], fuentes [(nombre, tamaño)]
+        y sonidos [ruta] indicados. Devuelve el hilo; solo se lanza uno a la vez.
+        """
+        if cls._hilo_precarga is not None and cls._hilo_precarga.is_alive():
+            return cls._hilo_precarga
+        hilo = threading.Thread(target=cls._precargar, args=(list(imagenes), list(fuentes), list(sonidos)),
+                                name="precarga-recursos", daemon=True)
+        cls._hilo_precarga = hilo
+        hilo.start()
+        return hilo
+
+    @classmethod
+    def _precargar(cls, imagenes, fuentes, sonidos):
+        for ruta, tamano in imagenes:
+            clave = (ruta, tuple(tamano))
+            with cls._candado:
+                pendiente = clave not in cls.imagenes and clave not in cls._crudas
+            if pendiente:
+                cruda = cls._leer_imagen(ruta, clave[1])
+                with cls._candado:
+                    if clave not in cls.imagenes:
+                        cls._crudas[clave] = cruda
+        for nombre in dict.fromkeys(nombre for nombre, _ in fuentes):
+            # match_font solo consulta la lista de fuentes del sistema, no usa SDL_ttf
+            ruta = pygame.font.match_font(nombre)
+            datos = cls._leer_archivo(ruta) if ruta else None
+            with cls._candado:
+                cls._fuentes_crudas.setdefault(nombre, datos)
+        for ruta in sonidos:
+            with cls._candado:
+                pendiente = ruta not in cls.sonidos and ruta not in cls._sonidos_crudos
+            if pendiente:
+                datos = cls._leer_archivo(ruta)
+                if datos is not None:
+                    with cls._candado:
+                        if ruta not in cls.sonidos:
+                            cls._sonidos_crudos[ruta] = datos
+
+    @classmethod
+    def vaciar(cls):
+        with cls._candado:
+            cls.imagenes.clear()
+            cls._crudas.clear()
+            cls._fuentes_crudas.clear()
+            cls._sonidos_crudos.clear()
+        cls.fuentes.clear()
+        cls.sonidos.clear()
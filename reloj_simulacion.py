@@ -0,0 +1,81 @@
+import time
+from config import Config
+
+# ==============================================================================
+# CLASE 20: Reloj de Simulación (RelojSimulacion)
+# Responsabilidad: Separar el ritmo de la lógica del de los fotogramas. La
+# lógica avanza en ticks de duración fija (PASO_FIJO_MS de tiempo simulado);
+# cada fotograma suma el tiempo real transcurrido, multiplicado por la
+# velocidad elegida, y se ejecutan los ticks que quepan. Lo que sobra sirve
+# para interpolar el dibujo entre el tick anterior y el actual.
+# ==============================================================================
+class RelojSimulacion:
+    def __init__(self, paso_ms=None):
+        self.paso_ms = paso_ms or Config.PASO_FIJO_MS
+        self.indice_velocidad = Config.VELOCIDADES.index(1)
+        self.acumulado = 0.0
+        self.ticks = 0
+
+    @property
+    def multiplicador(self):
+        """Ticks simulados por tick real; None es 'MAX' (todos los que quepan en el fotograma)."""
+        return Config.VELOCIDADES[self.indice_velocidad]
+
+    def acelerar(self):
+        self.indice_velocidad = min(self.indice_velocidad + 1, len(Config.VELOCIDADES) - 1)
+
+    def frenar(self):
+        self.indice_velocidad = max(self.indice_velocidad - 1, 0)
+
+    def texto_velocidad(self):
+        return "MAX" if self.multiplicador is None else f"x{self.multiplicador}"
+
+    def tiempo_logico(self):
+        """Milisegundos simulados desde el inicio (sustituye a pygame.time.get_ticks)."""
+        return self.ticks * self.paso_ms
+
+    def reiniciar(self):
+        self.acumulado = 0.0
+        self.ticks = 0
+
+    def avanzar(self, transcurrido_ms, paso, activo):
+        """
+        Ejecuta 'paso()' tantas veces como ticks correspondan a 'transcurrido_ms'
+        de tiempo real, mientras 'activo()' sea cierto. En pausa o fuera de la
+        partida el tiempo no se acumula. Nunca gasta más de
+        PRESUPUESTO_FOTOGRAMA_MS en lógica: si no da tiempo, se dibuja y el resto
+        queda pendiente para el siguiente fotograma. Devuelve los ticks ejecutados.
+        """
+        if not activo():
+            self.acumulado = 0.0
+            return 0
+
+        multiplicador = self.multiplicador
+        # Un fotograma muy lento (arrastrar la ventana, un disco lento...) no se compensa entero
+        transcurrido_ms = min(transcurrido_ms, Config.MAX_RETRASO_MS)
+        if multiplicador is not None:
+            self.acumulado += transcurrido_ms * multiplicador
+
+        limite = time.perf_counter() + Config.PRESUPUESTO_FOTOGRAMA_MS / 1000
+        ejecutados = 0
+        while activo() and (multiplicador is None or self.acumulado >= self.paso_ms):
+            paso()
+            self.ticks += 1
+            ejecutados += 1
+            if multiplicador is not None:
+                self.acumulado -= self.paso_ms
+            if time.perf_counter() >= limite:
+                break
+
+        if multiplicador is None or not activo():
+            self.acumulado = 0.0
+        else:
+            # Lo que no dio tiempo a simular se arrastra, pero sin crecer sin límite
+            self.acumulado = min(self.acumulado, Config.MAX_RETRASO_MS * multiplicador)
+        return ejecutados
+
+    def interpolacion(self):
+        """Fracción del siguiente tick ya transcurrida (0 a 1), para dibujar entre dos ticks."""
+        if self.multiplicador is None:
+            return 1.0
+        return min(self.acumulado / self.paso_ms, 1.0)
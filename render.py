@@ -3,6 +3,7 @@ import pygame
 import os
 import random
 from config import Config
+from recursos import Recursos
 
 # ==============================================================================
 # CLASE 5: Renderizador (Renderer/Diseño)
@@ -10,23 +11,55 @@ from config import Config
 # decisiones, solo dibuja lo que le dicen las otras clases.
 # ==============================================================================
 class Render:
+    # Fuentes usadas por el HUD, los puntajes de A*, los avisos y el menú de selección
+    FUENTES = (("Arial", 22), ("Consolas", 10), ("Arial Black", 50), ("Arial Black", 60), ("Arial", 40), ("Consolas", 14))
+
     def __init__(self, pantalla, tema_key):
         self.pantalla = pantalla
-        pygame.font.init()
-        self.fuente = pygame.font.SysFont("Arial", 22)
-        self.fuente_pequena = pygame.font.SysFont("Consolas", 10)
-        self.fuente_grande = pygame.font.SysFont("Arial Black", 50)
-        directorio_actual = os.path.dirname(os.path.abspath(__file__))
+        # Imágenes y fuentes salen de la caché del proceso: crear otro Render
+        # (al reiniciar o cambiar de tema) no vuelve a leer nada del disco
+        self.fuente = Recursos.fuente("Arial", 22)
+        self.fuente_pequena = Recursos.fuente("Consolas", 10)
+        self.fuente_grande = Recursos.fuente("Arial Black", 50)
+        self.fuente_perfil = Recursos.fuente("Consolas", 14)
 
         # --- Cargar IMAGEN DE FONDO GENÉRICA para el menú de selección ---
-        # Asume que el fondo está en Imagenes/Comunes
-        ruta_fondo_seleccion = os.path.join(directorio_actual, "Imagenes", Config.IMAGEN_FONDO_MENU_SELECCION)
-        self.imagen_fondo_seleccion = self.cargar_imagen(
-            ruta_fondo_seleccion, 
-            (Config.SCREEN_ANCHO, Config.SCREEN_ALTO), 
-            fallback=True
-        )
+        self.imagen_fondo_seleccion = self.cargar_imagen(*Render.imagen_fondo_seleccion(), fallback=True)
         
+        imagenes, obstaculos = Render.imagenes_tema(tema_key)
+        self.imagen_robot = self.cargar_imagen(*imagenes["robot"])
+        self.imagen_pelota = self.cargar_imagen(*imagenes["pelota"])
+        self.imagen_estacion = self.cargar_imagen(*imagenes["estacion"])
+        self.imagen_canasta = self.cargar_imagen(*imagenes["canasta"])
+        self.imagen_fondo = self.cargar_imagen(*imagenes["fondo"])
+
+        # Mapeo de rectángulos a imágenes fijas para obstáculos
+        self.obstaculo_rect_img = {}
+        self.obstaculo_imgs = {tam: [self.cargar_imagen(ruta, tamano) for ruta, tamano in lista]
+                               for tam, lista in obstaculos.items()}
+
+        # Capa fija (fondo, obstáculos, estación y canasta) del mundo actual
+        self.capa_estatica = None
+        self.clave_capa = None
+        # Último fotograma completo y zonas dibujadas encima de la capa fija desde entonces
+        self.clave_fotograma = None
+        self.rects_sucios = []
+        # Puntajes de A* del modo desarrollador: textos ya renderizados y una
+        # copia de la capa fija con los puntajes, retocada solo donde cambian
+        self.glifos = {}
+        self.capa_astar = None
+        self.clave_astar = None
+
+    @staticmethod
+    def imagen_fondo_seleccion():
+        directorio_actual = os.path.dirname(os.path.abspath(__file__))
+        return (os.path.join(directorio_actual, "Imagenes", Config.IMAGEN_FONDO_MENU_SELECCION),
+                (Config.SCREEN_ANCHO, Config.SCREEN_ALTO))
+
+    @staticmethod
+    def imagenes_tema(tema_key):
+        """(ruta, tamaño) de cada imagen del tema y, aparte, las de obstáculos por tamaño en celdas."""
+        directorio_actual = os.path.dirname(os.path.abspath(__file__))
         assets = Config.TEMAS[tema_key]
         carpeta_tema = assets["carpeta"]
 
@@ -34,43 +67,43 @@ class Render:
         if not os.path.exists(ruta_base_assets):
             ruta_base_assets = os.path.join(directorio_actual, "Imagenes", "PC")  # Carpeta por defecto
 
-        # Cargar imágenes usando la ruta base
-        self.imagen_robot = self.cargar_imagen(os.path.join(ruta_base_assets, assets["robot"]), (Config.TAMANO_CELDA + 2, Config.TAMANO_CELDA + 2))
-        self.imagen_pelota = self.cargar_imagen(os.path.join(ruta_base_assets, assets["pelota"]), (Config.TAMANO_CELDA - 5, Config.TAMANO_CELDA - 5))
-        self.imagen_estacion = self.cargar_imagen(os.path.join(ruta_base_assets, assets["estacion"]), (Config.TAMANO_CELDA, Config.TAMANO_CELDA))
-        self.imagen_canasta = self.cargar_imagen(os.path.join(ruta_base_assets, assets["canasta"]), (Config.TAMANO_CELDA, Config.TAMANO_CELDA))
-        self.imagen_fondo = self.cargar_imagen(os.path.join(ruta_base_assets, assets["fondo"]), (Config.TAMANO_CELDA, Config.TAMANO_CELDA))
+        T = Config.TAMANO_CELDA
+        imagenes = {
+            "robot": (os.path.join(ruta_base_assets, assets["robot"]), (T + 2, T + 2)),
+            "pelota": (os.path.join(ruta_base_assets, assets["pelota"]), (T - 5, T - 5)),
+            "estacion": (os.path.join(ruta_base_assets, assets["estacion"]), (T, T)),
+            "canasta": (os.path.join(ruta_base_assets, assets["canasta"]), (T, T)),
+            "fondo": (os.path.join(ruta_base_assets, assets["fondo"]), (T, T)),
+        }
+        obstaculos = {tam: [(os.path.join(ruta_base_assets, nombre), (T * tam[0], T * tam[1])) for nombre in nombres]
+                      for tam, nombres in assets.get("obstaculos", {}).items()}
+        return imagenes, obstaculos
 
-        # Mapeo de rectángulos a imágenes fijas para obstáculos
-        self.obstaculo_rect_img = {}
-        self.obstaculo_imgs = {}
-        imagenes_obstaculos_config = assets.get("obstaculos", {})
-
-        for tam, nombres in imagenes_obstaculos_config.items():
-            self.obstaculo_imgs[tam] = []
-            for nombre in nombres:
-                ruta = os.path.join(ruta_base_assets, nombre)
-                img = self.cargar_imagen(ruta, (Config.TAMANO_CELDA * tam[0], Config.TAMANO_CELDA * tam[1]))
-                self.obstaculo_imgs[tam].append(img)
+    @staticmethod
+    def recursos_necesarios():
+        """Imágenes de todos los temas y fuentes, en el formato de Recursos.precargar."""
+        imagenes = [Render.imagen_fondo_seleccion()]
+        for tema_key in Config.TEMAS:
+            del_tema, obstaculos = Render.imagenes_tema(tema_key)
+            imagenes.extend(del_tema.values())
+            for lista in obstaculos.values():
+                imagenes.extend(lista)
+        return imagenes, Render.FUENTES
 
     def cargar_imagen(self, ruta, tamano, fallback=False):
-        try:
-            img = pygame.image.load(ruta).convert_alpha()
-            return pygame.transform.scale(img, tamano)
-        except (pygame.error, FileNotFoundError):
-            if fallback:
-                # Si una imagen no existe, crea un cuadrado rosa para que sea obvio
-                surf = pygame.Surface(tamano)
-                surf.fill((255, 0, 255))
-                return surf
-            return None
+        img = Recursos.imagen(ruta, tamano)
+        if img is None and fallback:
+            # Si una imagen no existe, crea un cuadrado rosa para que sea obvio
+            img = pygame.Surface(tamano)
+            img.fill((255, 0, 255))
+        return img
         
     @staticmethod
     def dibujar_menu_seleccion(pantalla, opciones_keys, seleccionado_idx):
         # El fondo lo dibuja el método dibujar de la instancia
         
-        fuente_titulo = pygame.font.SysFont("Arial Black", 60)
-        fuente_opcion = pygame.font.SysFont("Arial", 40)
+        fuente_titulo = Recursos.fuente("Arial Black", 60)
+        fuente_opcion = Recursos.fuente("Arial", 40)
         
         titulo = fuente_titulo.render("SELECCIONA UN JUEGO", True, Config.BLANCO)
         pantalla.blit(titulo, (Config.ANCHO // 2 - titulo.get_width() // 2, Config.ALTO // 4))
@@ -83,7 +116,13 @@ class Render:
             pos_y = Config.ALTO // 2 + i * 50
             pantalla.blit(texto, (Config.ANCHO // 2 - texto.get_width() // 2, pos_y))
 
-    def dibujar(self, estado_juego, mundo, robot, modo_desarrollador, pathfinder, opciones_menu, opcion_seleccionada):
+    def dibujar(self, estado_juego, mundo, robot, modo_desarrollador, pathfinder, opciones_menu, opcion_seleccionada,
+                posicion_robot=None, velocidad=None, perfil=None):
+        """
+        'posicion_robot' (esquina en píxeles) dibuja el robot ahí en vez de en
+        robot.rect, para interpolar entre ticks; 'velocidad' se muestra en el HUD
+        y 'perfil' ([(sección, p50, p99)] del Perfilador) en un panel debajo.
+        """
         if estado_juego == 'SELECCION':
             # Dibuja la imagen de fondo del menú de selección
             if self.imagen_fondo_seleccion:
@@ -93,18 +132,68 @@ class Render:
                 
             Render.dibujar_menu_seleccion(self.pantalla, opciones_menu, opcion_seleccionada)
             pygame.display.flip()
+            self.clave_fotograma = None
             return
         
         # --- Lógica de Dibujo del Juego ---
-        self.pantalla.fill((10, 10, 20)) 
-        
+        capa = self._obtener_capa_estatica(mundo, modo_desarrollador)
+        clave = (estado_juego, mundo, modo_desarrollador, opcion_seleccionada)
+
+        # Fotograma completo al cambiar de estado, de modo o de mundo, y siempre
+        # en modo desarrollador (el frente de A* cambia en toda la pantalla)
+        if modo_desarrollador or clave != self.clave_fotograma:
+            fondo = self._capa_puntajes_astar(pathfinder, capa) if modo_desarrollador else capa
+            self.pantalla.blit(fondo, (0, 0))
+            self.rects_sucios = self._dibujar_pelotas(mundo)
+            if modo_desarrollador:
+                # Como siempre, los puntajes quedan por encima de las pelotas
+                self._dibujar_puntajes_sobre_pelotas(pathfinder, mundo)
+            self.rects_sucios += self._dibujar_robot(robot, posicion_robot)
+            self.rects_sucios.append(self._dibujar_hud(robot, mundo, velocidad))
+            if perfil:
+                self.rects_sucios.append(self._dibujar_panel_perfil(perfil))
+            self._dibujar_overlays(estado_juego, opciones_menu, opcion_seleccionada)
+            pygame.display.flip()
+            self.clave_fotograma = clave
+            return
+
+        # Fuera de la partida en curso nada se mueve: la pantalla ya está al día
+        if estado_juego != 'RUNNING':
+            return
+
+        # Solo se borra lo dibujado en el fotograma anterior y se repinta encima
+        for rect in self.rects_sucios:
+            self.pantalla.blit(capa, rect, rect)
+        nuevos = self._dibujar_pelotas(mundo) + self._dibujar_robot(robot, posicion_robot)
+        nuevos.append(self._dibujar_hud(robot, mundo, velocidad))
+        if perfil:
+            nuevos.append(self._dibujar_panel_perfil(perfil))
+        pygame.display.update(self.rects_sucios + nuevos)
+        self.rects_sucios = nuevos
+
+    def _obtener_capa_estatica(self, mundo, modo_desarrollador):
+        """Fondo, obstáculos, estación y canasta compuestos una vez por mundo y modo."""
+        clave = (mundo, modo_desarrollador)
+        if clave == self.clave_capa:
+            return self.capa_estatica
+
+        capa = pygame.Surface(self.pantalla.get_size(), 0, self.pantalla)
         if modo_desarrollador:
-            self.pantalla.fill(Config.FONDO)
-            self._dibujar_cuadricula()
+            capa.fill(Config.FONDO)
+            self._dibujar_cuadricula(capa)
         else:
-            self.pantalla.fill(Config.VERDE_OSCURO)
-            self._dibujar_fondo_cesped()
+            capa.fill(Config.VERDE_OSCURO)
+            self._dibujar_fondo_cesped(capa)
+        self._dibujar_obstaculos(capa, mundo)
+        capa.blit(self.imagen_estacion, mundo.rect_estacion)
+        capa.blit(self.imagen_canasta, mundo.rect_canasta)
 
+        self.capa_estatica = capa
+        self.clave_capa = clave
+        self.clave_fotograma = None
+        return capa
+
+    def _dibujar_obstaculos(self, superficie, mundo):
         # Dibujar obstáculos con imágenes fijas
         if hasattr(mundo, 'obstaculos'):
             for rect_obs in mundo.obstaculos:
@@ -123,78 +212,130 @@ class Render:
                         
                 img = self.obstaculo_rect_img[rect_key]
                 if img:
-                    self.pantalla.blit(img, rect_obs)
+                    superficie.blit(img, rect_obs)
                 else:
                     gris = (120, 120, 120)
-                    pygame.draw.rect(self.pantalla, gris, rect_obs)
+                    pygame.draw.rect(superficie, gris, rect_obs)
 
-        self.pantalla.blit(self.imagen_estacion, mundo.rect_estacion)
-        self.pantalla.blit(self.imagen_canasta, mundo.rect_canasta)
+    def _dibujar_pelotas(self, mundo):
+        rects = []
         for pos_pelota in mundo.pelotas:
             x = pos_pelota[0] - Config.TAMANO_CELDA // 2
             y = pos_pelota[1] - Config.TAMANO_CELDA // 2
-            self.pantalla.blit(self.imagen_pelota, (x, y))
+            rects.append(self.pantalla.blit(self.imagen_pelota, (x, y)))
+        return rects
 
-        if modo_desarrollador:
-            self._dibujar_puntajes_astar(pathfinder)
-
-        self._dibujar_robot(robot)
-        self._dibujar_hud(robot)
-        self._dibujar_overlays(estado_juego, opciones_menu, opcion_seleccionada)
-        pygame.display.flip()
-
-    # ... (El resto de métodos auxiliares (_dibujar_puntajes_astar, _dibujar_fondo_cesped, etc.) se mantienen sin cambios)
-    def _dibujar_puntajes_astar(self, pathfinder):
-        if not pathfinder.pos_objetivo: return
-        for nodo, puntaje_g in pathfinder.puntaje_g.items():
-            puntaje_h = pathfinder.heuristica(nodo, pathfinder.pos_objetivo)
-            puntaje_p = puntaje_g + puntaje_h
-
-            px = nodo[0] * Config.TAMANO_CELDA
-            py = nodo[1] * Config.TAMANO_CELDA
-            tam = Config.TAMANO_CELDA
-            color = Config.AMARILLO if nodo in pathfinder.camino_final else Config.BLANCO
-            
-            texto_g = self.fuente_pequena.render(str(puntaje_g), True, color)
-            texto_h = self.fuente_pequena.render(str(puntaje_h), True, color)
-            texto_p = self.fuente_pequena.render(str(puntaje_p), True, color)
+    # ... (El resto de métodos auxiliares (_capa_puntajes_astar, _dibujar_fondo_cesped, etc.))
+    def _glifo(self, numero, color):
+        """Texto de un puntaje ya renderizado; cada número y color se renderiza una sola vez."""
+        clave = (numero, color)
+        glifo = self.glifos.get(clave)
+        if glifo is None:
+            glifo = self.glifos[clave] = self.fuente_pequena.render(str(numero), True, color)
+        return glifo
+
+    def _capa_puntajes_astar(self, pathfinder, capa):
+        """
+        Copia de la capa fija con los puntajes de A* encima. Solo se retocan las
+        celdas de los nodos que cambiaron desde el último fotograma; una búsqueda
+        nueva (u otro mundo) empieza de una copia limpia y la dibuja entera.
+        """
+        if not pathfinder.pos_objetivo:
+            return capa
+        clave = (pathfinder, pathfinder.generacion_busqueda, capa)
+        if clave != self.clave_astar:
+            self.capa_astar = capa.copy()
+            self.clave_astar = clave
+            pathfinder.tomar_nodos_modificados()
+            nodos = pathfinder.puntaje_g.keys()
+        else:
+            nodos = pathfinder.tomar_nodos_modificados()
+
+        tam = Config.TAMANO_CELDA
+        for nodo in nodos:
+            px = nodo[0] * tam
+            py = nodo[1] * tam
+            self.capa_astar.blit(capa, (px, py), (px, py, tam, tam))
+            self._dibujar_puntajes_celda(self.capa_astar, pathfinder, nodo)
+        return self.capa_astar
+
+    def _dibujar_puntajes_celda(self, superficie, pathfinder, nodo):
+        puntaje_g = pathfinder.puntaje_g[nodo]
+        puntaje_h = pathfinder.heuristica(nodo, pathfinder.pos_objetivo)
+        puntaje_p = puntaje_g + puntaje_h
 
-            self.pantalla.blit(texto_g, (px + 2, py + 2))
-            self.pantalla.blit(texto_h, (px + tam - texto_h.get_width() - 2, py + 2))
-            self.pantalla.blit(texto_p, (px + (tam // 2) - (texto_p.get_width() // 2), py + tam - texto_p.get_height() - 2))
+        tam = Config.TAMANO_CELDA
+        px = nodo[0] * tam
+        py = nodo[1] * tam
+        color = Config.AMARILLO if nodo in pathfinder.camino_final else Config.BLANCO
 
-    def _dibujar_fondo_cesped(self):
+        texto_g = self._glifo(puntaje_g, color)
+        texto_h = self._glifo(puntaje_h, color)
+        texto_p = self._glifo(puntaje_p, color)
+        superficie.blit(texto_g, (px + 2, py + 2))
+        superficie.blit(texto_h, (px + tam - texto_h.get_width() - 2, py + 2))
+        superficie.blit(texto_p, (px + (tam // 2) - (texto_p.get_width() // 2), py + tam - texto_p.get_height() - 2))
+
+    def _dibujar_puntajes_sobre_pelotas(self, pathfinder, mundo):
+        """Vuelve a escribir los puntajes de las celdas con pelota, que la pelota acaba de tapar."""
+        if not pathfinder.pos_objetivo:
+            return
+        for pelota in mundo.pelotas:
+            nodo = (pelota[0] // Config.TAMANO_CELDA, pelota[1] // Config.TAMANO_CELDA)
+            if nodo in pathfinder.puntaje_g:
+                self._dibujar_puntajes_celda(self.pantalla, pathfinder, nodo)
+
+    def _dibujar_fondo_cesped(self, superficie):
         for x in range(0, Config.SCREEN_ANCHO, Config.TAMANO_CELDA):
             for y in range(Config.ALTURA_HUD, Config.SCREEN_ALTO, Config.TAMANO_CELDA):
-                self.pantalla.blit(self.imagen_fondo, (x, y))
+                superficie.blit(self.imagen_fondo, (x, y))
     
-    def _dibujar_cuadricula(self):
+    def _dibujar_cuadricula(self, superficie):
         for x in range(0, Config.ANCHO, Config.TAMANO_CELDA):
-            pygame.draw.line(self.pantalla, (40, 40, 60), (x, Config.ALTURA_HUD), (x, Config.ALTO))
+            pygame.draw.line(superficie, (40, 40, 60), (x, Config.ALTURA_HUD), (x, Config.ALTO))
         for y in range(Config.ALTURA_HUD, Config.ALTO, Config.TAMANO_CELDA):
-            pygame.draw.line(self.pantalla, (40, 40, 60), (0, y), (Config.ANCHO, y))
+            pygame.draw.line(superficie, (40, 40, 60), (0, y), (Config.ANCHO, y))
 
-    def _dibujar_robot(self, robot):
-        rect = robot.rect
-        self.pantalla.blit(self.imagen_robot, rect)
+    def _dibujar_robot(self, robot, posicion=None):
+        """Dibuja el robot (y la pelota que lleva) y devuelve las zonas tocadas."""
+        rect = robot.rect if posicion is None else robot.rect.move(posicion[0] - robot.rect.x, posicion[1] - robot.rect.y)
+        rects = [self.pantalla.blit(self.imagen_robot, rect)]
         if robot.lleva_pelota:
             # Calcular la posición de la celda de enfrente
-            pos_x = robot.rect.centerx + robot.direccion[0] * Config.TAMANO_CELDA
-            pos_y = robot.rect.centery + robot.direccion[1] * Config.TAMANO_CELDA
+            pos_x = rect.centerx + robot.direccion[0] * Config.TAMANO_CELDA
+            pos_y = rect.centery + robot.direccion[1] * Config.TAMANO_CELDA
             
             # Dibujar la pelota en esa posición
-            self.pantalla.blit(self.imagen_pelota, self.imagen_pelota.get_rect(center=(pos_x, pos_y)))
+            rects.append(self.pantalla.blit(self.imagen_pelota, self.imagen_pelota.get_rect(center=(pos_x, pos_y))))
+        return rects
 
-    def _dibujar_hud(self, robot):
-        pygame.draw.rect(self.pantalla, (10, 10, 20), (0, 0, Config.SCREEN_ANCHO, Config.ALTURA_HUD))
+    def _dibujar_hud(self, robot, mundo, velocidad=None):
+        rect_hud = pygame.draw.rect(self.pantalla, (10, 10, 20), (0, 0, Config.SCREEN_ANCHO, Config.ALTURA_HUD))
         ancho_barra, alto_barra = 200, 25
         proporcion_carga = max(0, robot.carga / Config.CARGA_MAXIMA)
         ancho_barra_actual = ancho_barra * proporcion_carga
         color_barra = Config.VERDE if proporcion_carga > 0.6 else Config.AMARILLO if proporcion_carga > 0.3 else Config.ROJO
         pygame.draw.rect(self.pantalla, Config.NEGRO, (10, 15, ancho_barra, alto_barra))
         pygame.draw.rect(self.pantalla, color_barra, (10, 15, ancho_barra_actual, alto_barra))
-        texto_estado = self.fuente.render(f"Estado: {robot.estado} | Recogidas: {robot.recogidas}/{Config.NUM_PELOTAS}", True, Config.BLANCO)
+        texto = f"Estado: {robot.estado} | Recogidas: {robot.recogidas}/{mundo.num_pelotas}"
+        if velocidad:
+            texto += f" | Velocidad: {velocidad}"
+        texto_estado = self.fuente.render(texto, True, Config.BLANCO)
         self.pantalla.blit(texto_estado, (220, 17))
+        return rect_hud
+
+    def _dibujar_panel_perfil(self, perfil):
+        """Tabla p50/p99 (ms por fotograma) de cada sección, bajo el HUD a la derecha."""
+        alto_linea = self.fuente_perfil.get_linesize()
+        lineas = [f"{'seccion':<14}{'p50':>7}{'p99':>7}"]
+        lineas += [f"{seccion:<14}{p50:7.2f}{p99:7.2f}" for seccion, p50, p99 in perfil]
+        ancho = max(self.fuente_perfil.size(linea)[0] for linea in lineas) + 12
+        rect_panel = pygame.Rect(Config.ANCHO - ancho - 10, Config.ALTURA_HUD + 10, ancho, alto_linea * len(lineas) + 12)
+        pygame.draw.rect(self.pantalla, (10, 10, 20), rect_panel)
+        for i, linea in enumerate(lineas):
+            color = Config.AMARILLO if i == 0 else Config.BLANCO
+            self.pantalla.blit(self.fuente_perfil.render(linea, True, color), (rect_panel.x + 6, rect_panel.y + 6 + i * alto_linea))
+        return rect_panel
 
     def _dibujar_overlays(self, estado_juego, opciones_menu_keys, opcion_seleccionada_idx):
         if estado_juego == 'MENU':
@@ -0,0 +1,78 @@
+from collections import defaultdict
+
+# ==============================================================================
+# CLASE 17: Tabla de Reservas (TablaReservas)
+# Responsabilidad: Recordar qué celda ocupa cada robot en cada tick futuro
+# (reserva de vértice), qué movimientos hace (reserva de arista, para impedir
+# que dos robots se crucen intercambiando celdas) y dónde se queda quieto al
+# terminar su plan (aparcamiento, válido desde ese tick en adelante).
+# ==============================================================================
+class TablaReservas:
+    def __init__(self):
+        # (celda, t) -> robot
+        self.vertices = {}
+        # (desde, hasta, t): un robot pasa de 'desde' a 'hasta' llegando en el tick t
+        self.aristas = set()
+        # celda -> (robot, desde_t); robot -> celda
+        self.aparcados = {}
+        self.aparcado_por = {}
+        # celda -> último tick con reserva de vértice (para saber si se puede aparcar)
+        self.ultima_reserva = {}
+        # t -> claves que caducan al pasar ese tick
+        self.por_tiempo = defaultdict(list)
+        self.tick_minimo = 0
+
+    def libre(self, robot, desde, hasta, t, ignorar=()):
+        """¿Puede 'robot' pasar de 'desde' (en t-1) a 'hasta' (en t)? Las reservas de 'ignorar' no cuentan."""
+        dueno = self.vertices.get((hasta, t))
+        if dueno is not None and dueno != robot and dueno not in ignorar:
+            return False
+        aparcado = self.aparcados.get(hasta)
+        if aparcado is not None and aparcado[0] != robot and aparcado[0] not in ignorar and t >= aparcado[1]:
+            return False
+        return desde == hasta or (hasta, desde, t) not in self.aristas
+
+    def puede_aparcar(self, celda, t, ignorar=()):
+        """Quedarse en 'celda' desde t solo vale si nadie (salvo 'ignorar') la tiene reservada más adelante."""
+        ultima = self.ultima_reserva.get(celda, -1)
+        if ultima <= t or not ignorar:
+            return ultima <= t
+        return all(self.vertices.get((celda, futuro)) in (None, *ignorar) for futuro in range(t + 1, ultima + 1))
+
+    def reservar(self, robot, inicio, t0, celdas):
+        """Reserva la ruta 'celdas' (posiciones en t0+1, t0+2, ...) y aparca al robot al final."""
+        anterior = inicio
+        t = t0
+        for t, celda in enumerate(celdas, t0 + 1):
+            self.vertices[(celda, t)] = robot
+            if celda != anterior:
+                self.aristas.add((anterior, celda, t))
+            if self.ultima_reserva.get(celda, -1) < t:
+                self.ultima_reserva[celda] = t
+            self.por_tiempo[t].append((anterior, celda))
+            anterior = celda
+        self.aparcar(robot, anterior, t)
+
+    def cancelar(self, robot, t0, celdas):
+        """Anula las reservas de vértice de 'robot' en 'celdas' (las de t0+1, t0+2, ...)."""
+        for t, celda in enumerate(celdas, t0 + 1):
+            if self.vertices.get((celda, t)) == robot:
+                del self.vertices[(celda, t)]
+
+    def aparcar(self, robot, celda, desde_t):
+        self.desaparcar(robot)
+        self.aparcados[celda] = (robot, desde_t)
+        self.aparcado_por[robot] = celda
+
+    def desaparcar(self, robot):
+        celda = self.aparcado_por.pop(robot, None)
+        if celda is not None:
+            del self.aparcados[celda]
+
+    def olvidar_antes(self, t):
+        """Borra las reservas de ticks ya pasados."""
+        for viejo in range(self.tick_minimo, t):
+            for anterior, celda in self.por_tiempo.pop(viejo, ()):
+                self.vertices.pop((celda, viejo), None)
+                self.aristas.discard((anterior, celda, viejo))
+        self.tick_minimo = max(self.tick_minimo, t)
@@ -1,7 +1,10 @@
 import math
+from collections import deque
 import pygame
 from config import Config
 from pathfinder import Pathfinder
+from campo_distancias import CampoDistancias
+from planificador_recorrido import PlanificadorRecorrido
 
 
 # ==============================================================================
@@ -10,13 +13,22 @@ from pathfinder import Pathfinder
 # QUÉ hacer (su objetivo) y gestiona su estado interno (batería, etc.).
 # ==============================================================================
 class Robot:
+    # Sin __dict__: cada robot ocupa lo justo y no se cuelan atributos por error
+    __slots__ = ('rect', 'mundo', 'carga', 'estado', 'lleva_pelota', 'pelota_objetivo', 'recogidas',
+                 'ultima_decision', 'esta_moviendo', 'objetivo_pixel_x', 'objetivo_pixel_y', '_ruta',
+                 'contador_atascado', 'esta_busqueda', 'dev_desbloqueado', 'camino_normal', 'camino_dev',
+                 'direccion', 'reloj', 'recorrido')
+
     @staticmethod
     def esta_contenido(rect1, rect2):
         return rect1.left >= rect2.left and rect1.right <= rect2.right and \
                rect1.top >= rect2.top and rect1.bottom <= rect2.bottom
 
-    def __init__(self, pos_x, pos_y):
+    def __init__(self, pos_x, pos_y, mundo=None):
         self.rect = pygame.Rect(pos_x, pos_y, Config.TAMANO_CELDA, Config.TAMANO_CELDA)
+        # Con un mundo asociado se usa su rejilla de ocupación en vez de
+        # reconstruir el conjunto de obstáculos en cada decisión.
+        self.mundo = mundo
         self.carga = Config.CARGA_MAXIMA
         self.estado = 'BUSCANDO'
         self.lleva_pelota = False
@@ -26,13 +38,29 @@ class Robot:
         self.esta_moviendo = False
         self.objetivo_pixel_x = pos_x
         self.objetivo_pixel_y = pos_y
-        self.ruta_actual = []
+        self._ruta = deque()
         self.contador_atascado = 0
         self.esta_busqueda = False
         self.dev_desbloqueado = False
-        self.camino_normal = []
-        self.camino_dev = []
+        # Rastro de las últimas posiciones: búfer circular, lo más viejo se descarta
+        self.camino_normal = deque(maxlen=Config.LONGITUD_RASTRO)
+        self.camino_dev = deque(maxlen=Config.LONGITUD_RASTRO)
         self.direccion = (0, 1) # (x, y) -> Abajo por defecto
+        # Fuente de tiempo (ms) para el enfriamiento de decisiones; la
+        # simulación sin pantalla la sustituye por un reloj lógico.
+        self.reloj = pygame.time.get_ticks
+        # PlanificadorRecorrido opcional: con él las pelotas y las recargas siguen
+        # un orden planificado en vez de ir a la más cercana (requiere mundo)
+        self.recorrido = None
+
+    @property
+    def ruta_actual(self):
+        """Celdas (centros en píxeles) que faltan por recorrer; se consumen por la izquierda."""
+        return self._ruta
+
+    @ruta_actual.setter
+    def ruta_actual(self, ruta):
+        self._ruta = deque(ruta) if ruta else deque()
 
     def sincronizar_posicion_animacion(self):
         self.objetivo_pixel_x = self.rect.x
@@ -61,7 +89,8 @@ class Robot:
                 self.carga += Config.TASA_RECARGA
             else:
                 self.carga = Config.CARGA_MAXIMA
-                self.estado = 'BUSCANDO'
+                # Un recorrido planificado puede recargar con la pelota encima antes de entregarla
+                self.estado = 'RECOGIDO' if self.lleva_pelota else 'BUSCANDO'
             return None
 
         # 1. PRIMERO, si hemos llegado a un destino, procesamos la llegada.
@@ -72,7 +101,7 @@ class Robot:
 
         # 2. SEGUNDO, si después de llegar seguimos sin ruta, buscamos una nueva.
         if not self.ruta_actual:
-            tiempo_actual = pygame.time.get_ticks()
+            tiempo_actual = self.reloj()
             if not modo_desarrollador and tiempo_actual - self.ultima_decision < Config.enfriamiento_decision_robot:
                 return None
             
@@ -91,40 +120,74 @@ class Robot:
                             return 'GAME_OVER_STUCK'
                 return None
             
+            planificada = None
+            if not modo_desarrollador and self.recorrido is not None:
+                if self.estado == 'BUSCANDO' and pelotas:
+                    planificada = self.recorrido.siguiente_parada(self.rect.center, self.carga, pelotas)
+                    if planificada == PlanificadorRecorrido.ESTACION:
+                        self.estado = 'CARGAR'
+                        planificada = None
+                elif self.estado == 'RECOGIDO' and self.recorrido.recargar_ahora():
+                    self.estado = 'CARGAR'
+
             self._verificar_bateria_emergencia(pelotas, rect_canasta, rect_estacion, pathfinder)
             
-            obstaculos = set(p for p in pelotas) | {rect_estacion.center, rect_canasta.center}
-            if obstaculos_extra:
-                for rect_obs in obstaculos_extra:
-                    for i in range(rect_obs.left, rect_obs.right, Config.TAMANO_CELDA):
-                        for j in range(rect_obs.top, rect_obs.bottom, Config.TAMANO_CELDA):
-                            obstaculos.add((i + Config.TAMANO_CELDA // 2, j + Config.TAMANO_CELDA // 2))
-
-            objetivo = self._obtener_objetivo(pelotas, rect_canasta, rect_estacion, obstaculos, pathfinder, modo_desarrollador)
-
-            if objetivo:
-                if self.estado == 'BUSCANDO' and self.pelota_objetivo in obstaculos:
-                    obstaculos.discard(self.pelota_objetivo)
-
-                if modo_desarrollador:
-                    pathfinder.iniciar_busqueda(self.rect.center, objetivo, obstaculos)
-                    self.esta_busqueda = True
-                else:
-                    ruta = pathfinder.a_estrella(self.rect.center, objetivo, obstaculos)
-                    if ruta is not None:
-                        self.ruta_actual = ruta
-                        self.contador_atascado = 0
-                        # Reiniciar el timer solo después de una decisión exitosa
-                        self.ultima_decision = tiempo_actual
+            if self.mundo is not None:
+                obstaculos = self.mundo.ocupacion
+            else:
+                obstaculos = set(p for p in pelotas) | {rect_estacion.center, rect_canasta.center}
+                if obstaculos_extra:
+                    for rect_obs in obstaculos_extra:
+                        for i in range(rect_obs.left, rect_obs.right, Config.TAMANO_CELDA):
+                            for j in range(rect_obs.top, rect_obs.bottom, Config.TAMANO_CELDA):
+                                obstaculos.add((i + Config.TAMANO_CELDA // 2, j + Config.TAMANO_CELDA // 2))
+
+            if not modo_desarrollador and self.estado == 'BUSCANDO':
+                if planificada is not None:
+                    # La pelota la eligió el recorrido planificado, por la ruta con que midió el tramo
+                    self.pelota_objetivo = planificada
+                    resultado = self._aceptar_ruta(self.recorrido.ruta_a_pelota(self.rect.center, planificada), tiempo_actual)
+                    if resultado:
+                        return resultado
+                # Una sola búsqueda elige la pelota alcanzable más cercana por camino
+                elif pelotas:
+                    self.pelota_objetivo, ruta = pathfinder.buscar_pelota_cercana(self.rect.center, pelotas, obstaculos)
+                    resultado = self._aceptar_ruta(ruta, tiempo_actual)
+                    if resultado:
+                        return resultado
+            elif not modo_desarrollador and self.mundo is not None and self.estado in ('RECOGIDO', 'CARGAR') \
+                    and (pathfinder.motor != "INCREMENTAL" or self.recorrido is not None and not self.recorrido.gana_voraz):
+                # Canasta y estación no se mueven: la ruta sale del campo de distancias del mundo.
+                # Con el motor INCREMENTAL se piden a Pathfinder (más abajo): su búsqueda D* Lite
+                # hacia cada una se conserva entre entregas y solo repara lo que cambió. Con
+                # recorrido planificado no, porque el plan midió sus tramos con estos campos (si se
+                # descartó por no ganar al robot sin plan, se sigue como sin él)
+                campo = self.mundo.campo_canasta if self.estado == 'RECOGIDO' else self.mundo.campo_estacion
+                resultado = self._aceptar_ruta(campo.ruta_desde(self.rect.center), tiempo_actual)
+                if resultado:
+                    return resultado
+            else:
+                objetivo = self._obtener_objetivo(pelotas, rect_canasta, rect_estacion, obstaculos, pathfinder, modo_desarrollador)
+
+                if objetivo:
+                    if self.estado == 'BUSCANDO' and isinstance(obstaculos, set) and self.pelota_objetivo in obstaculos:
+                        obstaculos.discard(self.pelota_objetivo)
+
+                    if modo_desarrollador:
+                        pathfinder.iniciar_busqueda(self.rect.center, objetivo, obstaculos)
+                        self.esta_busqueda = True
                     else:
-                        self.contador_atascado += 1
-                        if self.contador_atascado >= Config.MAX_TURNOS_ATASCADO:
-                            return 'GAME_OVER_STUCK'
+                        resultado = self._aceptar_ruta(pathfinder.buscar(self.rect.center, objetivo, obstaculos), tiempo_actual)
+                        if resultado:
+                            return resultado
 
-        # 3. TERCERO, si ya tenemos una ruta, avanzamos un paso.
+        # 3. TERCERO, si ya tenemos una ruta, avanzamos un paso. Con el campo de
+        # distancias del mundo se comprueba antes de cada paso que aún se puede volver.
+        if self.ruta_actual and self.mundo is not None:
+            self._verificar_bateria_emergencia(pelotas, rect_canasta, rect_estacion, pathfinder)
         if self.ruta_actual:
             if modo_desarrollador:
-                siguiente = self.ruta_actual.pop(0)
+                siguiente = self._ruta.popleft()
                 self.rect.x = siguiente[0] - Config.TAMANO_CELDA // 2
                 self.rect.y = siguiente[1] - Config.TAMANO_CELDA // 2
                 self.carga -= Config.CARGA_POR_MOVIMIENTO
@@ -134,7 +197,7 @@ class Robot:
                     if resultado_llegada:
                         return resultado_llegada
             else: # Modo Normal
-                siguiente = self.ruta_actual.pop(0)
+                siguiente = self._ruta.popleft()
                 dx = siguiente[0] - self.rect.centerx
                 dy = siguiente[1] - self.rect.centery
                 if dx != 0 or dy != 0:
@@ -148,6 +211,18 @@ class Robot:
         
         return None
 
+    def _aceptar_ruta(self, ruta, tiempo_actual):
+        if ruta is not None:
+            self.ruta_actual = ruta
+            self.contador_atascado = 0
+            # Reiniciar el timer solo después de una decisión exitosa
+            self.ultima_decision = tiempo_actual
+            return None
+        self.contador_atascado += 1
+        if self.contador_atascado >= Config.MAX_TURNOS_ATASCADO:
+            return 'GAME_OVER_STUCK'
+        return None
+
     def animar_movimiento(self, modo_desarrollador=False):
         if modo_desarrollador:
             return 
@@ -165,6 +240,13 @@ class Robot:
         else:
             self.esta_moviendo = False
 
+    def completar_movimiento(self):
+        """Termina de golpe el movimiento en curso (sin animación)."""
+        if self.esta_moviendo:
+            self.rect.x = self.objetivo_pixel_x
+            self.rect.y = self.objetivo_pixel_y
+            self.esta_moviendo = False
+
     def _encontrar_posicion_entrega(self, rect_objetivo, obstaculos):
         vecinos = [(0, -1), (0, 1), (-1, 0), (1, 0)] # Arriba, Abajo, Izquierda, Derecha
         posiciones_posibles = []
@@ -208,6 +290,8 @@ class Robot:
             if self.pelota_objetivo and self.rect.collidepoint(self.pelota_objetivo):
                 if self.pelota_objetivo in pelotas:
                     pelotas.remove(self.pelota_objetivo)
+                    if self.mundo is not None:
+                        self.mundo.ocupacion.retirar_pelota(self.pelota_objetivo)
                 self.lleva_pelota = True
                 self.estado = 'RECOGIDO'
                 self.pelota_objetivo = None
@@ -218,7 +302,9 @@ class Robot:
             if distancia <= Config.TAMANO_CELDA:
                 self.recogidas += 1
                 self.lleva_pelota = False
-                if self.recogidas == Config.NUM_PELOTAS:
+                # Las del mundo en juego (generado con otro número o cargado), no las de Config
+                total = self.mundo.num_pelotas if self.mundo is not None else Config.NUM_PELOTAS
+                if self.recogidas == total:
                     pathfinder.limpiar()
                     return 'GAME_OVER'
                 else:
@@ -233,20 +319,36 @@ class Robot:
 
         if tarea_completada:
             # --- PUESTO: Reiniciar el temporizador al completar una tarea ---
-            self.ultima_decision = pygame.time.get_ticks()
+            self.ultima_decision = self.reloj()
             pathfinder.limpiar()
 
         return None
 
+    def carga_para_volver(self):
+        """
+        Batería con la que hay que dar media vuelta hacia la estación. Sale del campo
+        de distancias del mundo (al día aunque se muevan pelotas), sin buscar nada:
+        los pasos que faltan más el que se va a dar, por el margen de seguridad. Sin
+        mundo o sin camino a la estación queda el umbral fijo CARGA_EMERGENCIA.
+        """
+        if self.mundo is None:
+            return Config.CARGA_EMERGENCIA
+        distancia = self.mundo.campo_estacion.distancia_pixel(self.rect.center)
+        if distancia == CampoDistancias.INFINITO:
+            return Config.CARGA_EMERGENCIA
+        return (distancia + 1) * Config.CARGA_POR_MOVIMIENTO * Config.MARGEN_SEGURIDAD_BATERIA
+
     def _verificar_bateria_emergencia(self, pelotas, rect_canasta, rect_estacion, pathfinder: Pathfinder):
-        if self.carga <= Config.CARGA_EMERGENCIA and self.estado not in ['CARGAR', 'RECARGANDO']:
-            if self.lleva_pelota:
-                pos_detras_x = self.rect.centerx - self.direccion[0] * Config.TAMANO_CELDA
-                pos_detras_y = self.rect.centery - self.direccion[1] * Config.TAMANO_CELDA
-                pelotas.append((pos_detras_x, pos_detras_y))
+        # También con recorrido planificado: el plan cuenta con este aviso, y si la
+        # rejilla cambió desde que se hizo, es lo que evita quedarse sin batería
+        if self.carga <= self.carga_para_volver() and self.estado not in ['CARGAR', 'RECARGANDO']:
+            # Se suelta en su propia celda (no en la de detrás): un camino más corto
+            # desde aquí no vuelve a pasar por ella, así que la distancia medida sigue
+            # valiendo. Si la rejilla no la admite ahí, se la lleva a la estación.
+            if self.lleva_pelota and (self.mundo is None or self.mundo.ocupacion.colocar_pelota(self.rect.center)):
+                pelotas.append(self.rect.center)
                 self.lleva_pelota = False
-                self.pelota_objetivo = None
-            
+            self.pelota_objetivo = None
             self.estado = 'CARGAR'
             self.ruta_actual = []
             self.esta_busqueda = False
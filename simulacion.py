@@ -0,0 +1,100 @@
+import argparse
+import os
+import time
+# Sin pantalla no hace falta el saludo de pygame en la salida estándar
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from config import Config
+from robot import Robot
+from world import World
+from pathfinder import Pathfinder
+from planificador_recorrido import PlanificadorRecorrido
+
+# ==============================================================================
+# CLASE 7: Simulación sin pantalla (Simulacion)
+# Responsabilidad: Ejecutar un episodio completo sin ventana, sin audio y sin
+# límite de fotogramas. Avanza el mundo, el robot y el buscador de caminos con
+# un contador de ticks lógicos en lugar del reloj de pygame.
+# ==============================================================================
+class Simulacion:
+    def __init__(self, semilla=None, max_ticks=None, motor=None, mundo=None, recorrido=None):
+        """
+        Con 'mundo' se juega esa disposición (p. ej. cargada de un corpus) en vez de generarla.
+        'recorrido' activa el recorrido planificado (por defecto Config.PLANIFICAR_RECORRIDO).
+        """
+        self.mundo = mundo if mundo is not None else World(semilla)
+        self.semilla = semilla if semilla is not None else self.mundo.semilla
+        self.max_ticks = max_ticks if max_ticks is not None else Config.MAX_TICKS_SIMULACION
+        self.pathfinder = Pathfinder(motor)
+        self.robot = Robot(self.mundo.pos_inicio_robot[0], self.mundo.pos_inicio_robot[1], self.mundo)
+        # Cada tick lógico equivale a un periodo completo de decisión del robot
+        self.robot.reloj = self.tiempo_logico
+        if Config.PLANIFICAR_RECORRIDO if recorrido is None else recorrido:
+            self.robot.recorrido = PlanificadorRecorrido(self.mundo)
+        self.tick = 0
+        self.pasos = 0
+        self.resultado = None
+
+    def tiempo_logico(self):
+        return self.tick * Config.enfriamiento_decision_robot
+
+    def paso(self):
+        """Avanza un tick lógico. Devuelve el estado final si el episodio terminó."""
+        if self.resultado:
+            return self.resultado
+
+        self.tick += 1
+        nuevo_estado = self.robot.actualizar(
+            self.mundo.pelotas, self.mundo.rect_estacion, self.mundo.rect_canasta, self.pathfinder
+        )
+        if self.robot.esta_moviendo:
+            self.pasos += 1
+            self.robot.completar_movimiento()
+
+        if nuevo_estado:
+            self.resultado = nuevo_estado
+        elif self.tick >= self.max_ticks:
+            self.resultado = 'LIMITE_TICKS'
+        return self.resultado
+
+    def ejecutar(self):
+        """Corre el episodio hasta que termina y devuelve un resumen."""
+        while not self.paso():
+            pass
+        return self.resumen()
+
+    def resumen(self):
+        return {
+            "semilla": self.semilla,
+            "resultado": self.resultado,
+            "ticks": self.tick,
+            "pasos": self.pasos,
+            "recogidas": self.robot.recogidas,
+            "bateria_usada": self.pasos * Config.CARGA_POR_MOVIMIENTO,
+            "carga_final": self.robot.carga,
+            # Trabajo de búsqueda del episodio (el tiempo, que no es determinista, lo añade Lote)
+            **self.pathfinder.estadisticas.resumen(),
+        }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Simulación de AgentQuest sin pantalla.")
+    parser.add_argument("--episodios", type=int, default=1)
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del primer episodio")
+    parser.add_argument("--max-ticks", type=int, default=None)
+    parser.add_argument("--mundo", default=None, help="Archivo .npz guardado con World.guardar")
+    parser.add_argument("--recorrido", action="store_true", default=None,
+                        help="Recorrido planificado en vez de la pelota más cercana")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    for i in range(args.episodios):
+        if args.mundo:
+            simulacion = Simulacion(max_ticks=args.max_ticks, mundo=World.cargar(args.mundo), recorrido=args.recorrido)
+        else:
+            simulacion = Simulacion(args.semilla + i, args.max_ticks, recorrido=args.recorrido)
+        resumen = simulacion.ejecutar()
+        print(f"Episodio {i} (semilla {resumen['semilla']}): {resumen['resultado']} | "
+              f"ticks: {resumen['ticks']} | pasos: {resumen['pasos']} | "
+              f"recogidas: {resumen['recogidas']}/{simulacion.mundo.num_pelotas}")
+    duracion = time.perf_counter() - inicio
+    print(f"{args.episodios} episodios en {duracion:.2f} s")
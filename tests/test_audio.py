@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+import threading
+from unittest import mock
+
+# Sin tarjeta de sonido: SDL mezcla en un dispositivo ficticio
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# Añadimos la ruta principal del proyecto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+from config import Config
+from audio import Audio
+from recursos import Recursos
+
+class TestAudio(unittest.TestCase):
+
+    def setUp(self):
+        self.audio = Audio()
+
+    def tearDown(self):
+        self.audio.cerrar()
+        # Los sonidos de la caché no sobreviven al cierre del mezclador
+        Recursos.vaciar()
+        pygame.mixer.quit()
+
+    def test_efecto_decodificado_una_vez(self):
+        """
+        Reproducir un efecto dos veces debe reutilizar el mismo sonido y el mismo canal.
+        """
+        self.assertTrue(self.audio.reproducir_sfx(Config.SONIDO_VICTORIA))
+        ruta = os.path.join(self.audio.ruta_base_sonidos, Config.SONIDO_VICTORIA)
+        sonido = Recursos.sonidos[ruta]
+        self.assertTrue(self.audio.reproducir_sfx(Config.SONIDO_VICTORIA))
+        self.assertIs(Recursos.sonidos[ruta], sonido)
+        self.assertIs(self.audio.canal_sfx.get_sound(), sonido)
+        self.assertFalse(self.audio.reproducir_sfx("no_existe.mp3"))
+        print("\nPrueba de efectos en memoria: SUPERADA")
+
+    def test_ordenes_de_musica_en_orden(self):
+        """
+        Las órdenes de música se atienden en el hilo propio y en el orden recibido.
+        """
+        self.audio.cambiar_musica(Config.MUSICA_MENU)
+        tema = list(Config.TEMAS.values())[0]
+        self.audio.cambiar_musica(tema["musica_fondo"])
+        self.audio.pausar_musica()
+        self.audio.esperar()
+        self.assertEqual(self.audio.musica_actual, tema["musica_fondo"])
+
+        self.audio.detener_musica()
+        self.audio.esperar()
+        self.assertIsNone(self.audio.musica_actual)
+        self.assertFalse(pygame.mixer.music.get_busy())
+        print("Prueba de música en segundo plano: SUPERADA")
+
+    def test_mezclador_solo_en_hilo_principal(self):
+        """
+        El hilo de música solo lee archivos: toda llamada al mezclador ocurre en el hilo principal.
+        """
+        hilos = []
+        def anotar(nombre):
+            original = getattr(pygame.mixer.music, nombre)
+            def envoltura(*args, **kwargs):
+                hilos.append(threading.current_thread())
+                return original(*args, **kwargs)
+            return mock.patch.object(pygame.mixer.music, nombre, envoltura)
+
+        with anotar("load"), anotar("play"), anotar("stop"), anotar("pause"), anotar("unpause"):
+            self.audio.cambiar_musica(Config.MUSICA_MENU)
+            # Mientras el hilo lee el archivo, la pausa espera detrás del cambio
+            self.audio.pausar_musica()
+            self.audio.reanudar_musica()
+            self.audio.esperar()
+        self.assertEqual(self.audio.musica_actual, Config.MUSICA_MENU)
+        self.assertFalse(self.audio.pendientes)
+        self.assertGreaterEqual(len(hilos), 5)
+        self.assertTrue(all(hilo is threading.main_thread() for hilo in hilos))
+        print("Prueba de mezclador en el hilo principal: SUPERADA")
+
+
+if __name__ == '__main__':
+    unittest.main()
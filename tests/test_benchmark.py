@@ -0,0 +1,49 @@
+import unittest
+import json
+import sys
+import os
+import tempfile
+
+# Añadimos la ruta principal del proyecto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmark import Benchmark
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_comparar_detecta_regresiones(self):
+        """
+        Más ms por búsqueda o menos nodos por segundo que la base es una regresión.
+        """
+        base = {"resultados": [{"nombre": "plano", "ms_por_busqueda": 1.0, "nodos_por_segundo": 1000.0},
+                               {"nombre": "dibujar", "ms_por_fotograma": 5.0}]}
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as archivo:
+            json.dump(base, archivo)
+        try:
+            actuales = [{"nombre": "plano", "ms_por_busqueda": 1.1, "nodos_por_segundo": 700.0},
+                        {"nombre": "dibujar", "ms_por_fotograma": 4.0},
+                        {"nombre": "nuevo", "ms_por_fotograma": 99.0}]
+            regresiones = Benchmark.comparar(actuales, archivo.name, 0.2)
+        finally:
+            os.remove(archivo.name)
+
+        self.assertEqual([(nombre, metrica) for nombre, metrica, *_ in regresiones],
+                         [("plano", "nodos_por_segundo")])
+        print("\nPrueba de comparación con la línea base: SUPERADA")
+
+    def test_busquedas_rapidas(self):
+        """
+        El modo rápido mide todas las combinaciones de tamaño y densidad, con
+        nodos por segundo para cada motor.
+        """
+        banco = Benchmark(rapido=True)
+        banco.medir_busquedas()
+        nombres = [entrada["nombre"] for entrada in banco.resultados]
+        self.assertIn("paso 1280x720 densidad 0.10", nombres)
+        self.assertIn("a_estrella 1280x720 densidad 0.10", nombres)
+        self.assertTrue(all(entrada["nodos_por_segundo"] > 0 for entrada in banco.resultados))
+        print("Prueba de medición de búsquedas: SUPERADA")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import random
+import sys
+import os
+
+# Añadimos la ruta principal del proyecto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from world import World
+from pathfinder import Pathfinder
+from ocupacion import Ocupacion
+from campo_distancias import CampoDistancias
+from config import Config
+
+class TestCampoDistancias(unittest.TestCase):
+
+    def setUp(self):
+        self.mundo = World(semilla=11)
+
+    def test_ruta_a_la_estacion_es_optima(self):
+        """
+        La ruta por gradiente debe tener la misma longitud que la de A*.
+        """
+        campo = self.mundo.campo_estacion
+        destino = self.mundo.rect_estacion.center
+        for pelota in self.mundo.pelotas:
+            # Partimos de la casilla libre de al lado de cada pelota
+            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+                inicio = (pelota[0] + dx * Config.TAMANO_CELDA, pelota[1] + dy * Config.TAMANO_CELDA)
+                if inicio in self.mundo.ocupacion:
+                    continue
+                ruta_a_estrella = Pathfinder.a_estrella(inicio, destino, self.mundo.ocupacion)
+                ruta_campo = campo.ruta_desde(inicio)
+                if ruta_a_estrella is None:
+                    self.assertIsNone(ruta_campo)
+                    continue
+                self.assertEqual(len(ruta_campo), len(ruta_a_estrella))
+                self.assertEqual(ruta_campo[-1], destino)
+                self.assertEqual(campo.distancia_pixel(inicio), len(ruta_a_estrella))
+        print("\nPrueba de ruta por gradiente: SUPERADA")
+
+    def test_reparacion_incremental_igual_a_recalculo(self):
+        """
+        Tras recoger y soltar pelotas, el campo reparado debe coincidir con uno nuevo.
+        """
+        ocupacion = self.mundo.ocupacion
+        aleatorio = random.Random(3)
+        libres = [(x, y) for x in range(ocupacion.columnas) for y in range(ocupacion.fila_minima, ocupacion.filas)
+                  if not ocupacion.celda_bloqueada((x, y))]
+
+        for _ in range(60):
+            if self.mundo.pelotas and aleatorio.random() < 0.5:
+                pelota = self.mundo.pelotas.pop(aleatorio.randrange(len(self.mundo.pelotas)))
+                ocupacion.retirar_pelota(pelota)
+            else:
+                celda = aleatorio.choice(libres)
+                pelota = (celda[0] * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2,
+                          celda[1] * Config.TAMANO_CELDA + Config.TAMANO_CELDA // 2)
+                if ocupacion.colocar_pelota(pelota):
+                    self.mundo.pelotas.append(pelota)
+
+            for campo in (self.mundo.campo_estacion, self.mundo.campo_canasta):
+                nuevo = CampoDistancias(ocupacion, [], campo.semillas_bloqueadas)
+                nuevo.semillas = campo.semillas
+                nuevo.recalcular()
+                nuevo.liberar()
+                self.assertEqual(campo.distancia, nuevo.distancia)
+        print("Prueba de reparación incremental: SUPERADA")
+
+    def test_celda_de_entrega_ocupada(self):
+        """
+        Si una pelota cae en una celda de entrega, la canasta se alcanza por otra.
+        """
+        canasta = self.mundo.rect_canasta.center
+        arriba = (canasta[0], canasta[1] - Config.TAMANO_CELDA)
+        campo = self.mundo.campo_canasta
+        if arriba in self.mundo.ocupacion:
+            self.skipTest("La celda de entrega ya está ocupada en esta disposición")
+
+        self.assertEqual(campo.distancia_pixel(arriba), 0)
+        self.mundo.ocupacion.colocar_pelota(arriba)
+        self.assertNotEqual(campo.distancia_pixel(arriba), 0)
+        self.mundo.ocupacion.retirar_pelota(arriba)
+        self.assertEqual(campo.distancia_pixel(arriba), 0)
+        print("Prueba de celda de entrega ocupada: SUPERADA")
+
+
+if __name__ == '__main__':
+    unittest.main()
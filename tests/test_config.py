@@ -0,0 +1,41 @@
+import unittest
+import subprocess
+import sys
+import os
+
+# Añadimos la ruta principal del proyecto
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(RAIZ)
+
+from config import Config
+
+class TestConfig(unittest.TestCase):
+
+    def test_importar_no_arranca_pygame(self):
+        """
+        Importar la configuración no debe cargar pygame ni consultar la pantalla.
+        """
+        salida = subprocess.run(
+            [sys.executable, "-c", "import sys, config; print('pygame' in sys.modules)"],
+            cwd=RAIZ, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(salida.stdout.strip(), "False")
+        print("\nPrueba de importación sin pantalla: SUPERADA")
+
+    def test_establecer_pantalla_recalcula_cuadricula(self):
+        """
+        Fijar la resolución debe ajustar el área jugable a múltiplos de la celda.
+        """
+        original = (Config.SCREEN_ANCHO, Config.SCREEN_ALTO)
+        try:
+            Config.establecer_pantalla(1000, 700)
+            self.assertEqual(Config.ANCHO, (1000 // Config.TAMANO_CELDA) * Config.TAMANO_CELDA)
+            self.assertEqual(Config.ALTO, (700 // Config.TAMANO_CELDA) * Config.TAMANO_CELDA)
+            self.assertEqual(Config.POS_X_CENTRADA, (1000 - Config.ANCHO) // 2)
+        finally:
+            Config.establecer_pantalla(*original)
+        print("Prueba de resolución explícita: SUPERADA")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Añadimos la ruta principal del proyecto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from world import World
+from corpus import CorpusMundos
+from lote import Lote
+from simulacion import Simulacion
+from config import Config
+
+class TestCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def assertMismoMundo(self, a, b):
+        self.assertEqual(a.obstaculos, b.obstaculos)
+        self.assertEqual(a.pelotas, b.pelotas)
+        self.assertEqual(a.pos_inicio_robot, b.pos_inicio_robot)
+        self.assertEqual(a.rect_estacion, b.rect_estacion)
+        self.assertEqual(a.rect_canasta, b.rect_canasta)
+        self.assertTrue((a.ocupacion.rejilla == b.ocupacion.rejilla).all())
+
+    def test_guardar_y_cargar_mundo(self):
+        """
+        Un mundo cargado de disco debe ser igual al original y jugarse igual.
+        """
+        ruta = os.path.join(self.directorio.name, "mundo.npz")
+        original = World(semilla=8)
+        original.guardar(ruta)
+        cargado = World.cargar(ruta)
+
+        self.assertMismoMundo(cargado, original)
+        self.assertEqual(cargado.semilla, 8)
+        self.assertEqual(Simulacion(mundo=cargado).ejecutar(), Simulacion(8).ejecutar())
+        print("\nPrueba de guardar y cargar un mundo: SUPERADA")
+
+    def test_corpus_mapeado(self):
+        """
+        Cada mundo del corpus debe coincidir con el generado desde su semilla.
+        """
+        corpus = CorpusMundos.escribir(self.directorio.name, (World(semilla) for semilla in range(30, 40)))
+        self.assertEqual(len(corpus), 10)
+        for i, mundo in enumerate(corpus):
+            self.assertMismoMundo(mundo, World(30 + i))
+            self.assertEqual(mundo.semilla, 30 + i)
+        print("Prueba de corpus mapeado en memoria: SUPERADA")
+
+    def test_lote_desde_corpus(self):
+        """
+        Un lote sobre el corpus debe dar los mismos resultados que sobre las semillas.
+        """
+        CorpusMundos.escribir(self.directorio.name, (World(semilla) for semilla in range(4)))
+        resumenes = sorted(Lote(None, procesos=2, corpus=self.directorio.name).ejecutar(), key=lambda r: r["semilla"])
+
+        self.assertEqual([r["indice_corpus"] for r in resumenes], [0, 1, 2, 3])
+        for resumen in resumenes:
+            resumen.pop("duracion")
+            resumen.pop("tiempo_busqueda_ms")
+            resumen.pop("indice_corpus")
+            self.assertEqual(resumen, Simulacion(resumen["semilla"]).ejecutar())
+        print("Prueba de lote desde corpus: SUPERADA")
+
+    def test_tamano_distinto(self):
+        """
+        No se puede cargar un mundo creado para otra rejilla.
+        """
+        ruta = os.path.join(self.directorio.name, "mundo.npz")
+        World(semilla=1).guardar(ruta)
+        original = (Config.SCREEN_ANCHO, Config.SCREEN_ALTO)
+        Config.establecer_pantalla(1280, 720)
+        try:
+            with self.assertRaises(ValueError):
+                World.cargar(ruta)
+        finally:
+            Config.establecer_pantalla(*original)
+        print("Prueba de rejilla distinta: SUPERADA")
+
+
+if __name__ == '__main__':
+    unittest.main()
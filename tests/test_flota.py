@@ -0,0 +1,83 @@
+import unittest
+import sys
+import os
+
+# Añadimos la ruta principal del proyecto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from flota import Flota
+from world import World
+
+class TestFlota(unittest.TestCase):
+
+    def setUp(self):
+        self._pantalla = (Config.SCREEN_ANCHO, Config.SCREEN_ALTO)
+
+    def tearDown(self):
+        Config.establecer_pantalla(*self._pantalla)
+
+    def ejecutar_vigilando(self, flota):
+        """Juega el episodio comprobando en cada tick que no haya choques ni cruces."""
+        anteriores = list(flota.celdas)
+        while not flota.paso():
+            vivos = [i for i, robot in enumerate(flota.robots) if robot.estado != 'MUERTO']
+            celdas = [flota.celdas[i] for i in vivos]
+            self.assertEqual(len(set(celdas)), len(celdas), f"Dos robots en la misma celda en el tick {flota.tick}")
+            antes = {anteriores[i]: i for i in vivos}
+            for i in vivos:
+                j = antes.get(flota.celdas[i])
+                if j is not None and j != i:
+                    self.assertNotEqual(flota.celdas[j], anteriores[i], f"Robots {i} y {j} se cruzan en el tick {flota.tick}")
+            reclamos = [robot.pelota_objetivo for robot in flota.robots if robot.pelota_objetivo is not None]
+            self.assertEqual(len(set(reclamos)), len(reclamos), "Una pelota reclamada por dos robots")
+            anteriores = list(flota.celdas)
+        return flota.resumen()
+
+    def test_flota_sin_choques(self):
+        """
+        Varios robots en el mismo mundo deben recoger todas las pelotas sin
+        ocupar nunca la misma celda ni intercambiarse de celda.
+        """
+        for semilla in range(3):
+            resumen = self.ejecutar_vigilando(Flota(8, mundo=World(semilla)))
+            self.assertEqual(resumen["resultado"], 'GAME_OVER')
+            self.assertEqual(resumen["recogidas"], Config.NUM_PELOTAS)
+        print("\nPrueba de flota sin choques: SUPERADA")
+
+    def test_flota_mas_rapida_que_un_robot(self):
+        """
+        Con más robots las pelotas se recogen en menos ticks.
+        """
+        solo = Flota(1, mundo=World(3)).ejecutar()
+        flota = Flota(8, mundo=World(3)).ejecutar()
+        self.assertEqual(flota["resultado"], 'GAME_OVER')
+        self.assertLess(flota["ticks"], solo["ticks"])
+        print("Prueba de flota más rápida que un robot: SUPERADA")
+
+    def test_cientos_de_robots(self):
+        """
+        Cientos de robots deben terminar sin choques y sin replanificar en cada
+        tick: cada robot planifica una vez por ventana como mucho.
+        """
+        Config.establecer_pantalla(1920, 1080)
+        flota = Flota(200, mundo=World(1, num_pelotas=30), max_ticks=3000)
+        resumen = self.ejecutar_vigilando(flota)
+        self.assertEqual(resumen["resultado"], 'GAME_OVER')
+        self.assertLess(resumen["planificaciones"], resumen["robots"] * resumen["ticks"] / flota.ventana)
+        print("Prueba de cientos de robots: SUPERADA")
+
+    def test_flota_llena_no_se_bloquea(self):
+        """
+        Con más robots que pelotas y el mapa lleno de robots parados, los que
+        esperan se apartan y los que trabajan entregan todas las pelotas.
+        """
+        Config.establecer_pantalla(1920, 1080)
+        for semilla in (5, 18):
+            resumen = self.ejecutar_vigilando(Flota(300, mundo=World(semilla, num_pelotas=200)))
+            self.assertEqual(resumen["resultado"], 'GAME_OVER')
+            self.assertEqual(resumen["recogidas"], 200)
+        print("Prueba de flota llena sin bloqueos: SUPERADA")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+
+# Añadimos la ruta principal del proyecto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lote import Lote
+from simulacion import Simulacion
+
+class TestLote(unittest.TestCase):
+
+    def test_lote_en_paralelo_igual_que_en_serie(self):
+        """
+        Los episodios en varios procesos deben dar lo mismo que corridos uno a uno.
+        """
+        lote = Lote(6, semilla_inicial=20, procesos=2)
+        resumenes = sorted(lote.ejecutar(), key=lambda r: r["semilla"])
+
+        self.assertEqual(len(resumenes), 6)
+        for resumen in resumenes:
+            esperado = Simulacion(resumen["semilla"]).ejecutar()
+            resumen.pop("duracion")
+            resumen.pop("tiempo_busqueda_ms")
+            self.assertEqual(resumen, esperado)
+        print("\nPrueba de lote en paralelo: SUPERADA")
+
+    def test_estadisticas_agregadas(self):
+        """
+        Las estadísticas deben sumar todos los episodios y sus resultados.
+        """
+        lote = Lote(5, semilla_inicial=0, procesos=1)
+        for _ in lote.ejecutar():
+            pass
+        estadisticas = lote.estadisticas()
+
+        self.assertEqual(estadisticas["episodios"], 5)
+        self.assertEqual(sum(estadisticas["resultados"].values()), 5)
+        self.assertGreater(estadisticas["episodios_por_segundo"], 0)
+        self.assertLessEqual(estadisticas["tasa_exito"], 1.0)
+        self.assertGreater(estadisticas["expandidos_por_busqueda"], 0)
+        self.assertIsInstance(estadisticas["episodios_patologicos"], list)
+        print("Prueba de estadísticas del lote: SUPERADA")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+
+# Añadimos la ruta principal del proyecto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from world import World
+from pathfinder import Pathfinder
+from ocupacion import Ocupacion
+from config import Config
+
+class TestOcupacion(unittest.TestCase):
+
+    def setUp(self):
+        self.mundo = World(semilla=5)
+
+    def _obstaculos_como_conjunto(self):
+        """Construye el conjunto de centros bloqueados como lo hacía el robot antes."""
+        tam = Config.TAMANO_CELDA
+        obstaculos = set(self.mundo.pelotas) | {self.mundo.rect_estacion.center, self.mundo.rect_canasta.center}
+        for rect_obs in self.mundo.obstaculos:
+            for i in range(rect_obs.left, rect_obs.right, tam):
+                for j in range(rect_obs.top, rect_obs.bottom, tam):
+                    obstaculos.add((i + tam // 2, j + tam // 2))
+        return obstaculos
+
+    def test_rejilla_coincide_con_la_disposicion(self):
+        """
+        La rejilla debe bloquear exactamente las mismas celdas que el conjunto antiguo.
+        """
+        obstaculos = self._obstaculos_como_conjunto()
+        ocupacion = self.mundo.ocupacion
+        bloqueadas = {(x, y) for x in range(ocupacion.columnas) for y in range(ocupacion.filas)
+                      if ocupacion.celda_bloqueada((x, y))}
+        self.assertEqual(bloqueadas, {Ocupacion.celda_de_pixel(p) for p in obstaculos})
+        print("\nPrueba de rejilla de ocupación: SUPERADA")
+
+    def test_recoger_y_soltar_pelota(self):
+        """
+        Retirar una pelota libera su celda y volver a colocarla la bloquea de nuevo.
+        """
+        ocupacion = self.mundo.ocupacion
+        pelota = self.mundo.pelotas[0]
+        version = ocupacion.version
+
+        self.assertTrue(ocupacion.retirar_pelota(pelota))
+        self.assertNotIn(pelota, ocupacion)
+        self.assertTrue(ocupacion.colocar_pelota(pelota))
+        self.assertIn(pelota, ocupacion)
+        self.assertEqual(ocupacion.version, version + 2)
+
+        # Una pelota nunca se coloca sobre un obstáculo fijo
+        self.assertFalse(ocupacion.colocar_pelota(self.mundo.rect_estacion.center))
+        print("Prueba de recoger y soltar pelotas: SUPERADA")
+
+    def test_a_estrella_igual_con_rejilla(self):
+        """
+        A* debe devolver la misma ruta con la rejilla que con el conjunto de píxeles.
+        """
+        obstaculos = self._obstaculos_como_conjunto()
+        inicio = (self.mundo.pos_inicio_robot[0] + Config.TAMANO_CELDA // 2,
+                  self.mundo.pos_inicio_robot[1] + Config.TAMANO_CELDA // 2)
+        for pelota in self.mundo.pelotas:
+            self.assertEqual(Pathfinder.a_estrella(inicio, pelota, obstaculos),
+                             Pathfinder.a_estrella(inicio, pelota, self.mundo.ocupacion))
+        print("Prueba de A* con rejilla: SUPERADA")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import random
 import sys
 import os
 
@@ -6,7 +7,10 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from pathfinder import Pathfinder
+from world import World
+from ocupacion import Ocupacion
 from config import Config
+from simulacion import Simulacion
 
 class TestPathfinder(unittest.TestCase):
 
@@ -71,5 +75,214 @@ class TestPathfinder(unittest.TestCase):
         self.assertIsNone(ruta, "La ruta debe ser None si el destino está bloqueado")
         print("Prueba sin ruta posible: SUPERADA")
 
+    def test_motor_plano_mismas_rutas(self):
+        """
+        El motor plano debe devolver exactamente las mismas rutas que a_estrella.
+        """
+        pathfinder = Pathfinder(motor="PLANO")
+        for semilla in range(3):
+            mundo = World(semilla)
+            inicio = (mundo.pos_inicio_robot[0] + Config.TAMANO_CELDA // 2,
+                      mundo.pos_inicio_robot[1] + Config.TAMANO_CELDA // 2)
+            destinos = mundo.pelotas + [mundo.rect_estacion.center, mundo.rect_canasta.center]
+            for destino in destinos:
+                esperado = Pathfinder.a_estrella(inicio, destino, mundo.ocupacion)
+                self.assertEqual(pathfinder.buscar(inicio, destino, mundo.ocupacion), esperado)
+                # También con el conjunto de píxeles de siempre
+                obstaculos = set(mundo.pelotas) | {mundo.rect_estacion.center, mundo.rect_canasta.center}
+                self.assertEqual(pathfinder.buscar(inicio, destino, obstaculos),
+                                 Pathfinder.a_estrella(inicio, destino, obstaculos))
+        print("Prueba de motor plano: SUPERADA")
+
+    def test_pelota_cercana_por_camino(self):
+        """
+        Debe elegir la pelota alcanzable más cercana, no la de menor distancia Manhattan.
+        """
+        tam = Config.TAMANO_CELDA
+        y_base = Config.ALTURA_HUD
+        centro = lambda x, y: (x * tam + tam // 2, y_base + y * tam + tam // 2)
+        inicio = centro(0, 0)
+        pelota_encerrada = centro(2, 0)
+        pelota_lejana = centro(0, 6)
+
+        # La pelota más cercana en línea recta queda encerrada por un muro
+        obstaculos = {pelota_encerrada, pelota_lejana, centro(1, 0), centro(3, 0), centro(2, 1)}
+
+        pelota, ruta = Pathfinder().buscar_pelota_cercana(inicio, [pelota_encerrada, pelota_lejana], obstaculos)
+
+        self.assertEqual(pelota, pelota_lejana)
+        self.assertEqual(ruta, Pathfinder.a_estrella(inicio, pelota_lejana, obstaculos))
+
+        # Si ninguna es alcanzable no hay pelota ni ruta
+        obstaculos.add(centro(0, 5))
+        obstaculos.add(centro(1, 6))
+        obstaculos.add(centro(0, 7))
+        self.assertEqual(Pathfinder().buscar_pelota_cercana(inicio, [pelota_encerrada, pelota_lejana], obstaculos), (None, None))
+        print("Prueba de pelota más cercana por camino: SUPERADA")
+
+    def test_cache_de_rutas(self):
+        """
+        Un cambio en la rejilla solo invalida las rutas que puede afectar, y en
+        un episodio real la pelota más cercana se responde desde la caché.
+        """
+        mundo = World(2)
+        pathfinder = Pathfinder()
+        inicio = (mundo.pos_inicio_robot[0] + Config.TAMANO_CELDA // 2,
+                  mundo.pos_inicio_robot[1] + Config.TAMANO_CELDA // 2)
+        destino = mundo.rect_canasta.center
+
+        ruta = pathfinder.buscar(inicio, destino, mundo.ocupacion)
+        ruta.pop(0)  # El robot consume su copia; la guardada no debe cambiar
+        self.assertEqual(pathfinder.buscar(inicio, destino, mundo.ocupacion),
+                         Pathfinder.a_estrella(inicio, destino, mundo.ocupacion))
+        self.assertEqual((pathfinder.aciertos_cache, pathfinder.fallos_cache), (1, 1))
+
+        # Recoger una pelota que no puede acortar la ruta no la invalida
+        ruta = pathfinder.buscar(inicio, destino, mundo.ocupacion)
+        celda = lambda pos: (pos[0] // Config.TAMANO_CELDA, pos[1] // Config.TAMANO_CELDA)
+        lejana = next(p for p in mundo.pelotas if Pathfinder.heuristica(celda(inicio), celda(p))
+                      + Pathfinder.heuristica(celda(p), celda(destino)) >= len(ruta))
+        mundo.ocupacion.retirar_pelota(lejana)
+        self.assertEqual(pathfinder.buscar(inicio, destino, mundo.ocupacion), ruta)
+        self.assertEqual((pathfinder.aciertos_cache, pathfinder.fallos_cache), (3, 1))
+
+        # Soltar una pelota en medio de la ruta sí la invalida
+        mundo.ocupacion.colocar_pelota(ruta[len(ruta) // 2])
+        nueva = pathfinder.buscar(inicio, destino, mundo.ocupacion)
+        self.assertEqual((pathfinder.aciertos_cache, pathfinder.fallos_cache), (3, 2))
+        self.assertNotIn(ruta[len(ruta) // 2], nueva)
+
+        # Las búsquedas de pelota desde la canasta y la estación se repiten en cada episodio
+        simulacion = Simulacion(0)
+        resumen = simulacion.ejecutar()
+        self.assertEqual(resumen["resultado"], 'GAME_OVER')
+        self.assertGreater(simulacion.pathfinder.aciertos_cache, 0)
+        self.assertEqual(resumen["busquedas"], simulacion.pathfinder.fallos_cache)
+        print("Prueba de caché de rutas: SUPERADA")
+
+    def test_jps_misma_longitud(self):
+        """
+        JPS debe encontrar rutas igual de cortas que A* y expandir muchos menos nodos en abierto.
+        """
+        tam = Config.TAMANO_CELDA
+        plano = Pathfinder(motor="PLANO", tamano_cache=0)
+        jps = Pathfinder(motor="JPS", tamano_cache=0)
+        for semilla in range(4):
+            mundo = World(semilla)
+            aleatorio = random.Random(semilla)
+            for _ in range(20):
+                inicio = (aleatorio.randrange(0, Config.ANCHO, tam) + tam // 2,
+                          aleatorio.randrange(Config.ALTURA_HUD, Config.ALTO, tam) + tam // 2)
+                destino = aleatorio.choice(mundo.pelotas + [mundo.rect_estacion.center])
+                if inicio in mundo.ocupacion:
+                    continue
+                ruta_plano = plano.buscar(inicio, destino, mundo.ocupacion)
+                ruta_jps = jps.buscar(inicio, destino, mundo.ocupacion)
+                if ruta_plano is None:
+                    self.assertIsNone(ruta_jps)
+                    continue
+                self.assertEqual(len(ruta_jps), len(ruta_plano))
+                self.assertEqual(ruta_jps[-1], destino)
+                # Cada paso es a una celda vecina y nunca atraviesa un obstáculo
+                anterior = inicio
+                for celda in ruta_jps[:-1]:
+                    self.assertEqual(abs(celda[0] - anterior[0]) + abs(celda[1] - anterior[1]), tam)
+                    self.assertNotIn(celda, mundo.ocupacion)
+                    anterior = celda
+
+        # Mapa vacío con el objetivo encerrado: A* tiene que recorrerlo casi entero
+        vacio = Ocupacion()
+        objetivo = (vacio.columnas // 2, vacio.filas // 2)
+        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+            vacio.rejilla[objetivo[0] + dx, objetivo[1] + dy] = Ocupacion.OBSTACULO
+        inicio = (tam // 2, Config.ALTURA_HUD + tam // 2)
+        destino = (objetivo[0] * tam + tam // 2, objetivo[1] * tam + tam // 2)
+        self.assertIsNone(plano.buscar(inicio, destino, vacio))
+        self.assertIsNone(jps.buscar(inicio, destino, vacio))
+        self.assertLess(jps.motor_rejilla.expandidos * 10, plano.motor_rejilla.expandidos)
+        print("Prueba de JPS: SUPERADA")
+
+    def test_incremental_repara_tras_cambios(self):
+        """
+        El motor incremental conserva su búsqueda y sigue dando rutas óptimas tras recoger y soltar pelotas.
+        """
+        tam = Config.TAMANO_CELDA
+        mundo = World(4)
+        ocupacion = mundo.ocupacion
+        incremental = Pathfinder(motor="INCREMENTAL", tamano_cache=0)
+        destino = mundo.rect_canasta.center
+        inicio = (mundo.pos_inicio_robot[0] + tam // 2, mundo.pos_inicio_robot[1] + tam // 2)
+        aleatorio = random.Random(4)
+
+        for _ in range(15):
+            ruta = incremental.buscar(inicio, destino, ocupacion)
+            esperado = Pathfinder.a_estrella(inicio, destino, ocupacion)
+            self.assertEqual(ruta is None, esperado is None)
+            if esperado:
+                self.assertEqual(len(ruta), len(esperado))
+                inicio = ruta[0] if len(ruta) > 1 else inicio
+            # La búsqueda sobrevive a limpiar(), como tras cada recogida del robot
+            incremental.limpiar()
+            if mundo.pelotas and aleatorio.random() < 0.5:
+                ocupacion.retirar_pelota(mundo.pelotas.pop())
+            else:
+                celda = (aleatorio.randrange(ocupacion.columnas), aleatorio.randrange(ocupacion.fila_minima, ocupacion.filas))
+                pelota = (celda[0] * tam + tam // 2, celda[1] * tam + tam // 2)
+                if pelota != inicio and ocupacion.colocar_pelota(pelota):
+                    mundo.pelotas.append(pelota)
+
+        self.assertEqual(len(incremental.planificadores), 1)
+
+        # En un episodio, las búsquedas hacia la canasta y la estación se reutilizan entre entregas
+        simulacion = Simulacion(0, motor="INCREMENTAL")
+        self.assertEqual(simulacion.ejecutar()["resultado"], 'GAME_OVER')
+        self.assertGreater(simulacion.pathfinder.planificadores_reutilizados, len(simulacion.pathfinder.planificadores))
+        print("Prueba de replanificación incremental: SUPERADA")
+
+    def test_estadisticas_de_busqueda(self):
+        """
+        Cada búsqueda deja sus contadores en ultima_busqueda y se suma al acumulado del episodio.
+        """
+        tam = Config.TAMANO_CELDA
+        mundo = World(9)
+        inicio = (mundo.pos_inicio_robot[0] + tam // 2, mundo.pos_inicio_robot[1] + tam // 2)
+        destino = mundo.rect_canasta.center
+
+        contadores = {}
+        for motor in Pathfinder.MOTORES:
+            pathfinder = Pathfinder(motor)
+            pathfinder.buscar(inicio, destino, mundo.ocupacion)
+            busqueda = pathfinder.ultima_busqueda
+            self.assertGreater(busqueda.expandidos, 0)
+            self.assertGreaterEqual(busqueda.empujes, busqueda.expandidos + busqueda.descartes)
+            self.assertLessEqual(busqueda.pico_abierta, busqueda.empujes)
+            self.assertGreaterEqual(busqueda.tiempo_ms, 0)
+            contadores[motor] = (busqueda.expandidos, busqueda.empujes, busqueda.descartes)
+            # Un acierto de la caché no es una búsqueda
+            pathfinder.buscar(inicio, destino, mundo.ocupacion)
+            self.assertEqual(pathfinder.estadisticas.busquedas, 1)
+        # El A* clásico y el plano exploran exactamente igual
+        self.assertEqual(contadores["CLASICO"], contadores["PLANO"])
+
+        # La búsqueda paso a paso cuenta lo mismo que la completa
+        pathfinder = Pathfinder()
+        pathfinder.iniciar_busqueda(inicio, destino, mundo.ocupacion)
+        while pathfinder.paso() == "SEARCHING":
+            pass
+        busqueda = pathfinder.ultima_busqueda
+        self.assertEqual((busqueda.expandidos, busqueda.empujes, busqueda.descartes), contadores["CLASICO"])
+
+        # Objetivo encerrado en un mapa vacío: se recorre el tablero entero y se marca
+        vacio = Ocupacion()
+        objetivo = (vacio.columnas // 2, vacio.filas // 2)
+        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+            vacio.rejilla[objetivo[0] + dx, objetivo[1] + dy] = Ocupacion.OBSTACULO
+        self.assertIsNone(pathfinder.buscar(inicio, (objetivo[0] * tam + tam // 2, objetivo[1] * tam + tam // 2), vacio))
+        self.assertEqual(pathfinder.ultima_busqueda.patologicas, 1)
+        self.assertEqual(pathfinder.estadisticas.busquedas, 2)
+        self.assertEqual(pathfinder.estadisticas.patologicas, 1)
+        self.assertEqual(pathfinder.estadisticas.max_expandidos, pathfinder.ultima_busqueda.expandidos)
+        print("Prueba de estadísticas de búsqueda: SUPERADA")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,103 @@
+import unittest
+import sys
+import os
+import csv
+import json
+import tempfile
+
+# Sin ventana real: el dibujado se hace sobre una pantalla ficticia
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# Añadimos la ruta principal del proyecto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+from config import Config
+from perfilador import Perfilador
+from render import Render
+from robot import Robot
+from world import World
+from pathfinder import Pathfinder
+
+class TestPerfilador(unittest.TestCase):
+
+    def setUp(self):
+        self.originales = {nombre: vars(Pathfinder)[nombre] for nombre in ("buscar", "a_estrella")}
+        self.perfilador = Perfilador([
+            ("busqueda", Pathfinder, "buscar"),
+            ("busqueda", Pathfinder, "a_estrella"),
+            ("volcado", pygame.display, "flip"),
+            ("volcado", pygame.display, "update"),
+        ])
+
+    def tearDown(self):
+        self.perfilador.desactivar()
+
+    def test_apagado_no_envuelve_nada(self):
+        """
+        Desactivado, los métodos deben ser exactamente los originales.
+        """
+        self.perfilador.activar()
+        self.assertIsNot(vars(Pathfinder)["buscar"], self.originales["buscar"])
+        self.assertIsInstance(vars(Pathfinder)["a_estrella"], staticmethod)
+        self.perfilador.desactivar()
+        for nombre, original in self.originales.items():
+            self.assertIs(vars(Pathfinder)[nombre], original)
+        print("\nPrueba de perfilador apagado sin coste: SUPERADA")
+
+    def test_mide_por_seccion_y_exporta(self):
+        """
+        Cada fotograma guarda el tiempo y las llamadas de cada sección; las
+        trazas se exportan a CSV y JSON.
+        """
+        mundo = World(semilla=2)
+        pathfinder = Pathfinder("CLASICO", tamano_cache=0)
+        self.perfilador.activar()
+        for _ in range(5):
+            pathfinder.buscar(mundo.rect_estacion.center, mundo.rect_canasta.center, mundo.ocupacion)
+            self.perfilador.cerrar_fotograma()
+        self.perfilador.cerrar_fotograma()
+
+        trazas = list(self.perfilador.trazas)
+        self.assertEqual(len(trazas), 6)
+        # buscar llama a a_estrella: la sección cuenta la llamada de fuera una sola vez
+        self.assertEqual([t["busqueda_llamadas"] for t in trazas], [1] * 5 + [0])
+        self.assertGreater(trazas[0]["busqueda_ms"], 0)
+        resumen = {seccion: (p50, p99) for seccion, p50, p99 in self.perfilador.resumen()}
+        self.assertLessEqual(resumen["busqueda"][0], resumen["busqueda"][1])
+
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta_csv = self.perfilador.exportar(os.path.join(directorio, "perfil.csv"))
+            with open(ruta_csv) as archivo:
+                filas = list(csv.DictReader(archivo))
+            self.assertEqual(len(filas), 6)
+            self.assertIn("volcado_ms", filas[0])
+            ruta_json = self.perfilador.exportar(os.path.join(directorio, "perfil.json"))
+            with open(ruta_json) as archivo:
+                datos = json.load(archivo)
+            self.assertEqual(datos["secciones"], ["busqueda", "volcado"])
+            self.assertEqual(len(datos["fotogramas"]), 6)
+        print("Prueba de medidas por sección y exportación: SUPERADA")
+
+    def test_panel_en_el_hud(self):
+        """
+        Con perfil activo el Render debe dibujar el panel p50/p99 sin fallar.
+        """
+        pygame.init()
+        pantalla = pygame.display.set_mode((Config.ANCHO, Config.ALTO))
+        opciones = list(Config.TEMAS.keys())
+        render = Render(pantalla, opciones[0])
+        mundo = World(semilla=3)
+        robot = Robot(mundo.pos_inicio_robot[0], mundo.pos_inicio_robot[1], mundo)
+        self.perfilador.activar()
+        for _ in range(3):
+            render.dibujar('RUNNING', mundo, robot, False, Pathfinder(), opciones, 0, perfil=self.perfilador.resumen())
+            self.perfilador.cerrar_fotograma()
+        self.assertEqual([t["volcado_llamadas"] for t in self.perfilador.trazas], [1, 1, 1])
+        self.assertEqual(len(render.rects_sucios), len(mundo.pelotas) + 3)
+        pygame.quit()
+        print("Prueba de panel de perfil en el HUD: SUPERADA")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+import sys
+import os
+
+# Añadimos la ruta principal del proyecto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from world import World
+from simulacion import Simulacion
+from planificador_recorrido import PlanificadorRecorrido
+from config import Config
+
+ESTACIONES = (PlanificadorRecorrido.ESTACION, PlanificadorRecorrido.ESTACION_CON_PELOTA)
+
+
+class TestPlanificadorRecorrido(unittest.TestCase):
+
+    def setUp(self):
+        self.mundo = World(semilla=0)
+        self.inicio = (self.mundo.pos_inicio_robot[0] + Config.TAMANO_CELDA // 2,
+                       self.mundo.pos_inicio_robot[1] + Config.TAMANO_CELDA // 2)
+
+    def test_plan_visita_cada_pelota_una_vez(self):
+        """
+        El plan recorre todas las pelotas exactamente una vez e intercala recargas.
+        """
+        planificador = PlanificadorRecorrido(self.mundo)
+        paradas = planificador.planificar(self.inicio, Config.CARGA_MAXIMA, self.mundo.pelotas)
+
+        self.assertTrue(planificador.factible)
+        pelotas = [parada for parada in paradas if parada not in ESTACIONES]
+        self.assertEqual(sorted(pelotas), sorted(self.mundo.pelotas))
+        self.assertGreater(len(paradas), len(pelotas))
+        # Con poca batería lo primero es ir a la estación
+        planificador.planificar(self.inicio, Config.CARGA_EMERGENCIA, self.mundo.pelotas)
+        self.assertEqual(planificador.paradas[0], PlanificadorRecorrido.ESTACION)
+        print("\nPrueba de plan que visita cada pelota: SUPERADA")
+
+    def test_replanifica_si_cambian_las_pelotas(self):
+        """
+        Si desaparece una pelota del plan, la siguiente parada sale de un plan nuevo.
+        """
+        planificador = PlanificadorRecorrido(self.mundo)
+        primera = planificador.siguiente_parada(self.inicio, Config.CARGA_MAXIMA, self.mundo.pelotas)
+        self.assertIn(primera, self.mundo.pelotas)
+        self.assertEqual(planificador.planificaciones, 1)
+
+        pelotas = [p for p in self.mundo.pelotas if p != primera]
+        planificador.siguiente_parada(self.inicio, Config.CARGA_MAXIMA, pelotas)
+        self.assertEqual(planificador.planificaciones, 1)
+        # Desaparece una pelota que el plan aún tenía pendiente
+        pelotas.remove([p for p in planificador.paradas if p not in ESTACIONES][-1])
+        planificador.siguiente_parada(self.inicio, Config.CARGA_MAXIMA, pelotas)
+        self.assertEqual(planificador.planificaciones, 2)
+        self.assertNotIn(primera, planificador.campos)
+        print("Prueba de replanificación del recorrido: SUPERADA")
+
+    def test_recorrido_no_se_queda_sin_bateria(self):
+        """
+        El recorrido planificado entrega todas las pelotas sin volver a planificar
+        y nunca da más pasos que el robot sin plan: si el plan no le gana, el
+        robot sigue sin plan todo el episodio.
+        """
+        for semilla in (0, 4, 5, 7):
+            simulacion = Simulacion(semilla, recorrido=True)
+            resumen = simulacion.ejecutar()
+            voraz = Simulacion(semilla, recorrido=False).ejecutar()
+            self.assertEqual(resumen["resultado"], 'GAME_OVER')
+            self.assertEqual(resumen["recogidas"], Config.NUM_PELOTAS)
+            # El robot siguió el plan (o el voraz): no hizo falta volver a planificar
+            recorrido = simulacion.robot.recorrido
+            self.assertEqual(recorrido.planificaciones, 1)
+            if recorrido.factible:
+                self.assertEqual(resumen["pasos"], recorrido.pasos_previstos)
+                self.assertLess(resumen["pasos"], voraz["pasos"])
+            else:
+                self.assertTrue(recorrido.gana_voraz)
+                self.assertEqual(resumen["pasos"], voraz["pasos"])
+        print("Prueba de recorrido con batería suficiente: SUPERADA")
+
+    def test_aviso_de_bateria_con_plan(self):
+        """
+        Con un plan adoptado el robot sigue vigilando la batería exacta: si no le
+        queda para volver a la estación, da media vuelta.
+        """
+        simulacion = Simulacion(0, recorrido=True)
+        robot = simulacion.robot
+        while not (robot.recorrido.factible and robot.ruta_actual):
+            simulacion.paso()
+        robot.carga = robot.carga_para_volver()
+        simulacion.paso()
+        self.assertEqual(robot.estado, 'CARGAR')
+        print("Prueba de aviso de batería con plan: SUPERADA")
+
+    def test_limite_de_pelotas(self):
+        """
+        Con muchas pelotas el plan sigue cubriéndolas todas; por encima de
+        MAX_PELOTAS_RECORRIDO no se planifica ni se crean campos.
+        """
+        mundo = World(semilla=0, num_pelotas=20)
+        planificador = PlanificadorRecorrido(mundo)
+        paradas = planificador.planificar(mundo.rect_estacion.center, Config.CARGA_MAXIMA, mundo.pelotas)
+        self.assertTrue(planificador.factible)
+        self.assertLess(planificador.pasos_previstos, planificador.pasos_voraz)
+        self.assertEqual(sorted(p for p in paradas if p not in ESTACIONES), sorted(mundo.pelotas))
+        planificador.liberar()
+
+        mundo = World(semilla=2, num_pelotas=Config.MAX_PELOTAS_RECORRIDO + 5)
+        planificador = PlanificadorRecorrido(mundo)
+        self.assertIsNone(planificador.siguiente_parada(mundo.rect_estacion.center, Config.CARGA_MAXIMA,
+                                                        mundo.pelotas))
+        self.assertFalse(planificador.factible)
+        self.assertEqual(planificador.campos, {})
+        print("Prueba de límite de pelotas del recorrido: SUPERADA")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import sys
+import os
+
+# Añadimos la ruta principal del proyecto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from poblacion import Poblacion
+from robot import Robot
+
+class TestPoblacion(unittest.TestCase):
+
+    def test_bateria_por_lotes(self):
+        """
+        Cada movimiento descuenta CARGA_POR_MOVIMIENTO; quien llega a cero queda
+        MUERTO y los que están en la estación recargan juntos hasta el máximo.
+        """
+        T = Config.TAMANO_CELDA
+        poblacion = Poblacion([(0, 0), (T, 0), (2 * T, 0)])
+        poblacion[1].carga = Config.CARGA_POR_MOVIMIENTO
+        muertos = poblacion.mover([0, 1], [(0, T), (T, T)])
+        self.assertEqual(muertos.tolist(), [1])
+        self.assertEqual(poblacion[1].estado, 'MUERTO')
+        self.assertEqual(poblacion[0].carga, Config.CARGA_MAXIMA - Config.CARGA_POR_MOVIMIENTO)
+        self.assertEqual(poblacion[0].rect.topleft, (0, T))
+        self.assertEqual(poblacion[2].carga, Config.CARGA_MAXIMA)
+
+        poblacion[0].estado = 'RECARGANDO'
+        poblacion[2].carga = 0.0
+        self.assertEqual(poblacion.recargar().tolist(), [0])
+        self.assertEqual(poblacion[0].carga, Config.CARGA_MAXIMA)
+        self.assertEqual(poblacion[2].carga, 0.0)
+        print("\nPrueba de batería por lotes: SUPERADA")
+
+    def test_vista_con_atributos_de_robot(self):
+        """
+        La vista debe leer y escribir en los arreglos con los mismos nombres de
+        atributo que Robot (los que leen Render y la flota; no sus métodos).
+        """
+        poblacion = Poblacion([(0, 0), (30, 60)])
+        robot = Robot(30, 60)
+        vista = poblacion[1]
+        for atributo in ("carga", "estado", "lleva_pelota", "recogidas", "direccion", "pelota_objetivo"):
+            self.assertEqual(getattr(vista, atributo), getattr(robot, atributo), atributo)
+        self.assertEqual(vista.rect, robot.rect)
+
+        vista.estado = 'RECOGIDO'
+        vista.lleva_pelota = True
+        vista.recogidas += 1
+        self.assertEqual(poblacion.estado[1], Poblacion.CODIGOS['RECOGIDO'])
+        self.assertTrue(poblacion.lleva_pelota[1])
+        self.assertEqual(poblacion.recogidas.tolist(), [0, 1])
+        print("Prueba de vista con atributos de Robot: SUPERADA")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+
+# Sin ventana real: el dibujado se hace sobre una pantalla ficticia
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# Añadimos la ruta principal del proyecto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+from config import Config
+from recursos import Recursos
+from render import Render
+
+class TestRecursos(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.pantalla = pygame.display.set_mode((Config.ANCHO, Config.ALTO))
+        Recursos.vaciar()
+
+    def tearDown(self):
+        pygame.quit()
+
+    def test_precarga_y_reutilizacion(self):
+        """
+        Lo precargado se usa sin volver a leer, y otro Render comparte las mismas imágenes.
+        El hilo solo lee archivos: fuentes y sonidos se crean en el hilo principal.
+        """
+        imagenes, fuentes = Render.recursos_necesarios()
+        sonido = os.path.join(os.path.dirname(__file__), '..', 'Sonido', Config.SONIDO_VICTORIA)
+        Recursos.precargar(imagenes, fuentes, [sonido]).join()
+        self.assertTrue(Recursos._crudas)
+        self.assertEqual(set(Recursos._fuentes_crudas), {nombre for nombre, _ in fuentes})
+        self.assertIn(sonido, Recursos._sonidos_crudos)
+        self.assertFalse(Recursos.fuentes)
+        self.assertFalse(Recursos.sonidos)
+        if pygame.mixer.get_init():
+            self.assertGreater(Recursos.sonido(sonido).get_length(), 0)
+            self.assertNotIn(sonido, Recursos._sonidos_crudos)
+
+        tema = list(Config.TEMAS.keys())[0]
+        primero = Render(self.pantalla, tema)
+        segundo = Render(self.pantalla, tema)
+        self.assertIs(primero.imagen_robot, segundo.imagen_robot)
+        self.assertIs(primero.fuente, segundo.fuente)
+        ruta, tamano = Render.imagenes_tema(tema)[0]["robot"]
+        self.assertNotIn((ruta, tamano), Recursos._crudas)
+        self.assertEqual(primero.imagen_robot.get_size(), tamano)
+        print("\nPrueba de precarga de recursos: SUPERADA")
+
+    def test_imagen_inexistente(self):
+        """
+        Una imagen que no existe se recuerda como None; con fallback se dibuja en rosa.
+        """
+        self.assertIsNone(Recursos.imagen("no_existe.png", (10, 10)))
+        render = Render(self.pantalla, list(Config.TEMAS.keys())[0])
+        sustituta = render.cargar_imagen("no_existe.png", (10, 10), fallback=True)
+        self.assertEqual(sustituta.get_at((0, 0))[:3], (255, 0, 255))
+        print("Prueba de imagen inexistente: SUPERADA")
+
+    def test_fuentes_tras_reiniciar_pygame(self):
+        """
+        Tras pygame.quit() la caché entrega fuentes nuevas en lugar de las ya cerradas.
+        """
+        fuente = Recursos.fuente("Arial", 22)
+        pygame.quit()
+        pygame.init()
+        nueva = Recursos.fuente("Arial", 22)
+        self.assertIsNot(fuente, nueva)
+        self.assertGreater(nueva.render("1", True, Config.BLANCO).get_width(), 0)
+        print("Prueba de fuentes tras reiniciar pygame: SUPERADA")
+
+
+if __name__ == '__main__':
+    unittest.main()
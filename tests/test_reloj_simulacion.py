@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+
+# Añadimos la ruta principal del proyecto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from reloj_simulacion import RelojSimulacion
+
+class TestRelojSimulacion(unittest.TestCase):
+
+    def test_ticks_independientes_de_los_fotogramas(self):
+        """
+        El mismo tiempo real da los mismos ticks a 30 que a 60 fotogramas por
+        segundo; lo que sobra queda para interpolar.
+        """
+        for fotograma_ms in (10, 20, 25):
+            reloj = RelojSimulacion(paso_ms=10)
+            ticks = []
+            for _ in range(1000 // fotograma_ms):
+                reloj.avanzar(fotograma_ms, lambda: ticks.append(reloj.ticks), lambda: True)
+            self.assertEqual(len(ticks), 100, fotograma_ms)
+            self.assertEqual(reloj.tiempo_logico(), 1000)
+
+        reloj = RelojSimulacion(paso_ms=10)
+        self.assertEqual(reloj.avanzar(25, lambda: None, lambda: True), 2)
+        self.assertAlmostEqual(reloj.interpolacion(), 0.5)
+        print("\nPrueba de ticks independientes de los fotogramas: SUPERADA")
+
+    def test_multiplicador_y_pausa(self):
+        """
+        A x10 cada fotograma simula diez veces más ticks; en pausa no se
+        acumula tiempo y MAX corre hasta que la partida deja de estar activa.
+        """
+        reloj = RelojSimulacion(paso_ms=10)
+        while reloj.multiplicador != 10:
+            reloj.acelerar()
+        self.assertEqual(reloj.texto_velocidad(), "x10")
+        self.assertEqual(reloj.avanzar(20, lambda: None, lambda: True), 20)
+
+        self.assertEqual(reloj.avanzar(50, lambda: None, lambda: False), 0)
+        self.assertEqual(reloj.interpolacion(), 0.0)
+
+        for _ in Config.VELOCIDADES:
+            reloj.acelerar()
+        self.assertEqual(reloj.texto_velocidad(), "MAX")
+        pasos = []
+        self.assertEqual(reloj.avanzar(1, lambda: pasos.append(1), lambda: len(pasos) < 500), 500)
+        for _ in Config.VELOCIDADES:
+            reloj.frenar()
+        self.assertEqual(reloj.multiplicador, 1)
+        print("Prueba de multiplicador y pausa: SUPERADA")
+
+    def test_fotograma_lento_no_se_recupera_entero(self):
+        """
+        Tras un fotograma muy lento solo se simulan MAX_RETRASO_MS de tiempo.
+        """
+        reloj = RelojSimulacion(paso_ms=10)
+        self.assertEqual(reloj.avanzar(5000, lambda: None, lambda: True), Config.MAX_RETRASO_MS // 10)
+        print("Prueba de fotograma lento: SUPERADA")
+
+if __name__ == '__main__':
+    unittest.main()
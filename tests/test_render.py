@@ -0,0 +1,110 @@
+import unittest
+import sys
+import os
+
+# Sin ventana real: el dibujado se hace sobre una pantalla ficticia
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# Añadimos la ruta principal del proyecto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+from config import Config
+from render import Render
+from robot import Robot
+from world import World
+from pathfinder import Pathfinder
+
+class TestRender(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        self.pantalla = pygame.display.set_mode((Config.ANCHO, Config.ALTO))
+        self.opciones = list(Config.TEMAS.keys())
+        self.render = Render(self.pantalla, self.opciones[0])
+        self.mundo = World(semilla=3)
+        self.robot = Robot(self.mundo.pos_inicio_robot[0], self.mundo.pos_inicio_robot[1], self.mundo)
+        self.pathfinder = Pathfinder()
+
+    def tearDown(self):
+        pygame.quit()
+
+    def dibujar(self, estado='RUNNING'):
+        self.render.dibujar(estado, self.mundo, self.robot, False, self.pathfinder, self.opciones, 0)
+
+    def test_zonas_sucias_igual_que_fotograma_completo(self):
+        """
+        Repintar solo lo que cambia debe dejar la misma imagen que redibujar todo,
+        y la pelota recogida desaparece de la pantalla.
+        """
+        self.dibujar()
+        pelota = self.mundo.pelotas.pop()
+        zona = self.render.imagen_pelota.get_rect(center=pelota)
+        con_pelota = pygame.image.tostring(self.pantalla.subsurface(zona), "RGB")
+        self.robot.lleva_pelota = True
+        for _ in range(12):
+            self.robot.rect.x += Config.VELOCIDAD_ANIMACION_ROBOT
+            self.robot.carga -= Config.CARGA_POR_MOVIMIENTO
+            self.dibujar()
+        incremental = pygame.image.tostring(self.pantalla, "RGB")
+
+        self.render.clave_fotograma = None
+        self.dibujar()
+        self.assertEqual(incremental, pygame.image.tostring(self.pantalla, "RGB"))
+        sin_pelota = pygame.image.tostring(self.pantalla.subsurface(zona), "RGB")
+        self.assertNotEqual(sin_pelota, con_pelota)
+        self.assertEqual(sin_pelota, pygame.image.tostring(self.render.capa_estatica.subsurface(zona), "RGB"))
+        print("\nPrueba de repintado por zonas: SUPERADA")
+
+    def test_capa_estatica_por_mundo(self):
+        """
+        La capa fija se compone una vez por mundo y se rehace al cambiarlo.
+        """
+        self.dibujar()
+        capa = self.render.capa_estatica
+        self.dibujar()
+        self.dibujar('PAUSED')
+        self.assertIs(self.render.capa_estatica, capa)
+
+        self.mundo = World(semilla=4)
+        self.dibujar()
+        self.assertIsNot(self.render.capa_estatica, capa)
+        print("Prueba de capa estática por mundo: SUPERADA")
+
+    def test_puntajes_astar_incrementales(self):
+        """
+        La capa de puntajes retocada paso a paso debe coincidir con la dibujada de cero,
+        y los puntajes se ven por encima de las pelotas.
+        """
+        pelota = self.mundo.pelotas[0]
+        # Una pelota opaca de un solo color: lo que no sea ese color en su celda es un puntaje
+        self.render.imagen_pelota = pygame.Surface((Config.TAMANO_CELDA, Config.TAMANO_CELDA))
+        self.render.imagen_pelota.fill(Config.CAFE)
+        self.pathfinder.iniciar_busqueda(self.robot.rect.center, pelota, self.mundo.ocupacion)
+        resultado = "SEARCHING"
+        while resultado == "SEARCHING":
+            for _ in range(25):
+                resultado = self.pathfinder.paso()
+                if resultado != "SEARCHING":
+                    break
+            self.render.dibujar('RUNNING', self.mundo, self.robot, True, self.pathfinder, self.opciones, 0)
+        self.assertIsInstance(resultado, list)
+        incremental = pygame.image.tostring(self.render.capa_astar, "RGB")
+
+        self.render.clave_astar = None
+        self.render.dibujar('RUNNING', self.mundo, self.robot, True, self.pathfinder, self.opciones, 0)
+        self.assertEqual(incremental, pygame.image.tostring(self.render.capa_astar, "RGB"))
+        self.assertFalse(self.pathfinder.nodos_modificados)
+
+        # La pelota buscada no tapa sus puntajes
+        zona = self.render.imagen_pelota.get_rect(center=pelota)
+        colores = {tuple(self.pantalla.get_at((x, y)))[:3] for x in range(zona.left, zona.right)
+                   for y in range(zona.top, zona.bottom)}
+        self.assertIn(Config.CAFE, colores)
+        self.assertGreater(len(colores), 1)
+        print("Prueba de puntajes A* incrementales: SUPERADA")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from robot import Robot
 from pathfinder import Pathfinder
 from config import Config
+from simulacion import Simulacion
 
 class TestRobotLogic(unittest.TestCase):
     
@@ -65,6 +66,71 @@ class TestRobotLogic(unittest.TestCase):
         self.assertEqual(len(self.pelotas), 0, "La pelota debería haber sido eliminada de la lista del mundo")
         print("Prueba de ciclo de recolección: SUPERADA")
 
+    def test_ruta_y_rastro_acotados(self):
+        """
+        La ruta se consume por la izquierda aunque se asigne como lista, y el
+        rastro guarda solo las últimas LONGITUD_RASTRO posiciones.
+        """
+        T = Config.TAMANO_CELDA
+        x, y = self.robot.rect.center
+        self.robot.ruta_actual = [(x, y + T * (i + 1)) for i in range(Config.LONGITUD_RASTRO + 5)]
+        self.robot.carga = Config.CARGA_POR_MOVIMIENTO * (Config.LONGITUD_RASTRO + 6)
+        self.robot.ultima_decision = -Config.enfriamiento_decision_robot
+        pasos = 0
+        while self.robot.ruta_actual:
+            siguiente = self.robot.ruta_actual[0]
+            self.robot.actualizar(self.pelotas, self.rect_estacion, self.rect_canasta, self.pathfinder)
+            self.robot.completar_movimiento()
+            self.assertEqual(self.robot.rect.center, siguiente)
+            pasos += 1
+        self.assertEqual(pasos, Config.LONGITUD_RASTRO + 5)
+        self.assertEqual(len(self.robot.camino_normal), Config.LONGITUD_RASTRO)
+        self.assertEqual(self.robot.camino_normal[-1], self.robot.rect.topleft)
+
+        with self.assertRaises(AttributeError):
+            self.robot.atributo_inventado = 1
+        print("Prueba de ruta y rastro acotados: SUPERADA")
+
+    def test_vuelve_a_cargar_segun_la_distancia(self):
+        """
+        Con un mundo, el robot da media vuelta según los pasos reales que le faltan
+        hasta la estación, incluso a mitad de ruta, y no se queda sin batería. La
+        pelota que lleva la suelta en su propia celda solo si la rejilla la admite.
+        """
+        simulacion = Simulacion(134)
+        robot, mundo = simulacion.robot, simulacion.mundo
+        distancia = mundo.campo_estacion.distancia_pixel(robot.rect.center)
+        necesaria = (distancia + 1) * Config.CARGA_POR_MOVIMIENTO * Config.MARGEN_SEGURIDAD_BATERIA
+        self.assertEqual(robot.carga_para_volver(), necesaria)
+        self.assertEqual(Robot(0, Config.ALTURA_HUD).carga_para_volver(), Config.CARGA_EMERGENCIA)
+
+        # A mitad de ruta y con la pelota encima: la suelta en su celda y va a cargar
+        robot.ruta_actual = mundo.campo_canasta.ruta_desde(robot.rect.center)
+        robot.lleva_pelota, robot.estado = True, 'RECOGIDO'
+        robot.carga = necesaria
+        simulacion.paso()
+        self.assertEqual(robot.estado, 'CARGAR')
+        self.assertFalse(robot.lleva_pelota)
+        self.assertIn(robot.rect.center, mundo.pelotas)
+        self.assertEqual(mundo.campo_estacion.distancia_pixel(robot.rect.center), distancia)
+
+        # Donde la rejilla no admite la pelota (ya hay otra) se la queda y va a cargar con ella
+        robot.estado, robot.lleva_pelota = 'RECOGIDO', True
+        pelotas = list(mundo.pelotas)
+        robot._verificar_bateria_emergencia(mundo.pelotas, mundo.rect_canasta, mundo.rect_estacion, simulacion.pathfinder)
+        self.assertEqual(robot.estado, 'CARGAR')
+        self.assertTrue(robot.lleva_pelota)
+        self.assertEqual(mundo.pelotas, pelotas)
+
+        # Con la regla fija esta semilla acababa MUERTO
+        carga_minima = Config.CARGA_MAXIMA
+        simulacion = Simulacion(134)
+        while not simulacion.paso():
+            carga_minima = min(carga_minima, simulacion.robot.carga)
+        self.assertEqual(simulacion.resultado, 'GAME_OVER')
+        self.assertGreater(carga_minima, 0)
+        print("Prueba de vuelta a la estación por distancia: SUPERADA")
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,57 @@
+import unittest
+import sys
+import os
+
+# Añadimos la ruta principal del proyecto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from simulacion import Simulacion
+from config import Config
+from world import World
+
+class TestSimulacion(unittest.TestCase):
+
+    def test_episodio_termina_sin_pantalla(self):
+        """
+        Un episodio completo debe terminar en uno de los estados finales del juego.
+        """
+        resumen = Simulacion(semilla=1).ejecutar()
+
+        self.assertIn(resumen["resultado"], ['GAME_OVER', 'MUERTO', 'GAME_OVER_STUCK', 'LIMITE_TICKS'])
+        self.assertGreater(resumen["ticks"], 0)
+        self.assertLessEqual(resumen["recogidas"], Config.NUM_PELOTAS)
+        print("\nPrueba de episodio sin pantalla: SUPERADA")
+
+    def test_misma_semilla_mismo_resultado(self):
+        """
+        Dos simulaciones con la misma semilla deben ser idénticas.
+        """
+        resumen_a = Simulacion(semilla=7).ejecutar()
+        resumen_b = Simulacion(semilla=7).ejecutar()
+
+        self.assertEqual(resumen_a, resumen_b)
+        print("Prueba de reproducibilidad por semilla: SUPERADA")
+
+    def test_limite_de_ticks(self):
+        """
+        Si se alcanza el límite de ticks, el episodio se corta con 'LIMITE_TICKS'.
+        """
+        resumen = Simulacion(semilla=3, max_ticks=5).ejecutar()
+
+        self.assertEqual(resumen["resultado"], 'LIMITE_TICKS')
+        self.assertEqual(resumen["ticks"], 5)
+        print("Prueba de límite de ticks: SUPERADA")
+
+    def test_fin_segun_pelotas_del_mundo(self):
+        """
+        El episodio termina al entregar las pelotas del mundo en juego, no Config.NUM_PELOTAS.
+        """
+        for num_pelotas in (5, 15):
+            resumen = Simulacion(mundo=World(3, num_pelotas=num_pelotas)).ejecutar()
+            self.assertEqual(resumen["resultado"], 'GAME_OVER')
+            self.assertEqual(resumen["recogidas"], num_pelotas)
+        print("Prueba de fin según las pelotas del mundo: SUPERADA")
+
+
+if __name__ == '__main__':
+    unittest.main()
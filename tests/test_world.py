@@ -0,0 +1,55 @@
+import unittest
+import sys
+import os
+
+# Añadimos la ruta principal del proyecto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from world import World
+from ocupacion import Ocupacion
+from config import Config
+
+class TestWorld(unittest.TestCase):
+
+    def test_misma_semilla_misma_disposicion(self):
+        """
+        Dos mundos con la misma semilla deben ser idénticos.
+        """
+        a, b = World(semilla=5), World(semilla=5)
+        self.assertEqual(a.obstaculos, b.obstaculos)
+        self.assertEqual(a.pelotas, b.pelotas)
+        self.assertEqual(a.pos_inicio_robot, b.pos_inicio_robot)
+        self.assertNotEqual(a.obstaculos, World(semilla=6).obstaculos)
+        print("\nPrueba de mundo reproducible: SUPERADA")
+
+    def test_mapa_denso_sin_solapes(self):
+        """
+        En un mapa denso se colocan todos los obstáculos que caben y ninguno se solapa.
+        """
+        mundo = World(semilla=1, num_obstaculos=400)
+        self.assertEqual(len(mundo.obstaculos), 400)
+        self.assertEqual(len(mundo.pelotas), Config.NUM_PELOTAS)
+
+        area = sum(rect.w * rect.h for rect in mundo.obstaculos) // (Config.TAMANO_CELDA ** 2)
+        self.assertEqual(area, int((mundo.ocupacion.rejilla == Ocupacion.OBSTACULO).sum()))
+        self.assertEqual(len(set(mundo.pelotas)), Config.NUM_PELOTAS)
+        for pelota in mundo.pelotas:
+            self.assertEqual(mundo.ocupacion.rejilla[Ocupacion.celda_de_pixel(pelota)], Ocupacion.PELOTA)
+        self.assertFalse(mundo.ocupacion.celda_bloqueada(Ocupacion.celda_de_pixel(mundo.pos_inicio_robot)))
+        print("Prueba de mapa denso sin solapes: SUPERADA")
+
+    def test_mapa_lleno(self):
+        """
+        Si se piden más obstáculos de los que caben, el mapa queda sin huecos.
+        """
+        mundo = World(semilla=2, num_obstaculos=100000)
+        self.assertLess(len(mundo.obstaculos), 100000)
+        for ancho, alto in World.TAMANOS_OBSTACULO:
+            _, huecos = World._huecos_libres(mundo.ocupacion, ancho, alto)
+            # Solo puede quedar libre la casilla de salida del robot
+            self.assertLessEqual(huecos, 1)
+        print("Prueba de mapa lleno: SUPERADA")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
 import pygame
 import random
+import numpy as np
 from config import Config
+from ocupacion import Ocupacion
+from campo_distancias import CampoDistancias
 
 # ==============================================================================
 # CLASE 4: Mundo (World)
@@ -8,50 +11,223 @@ from config import Config
 # las pelotas, la estación y la canasta.
 # ==============================================================================
 class World:
-    def __init__(self):
+    # Tamaños de obstáculo en celdas (ancho, alto)
+    TAMANOS_OBSTACULO = [
+        (1, 1), (2, 2), (3, 2), (2, 3), (4, 4),
+        (10, 1), (1, 10)
+    ]
+    # Fallos seguidos al azar antes de pasar a elegir entre los huecos válidos
+    MAX_FALLOS_SEGUIDOS = 50
+
+    def __init__(self, semilla=None, num_obstaculos=None, disposicion=None, num_pelotas=None):
+        # Generador propio para que cada mundo sea reproducible con su semilla
+        self.semilla = semilla
+        self.aleatorio = random.Random(semilla)
         self.rect_estacion = pygame.Rect(Config.TAMANO_CELDA, Config.TAMANO_CELDA + Config.ALTURA_HUD, Config.TAMANO_ESTACION, Config.TAMANO_ESTACION)
         self.rect_canasta = pygame.Rect(Config.ANCHO - Config.TAMANO_CANASTA - Config.TAMANO_CELDA, Config.ALTO - Config.TAMANO_CANASTA - Config.TAMANO_CELDA, Config.TAMANO_CANASTA, Config.TAMANO_CANASTA)
         self.pelotas = []
         self.obstaculos = []
         self.pos_inicio_robot = (0, 0)
-        self.num_obstaculos = Config.NUM_OBSTACULOS
-        self.generar_disposicion()
+        self.ocupacion = None
+        self.campo_estacion = None
+        self.campo_canasta = None
+        self.celdas_entrega = []
+        self.num_obstaculos = num_obstaculos if num_obstaculos is not None else Config.NUM_OBSTACULOS
+        self.num_pelotas = num_pelotas if num_pelotas is not None else Config.NUM_PELOTAS
+        if disposicion is not None:
+            self.aplicar_disposicion(disposicion)
+        else:
+            self.generar_disposicion()
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Lee un mundo guardado con 'guardar'."""
+        with np.load(ruta) as datos:
+            return cls(disposicion={nombre: datos[nombre] for nombre in datos.files})
+
+    def guardar(self, ruta):
+        """Guarda la disposición actual en un archivo .npz comprimido."""
+        np.savez_compressed(ruta, **self.disposicion())
+
+    @staticmethod
+    def tamano_rejilla():
+        return np.array([Config.ANCHO // Config.TAMANO_CELDA, Config.ALTO // Config.TAMANO_CELDA,
+                         Config.TAMANO_CELDA, Config.ALTURA_HUD], dtype=np.int32)
+
+    @staticmethod
+    def comprobar_tamano(tamano):
+        """Un mundo solo se puede cargar en una rejilla igual a aquella en la que se creó."""
+        actual = World.tamano_rejilla()
+        if not np.array_equal(tamano, actual):
+            raise ValueError(f"El mundo es de {tamano[0]}x{tamano[1]} celdas de {tamano[2]} px (HUD {tamano[3]} px) "
+                             f"y la rejilla actual es de {actual[0]}x{actual[1]} celdas de {actual[2]} px (HUD {actual[3]} px)")
+
+    def disposicion(self):
+        """Arreglos de enteros que describen el mundo completo, en píxeles."""
+        return {
+            "tamano": World.tamano_rejilla(),
+            "semilla": np.array(self.semilla if isinstance(self.semilla, int) else -1, dtype=np.int64),
+            "estacion": np.array(tuple(self.rect_estacion), dtype=np.int32),
+            "canasta": np.array(tuple(self.rect_canasta), dtype=np.int32),
+            "robot": np.array(self.pos_inicio_robot, dtype=np.int32),
+            "obstaculos": np.array([tuple(rect) for rect in self.obstaculos], dtype=np.int32).reshape(-1, 4),
+            "pelotas": np.array(self.pelotas, dtype=np.int32).reshape(-1, 2),
+        }
+
+    def aplicar_disposicion(self, datos):
+        """Reconstruye el mundo a partir de los arreglos de 'disposicion'."""
+        World.comprobar_tamano(datos["tamano"])
+        if self.semilla is None and int(datos["semilla"]) >= 0:
+            self.semilla = int(datos["semilla"])
+        self.rect_estacion = pygame.Rect(*(int(v) for v in datos["estacion"]))
+        self.rect_canasta = pygame.Rect(*(int(v) for v in datos["canasta"]))
+        self.pos_inicio_robot = tuple(int(v) for v in datos["robot"])
+        self.obstaculos = [pygame.Rect(*rect) for rect in datos["obstaculos"].tolist()]
+        self.pelotas = [tuple(pelota) for pelota in datos["pelotas"].tolist()]
+        self.num_obstaculos = len(self.obstaculos)
+        self.num_pelotas = len(self.pelotas)
+        self.construir_ocupacion()
 
     def generar_disposicion(self):
+        """
+        Coloca robot, obstáculos y pelotas usando la propia rejilla de ocupación
+        como índice: comprobar si un hueco está libre es mirar sus celdas, no
+        compararlo con todo lo colocado antes. Mientras el mapa está vacío se
+        prueba al azar; cuando empiezan a fallar los intentos se elige entre los
+        huecos que siguen libres, así que se llega a la cantidad pedida siempre
+        que quepa.
+        """
         while True:
-            x = random.randrange(0, Config.ANCHO, Config.TAMANO_CELDA)
-            y = random.randrange(Config.ALTURA_HUD, Config.ALTO, Config.TAMANO_CELDA)
+            x = self.aleatorio.randrange(0, Config.ANCHO, Config.TAMANO_CELDA)
+            y = self.aleatorio.randrange(Config.ALTURA_HUD, Config.ALTO, Config.TAMANO_CELDA)
             rect_robot = pygame.Rect(x, y, Config.TAMANO_CELDA, Config.TAMANO_CELDA)
             if not rect_robot.colliderect(self.rect_estacion) and not rect_robot.colliderect(self.rect_canasta):
                 self.pos_inicio_robot = (x, y)
                 break
 
-        self.pelotas = []
-        obstaculos_rects = [self.rect_estacion, self.rect_canasta, rect_robot]
+        ocupacion = Ocupacion()
+        ocupacion.marcar_rect(self.rect_estacion, Ocupacion.ESTACION)
+        ocupacion.marcar_rect(self.rect_canasta, Ocupacion.CANASTA)
+        # La casilla de salida del robot se reserva solo mientras se genera
+        celda_robot = Ocupacion.celda_de_pixel(self.pos_inicio_robot)
+        ocupacion.rejilla[celda_robot] = Ocupacion.OBSTACULO
 
-        self.obstaculos = []
-        obstaculo_tamanos = [
-            (1, 1), (2, 2), (3, 2), (2, 3), (4, 4),
-            (10, 1), (1, 10)
-        ]
-        intentos = 0
-        while len(self.obstaculos) < self.num_obstaculos and intentos < 1000:
-            intentos += 1
-            tam = random.choice(obstaculo_tamanos)
-            ancho = tam[0] * Config.TAMANO_CELDA
-            alto = tam[1] * Config.TAMANO_CELDA
-            x = random.randrange(0, Config.ANCHO - ancho, Config.TAMANO_CELDA)
-            y = random.randrange(Config.ALTURA_HUD, Config.ALTO - alto, Config.TAMANO_CELDA)
-            rect_obs = pygame.Rect(x, y, ancho, alto)
-            if not any(rect_obs.colliderect(obs) for obs in obstaculos_rects):
-                self.obstaculos.append(rect_obs)
-                obstaculos_rects.append(rect_obs)
-
-        while len(self.pelotas) < Config.NUM_PELOTAS:
-            pelota_x = random.randrange(0, Config.ANCHO, Config.TAMANO_CELDA) + Config.TAMANO_CELDA // 2
-            pelota_y = random.randrange(Config.ALTURA_HUD, Config.ALTO, Config.TAMANO_CELDA) + Config.TAMANO_CELDA // 2
-            centro_pelota = (pelota_x, pelota_y)
-            rect_pelota = pygame.Rect(pelota_x - Config.TAMANO_CELDA//2, pelota_y - Config.TAMANO_CELDA//2, Config.TAMANO_CELDA, Config.TAMANO_CELDA)
-            if not any(rect_pelota.colliderect(obs) for obs in obstaculos_rects) and centro_pelota not in self.pelotas:
-                self.pelotas.append(centro_pelota)
-                obstaculos_rects.append(rect_pelota)
+        self.obstaculos = self._colocar_obstaculos(ocupacion)
+        self.pelotas = self._colocar_pelotas(ocupacion)
+        # Con el mapa lleno pueden caber menos de las pedidas: cuentan las colocadas
+        self.num_pelotas = len(self.pelotas)
+
+        ocupacion.rejilla[celda_robot] = Ocupacion.LIBRE
+        ocupacion.version += 1
+        self.ocupacion = ocupacion
+        self.construir_campos()
+
+    def _colocar_obstaculos(self, ocupacion):
+        rejilla, T = ocupacion.rejilla, Config.TAMANO_CELDA
+        obstaculos = []
+        fallos_seguidos = 0
+        while len(obstaculos) < self.num_obstaculos and fallos_seguidos < World.MAX_FALLOS_SEGUIDOS:
+            ancho, alto = self.aleatorio.choice(World.TAMANOS_OBSTACULO)
+            if ancho * T >= Config.ANCHO or alto * T >= Config.ALTO - Config.ALTURA_HUD:
+                fallos_seguidos += 1
+                continue
+            x = self.aleatorio.randrange(0, Config.ANCHO - ancho * T, T) // T
+            y = self.aleatorio.randrange(Config.ALTURA_HUD, Config.ALTO - alto * T, T) // T
+            if rejilla[x:x + ancho, y:y + alto].any():
+                fallos_seguidos += 1
+                continue
+            fallos_seguidos = 0
+            rejilla[x:x + ancho, y:y + alto] = Ocupacion.OBSTACULO
+            obstaculos.append(pygame.Rect(x * T, y * T, ancho * T, alto * T))
+
+        # Mapa denso: se elige solo entre las esquinas donde el obstáculo cabe
+        huecos = {}
+        tamanos = list(World.TAMANOS_OBSTACULO)
+        while len(obstaculos) < self.num_obstaculos and tamanos:
+            tam = self.aleatorio.choice(tamanos)
+            if tam not in huecos:
+                huecos[tam] = self._huecos_libres(ocupacion, *tam)
+            candidatos, restantes = huecos[tam]
+            ancho, alto = tam
+            colocado = False
+            while restantes and not colocado:
+                i = self.aleatorio.randrange(restantes)
+                x, y = divmod(int(candidatos[i]), ocupacion.filas)
+                if rejilla[x:x + ancho, y:y + alto].any():
+                    # Otro obstáculo ocupó este hueco: se descarta para siempre
+                    restantes -= 1
+                    candidatos[i] = candidatos[restantes]
+                    continue
+                rejilla[x:x + ancho, y:y + alto] = Ocupacion.OBSTACULO
+                obstaculos.append(pygame.Rect(x * T, y * T, ancho * T, alto * T))
+                colocado = True
+            huecos[tam] = (candidatos, restantes)
+            if not restantes:
+                tamanos.remove(tam)
+        return obstaculos
+
+    @staticmethod
+    def _huecos_libres(ocupacion, ancho, alto):
+        """Índices planos de las esquinas (x, y) donde cabe un rect ancho x alto, con su cantidad."""
+        # Tabla de sumas acumuladas: la ocupación de cualquier rectángulo en O(1)
+        ocupadas = (ocupacion.rejilla != Ocupacion.LIBRE).astype(np.int32)
+        suma = np.zeros((ocupacion.columnas + 1, ocupacion.filas + 1), dtype=np.int32)
+        suma[1:, 1:] = ocupadas.cumsum(0).cumsum(1)
+        # Mismo rango que el muestreo al azar: sin tocar el borde derecho ni el inferior
+        xs = np.arange(0, ocupacion.columnas - ancho)
+        ys = np.arange(ocupacion.fila_minima, ocupacion.filas - alto)
+        if not len(xs) or not len(ys):
+            return np.zeros(0, dtype=np.int64), 0
+        X, Y = np.meshgrid(xs, ys, indexing='ij')
+        dentro = suma[X + ancho, Y + alto] - suma[X, Y + alto] - suma[X + ancho, Y] + suma[X, Y]
+        candidatos = (X * ocupacion.filas + Y)[dentro == 0]
+        return candidatos, len(candidatos)
+
+    def _colocar_pelotas(self, ocupacion):
+        rejilla, T = ocupacion.rejilla, Config.TAMANO_CELDA
+        pelotas = []
+        fallos_seguidos = 0
+        while len(pelotas) < self.num_pelotas and fallos_seguidos < World.MAX_FALLOS_SEGUIDOS:
+            x = self.aleatorio.randrange(0, Config.ANCHO, T) // T
+            y = self.aleatorio.randrange(Config.ALTURA_HUD, Config.ALTO, T) // T
+            if rejilla[x, y] != Ocupacion.LIBRE:
+                fallos_seguidos += 1
+                continue
+            fallos_seguidos = 0
+            rejilla[x, y] = Ocupacion.PELOTA
+            pelotas.append((x * T + T // 2, y * T + T // 2))
+
+        if len(pelotas) < self.num_pelotas:
+            # Se reparte entre las celdas libres que quedan, sin repetir
+            libres = np.flatnonzero(rejilla.reshape(-1) == Ocupacion.LIBRE)
+            libres = libres[libres % ocupacion.filas >= ocupacion.fila_minima]
+            restantes = len(libres)
+            while len(pelotas) < self.num_pelotas and restantes:
+                i = self.aleatorio.randrange(restantes)
+                x, y = divmod(int(libres[i]), ocupacion.filas)
+                restantes -= 1
+                libres[i] = libres[restantes]
+                rejilla[x, y] = Ocupacion.PELOTA
+                pelotas.append((x * T + T // 2, y * T + T // 2))
+        return pelotas
+
+    def construir_ocupacion(self):
+        """Vuelca la disposición actual en una rejilla de ocupación nueva."""
+        self.ocupacion = Ocupacion()
+        for rect_obs in self.obstaculos:
+            self.ocupacion.marcar_rect(rect_obs, Ocupacion.OBSTACULO)
+        self.ocupacion.marcar_rect(self.rect_estacion, Ocupacion.ESTACION)
+        self.ocupacion.marcar_rect(self.rect_canasta, Ocupacion.CANASTA)
+        for pelota in self.pelotas:
+            self.ocupacion.marcar_pixel(pelota, Ocupacion.PELOTA)
+        self.construir_campos()
+
+    def construir_campos(self):
+        # Distancias precalculadas a los destinos fijos; se reparan solas al
+        # cambiar la rejilla (recoger o soltar pelotas).
+        celda_estacion = Ocupacion.celda_de_pixel(self.rect_estacion.center)
+        celda_canasta = Ocupacion.celda_de_pixel(self.rect_canasta.center)
+        # Las celdas junto a la canasta desde las que se entrega
+        self.celdas_entrega = [(celda_canasta[0] + dx, celda_canasta[1] + dy) for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]]
+        self.campo_estacion = CampoDistancias(self.ocupacion, [celda_estacion], semillas_bloqueadas=True)
+        self.campo_canasta = CampoDistancias(self.ocupacion, self.celdas_entrega)